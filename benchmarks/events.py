@@ -0,0 +1,814 @@
+# -*- coding: utf-8 -*-
+"""Offline throughput benchmark for the logging subsystem.
+
+Builds a guild from synthetic gateway payloads, feeds update payloads
+through discord.py's own ConnectionState parsers and lets the Events cog,
+log pipeline, renderers and batcher handle them against a counting sink.
+Nothing connects to Discord. There is one scenario per logging callback,
+run with only that callback enabled.
+
+    python -m benchmarks.events [--events 5000] [--collapse]
+        [--scenario on_member_update ...]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import tempfile
+import time
+import timeit
+import tracemalloc
+from collections import deque
+from typing import Any, Callable
+
+import discord
+
+from main import Xanno
+from utils.config import ConfigRepository, ConfigStore, JSONConfigRepository
+from utils.mappings import LOGGING_CALLBACKS
+
+GUILD = 1000
+LOG_CHANNEL = 2000
+VOICE = 4900
+STAGE = 4901
+NOW = datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+class MemoryRepository(ConfigRepository):
+    def __init__(self, data: dict[int, dict]) -> None:
+        self.data = data
+
+    async def load_all(self) -> dict[int, dict]:
+        return dict(self.data)
+
+    async def get(self, guild_id: int) -> dict | None:
+        return self.data.get(guild_id)
+
+    async def set(self, guild_id: int, config: dict) -> None:
+        self.data[guild_id] = config
+
+    async def changed(self) -> bool:
+        return False
+
+
+class CountingSink:
+    def __init__(self) -> None:
+        self.messages = 0
+        self.embeds = 0
+
+    async def send(self, channel: Any, embeds: list[discord.Embed]) -> None:
+        self.messages += 1
+        self.embeds += len(embeds)
+
+
+def user(i: int) -> dict:
+    return {
+        "id": str(i),
+        "username": f"user{i}",
+        "discriminator": "0",
+        "global_name": None,
+        "avatar": None,
+    }
+
+
+def member(i: int, roles: list[int] = (), nick: str | None = None) -> dict:
+    return {
+        "user": user(i),
+        "roles": [str(r) for r in roles],
+        "nick": nick,
+        "joined_at": NOW,
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+    }
+
+
+def role(i: int, position: int, name: str | None = None) -> dict:
+    return {
+        "id": str(i),
+        "name": name or f"role{i}",
+        "color": 0,
+        "hoist": False,
+        "position": position,
+        "permissions": "0",
+        "managed": False,
+        "mentionable": False,
+    }
+
+
+def channel(i: int, position: int, topic: str | None = None, type: int = 0) -> dict:
+    return {
+        "id": str(i),
+        "guild_id": str(GUILD),
+        "type": type,
+        "name": f"channel{i}",
+        "position": position,
+        "topic": topic,
+        "nsfw": False,
+        "parent_id": None,
+        "rate_limit_per_user": 0,
+        "bitrate": 64000,
+        "user_limit": 0,
+        "rtc_region": None,
+        "permission_overwrites": [],
+    }
+
+
+def message(i: int, channel_id: int, author: int, content: str) -> dict:
+    return {
+        "id": str(i),
+        "channel_id": str(channel_id),
+        "guild_id": str(GUILD),
+        "author": user(author),
+        "member": member(author),
+        "content": content,
+        "timestamp": NOW,
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "pinned": False,
+        "type": 0,
+        "flags": 0,
+    }
+
+
+def guild(members: int, roles: int, channels: int) -> dict:
+    return {
+        "id": str(GUILD),
+        "name": "bench",
+        "icon": "0" * 32,
+        "owner_id": "1",
+        "features": [],
+        "emojis": [],
+        "stickers": [],
+        "member_count": members + 1,
+        "roles": [role(GUILD, 0, "@everyone")]
+        + [role(3000 + i, i + 1) for i in range(roles)],
+        "channels": [channel(LOG_CHANNEL, 0)]
+        + [channel(4000 + i, i + 1) for i in range(channels)]
+        + [channel(VOICE, channels + 1, type=2), channel(STAGE, channels + 2, type=13)],
+        "members": [member(1)] + [member(10_000 + i) for i in range(members)],
+        "threads": [thread(0)],
+    }
+
+
+def automod_rule(i: int) -> dict:
+    return {
+        "id": str(70_000 + i),
+        "guild_id": str(GUILD),
+        "name": f"rule{i}",
+        "creator_id": "1",
+        "event_type": 1,
+        "trigger_type": 1,
+        "trigger_metadata": {"keyword_filter": ["bad"], "allow_list": []},
+        "actions": [{"type": 1, "metadata": {}}],
+        "enabled": True,
+        "exempt_roles": [],
+        "exempt_channels": [],
+    }
+
+
+def scheduled_event(i: int, name: str | None = None) -> dict:
+    return {
+        "id": str(80_000 + i),
+        "guild_id": str(GUILD),
+        "channel_id": str(VOICE),
+        "creator_id": "1",
+        "name": name or f"event{i}",
+        "description": None,
+        "scheduled_start_time": NOW,
+        "scheduled_end_time": None,
+        "privacy_level": 2,
+        "status": 1,
+        "entity_type": 2,
+        "entity_id": None,
+        "entity_metadata": None,
+        "user_count": 0,
+    }
+
+
+def stage_instance(i: int, topic: str | None = None) -> dict:
+    return {
+        "id": str(85_000 + i),
+        "guild_id": str(GUILD),
+        "channel_id": str(STAGE),
+        "topic": topic or f"stage{i}",
+        "privacy_level": 2,
+        "discoverable_disabled": False,
+        "guild_scheduled_event_id": None,
+    }
+
+
+def thread(i: int, name: str | None = None, new: bool = True) -> dict:
+    return {
+        "id": str(90_000 + i),
+        "guild_id": str(GUILD),
+        "parent_id": "4000",
+        "owner_id": "10000",
+        "name": name or f"thread{i}",
+        "type": 11,
+        "thread_metadata": {
+            "archived": False,
+            "auto_archive_duration": 1440,
+            "archive_timestamp": NOW,
+            "locked": False,
+        },
+        "message_count": 0,
+        "member_count": 1,
+        "rate_limit_per_user": 0,
+        "last_message_id": None,
+        "newly_created": new,
+    }
+
+
+def thread_members(
+    thread_id: int, added: int | None = None, removed: int | None = None
+) -> dict:
+    return {
+        "id": str(90_000 + thread_id),
+        "guild_id": str(GUILD),
+        "member_count": 1,
+        "added_members": [
+            {
+                "id": str(90_000 + thread_id),
+                "user_id": str(added),
+                "join_timestamp": NOW,
+                "flags": 0,
+            }
+        ]
+        if added
+        else [],
+        "removed_member_ids": [str(removed)] if removed else [],
+    }
+
+
+def emoji(i: int) -> dict:
+    return {
+        "id": str(95_000 + i),
+        "name": f"emoji{i}",
+        "roles": [],
+        "require_colons": True,
+        "managed": False,
+        "animated": False,
+        "available": True,
+    }
+
+
+def sticker(i: int) -> dict:
+    return {
+        "id": str(96_000 + i),
+        "name": f"sticker{i}",
+        "tags": "bench",
+        "type": 2,
+        "format_type": 1,
+        "description": "",
+        "available": True,
+        "guild_id": str(GUILD),
+    }
+
+
+def integration(i: int) -> dict:
+    return {
+        "id": str(97_000 + i),
+        "guild_id": str(GUILD),
+        "name": f"app{i}",
+        "type": "discord",
+        "enabled": True,
+        "account": {"id": str(97_000 + i), "name": f"app{i}"},
+        "application": {
+            "id": str(97_000 + i),
+            "name": f"app{i}",
+            "icon": None,
+            "description": "",
+            "summary": "",
+        },
+        "user": user(1),
+    }
+
+
+def reaction(message_id: int, user_id: int, emoji: str = "👍") -> dict:
+    return {
+        "user_id": str(user_id),
+        "channel_id": "4000",
+        "message_id": str(message_id),
+        "guild_id": str(GUILD),
+        "emoji": {"id": None, "name": emoji},
+        "member": member(user_id),
+        "burst": False,
+        "type": 0,
+    }
+
+
+def voice_state(i: int) -> dict:
+    return {
+        "guild_id": str(GUILD),
+        "channel_id": str(VOICE) if i % 2 == 0 else None,
+        "user_id": str(10_000 + i % 500),
+        "member": member(10_000 + i % 500),
+        "session_id": "bench",
+        "deaf": False,
+        "mute": False,
+        "self_deaf": False,
+        "self_mute": i % 4 < 2,
+        "self_video": False,
+        "suppress": False,
+        "request_to_speak_timestamp": None,
+    }
+
+
+def _guild_id(data: dict) -> dict:
+    return {"guild_id": str(GUILD), **data}
+
+
+# REST responses the offline HTTP client gives enrichers, by route path
+ROUTES = {
+    "/guilds/{guild_id}/auto-moderation/rules/{rule_id}": (automod_rule(0)),
+    "/guilds/{guild_id}/integrations": [],
+}
+
+Payload = Callable[[int], tuple[str, dict]]
+
+
+def scenarios() -> dict[str, tuple[Payload | None, Payload]]:
+    """(setup, event) payload factories per logging callback.
+
+    Both are called with the event index. Setup payloads are parsed before
+    timing starts, with only the scenario's own callback enabled.
+    """
+    return {
+        "on_automod_rule_create": (
+            None,
+            lambda i: ("AUTO_MODERATION_RULE_CREATE", automod_rule(i)),
+        ),
+        "on_automod_rule_update": (
+            None,
+            lambda i: (
+                "AUTO_MODERATION_RULE_UPDATE",
+                {**automod_rule(0), "name": f"rule{i}"},
+            ),
+        ),
+        "on_automod_rule_delete": (
+            None,
+            lambda i: ("AUTO_MODERATION_RULE_DELETE", automod_rule(i)),
+        ),
+        "on_automod_action": (
+            None,
+            lambda i: (
+                "AUTO_MODERATION_ACTION_EXECUTION",
+                {
+                    "guild_id": str(GUILD),
+                    "action": {"type": 1, "metadata": {}},
+                    "rule_id": "70000",
+                    "rule_trigger_type": 1,
+                    "user_id": str(10_000 + i % 500),
+                    "channel_id": "4000",
+                    "message_id": None,
+                    "content": "bad",
+                    "matched_keyword": "bad",
+                    "matched_content": "bad",
+                },
+            ),
+        ),
+        "on_guild_channel_delete": (
+            lambda i: ("CHANNEL_CREATE", channel(100_000 + i, 30)),
+            lambda i: ("CHANNEL_DELETE", channel(100_000 + i, 30)),
+        ),
+        "on_guild_channel_create": (
+            None,
+            lambda i: ("CHANNEL_CREATE", channel(100_000 + i, 30)),
+        ),
+        "on_guild_channel_update": (
+            None,
+            lambda i: (
+                "CHANNEL_UPDATE",
+                channel(4000 + i % 20, i % 20 + 1, f"topic{i}"),
+            ),
+        ),
+        "on_guild_channel_pins_update": (
+            None,
+            lambda i: (
+                "CHANNEL_PINS_UPDATE",
+                _guild_id({"channel_id": "4000", "last_pin_timestamp": NOW}),
+            ),
+        ),
+        "on_guild_available": (
+            None,
+            lambda i: ("GUILD_CREATE", {**guild(0, 20, 20), "unavailable": False}),
+        ),
+        "on_guild_update": (
+            None,
+            lambda i: ("GUILD_UPDATE", {**guild(0, 20, 20), "name": f"bench{i}"}),
+        ),
+        "on_guild_emojis_update": (
+            None,
+            lambda i: (
+                "GUILD_EMOJIS_UPDATE",
+                _guild_id({"emojis": [emoji(j) for j in range(i % 5)]}),
+            ),
+        ),
+        "on_guild_stickers_update": (
+            None,
+            lambda i: (
+                "GUILD_STICKERS_UPDATE",
+                _guild_id({"stickers": [sticker(j) for j in range(i % 5)]}),
+            ),
+        ),
+        "on_invite_create": (
+            None,
+            lambda i: (
+                "INVITE_CREATE",
+                _guild_id(
+                    {
+                        "channel_id": "4000",
+                        "code": f"bench{i}",
+                        "created_at": NOW,
+                        "max_age": 0,
+                        "max_uses": 0,
+                        "temporary": False,
+                        "uses": 0,
+                        "inviter": user(1),
+                    }
+                ),
+            ),
+        ),
+        "on_invite_delete": (
+            None,
+            lambda i: (
+                "INVITE_DELETE",
+                _guild_id({"channel_id": "4000", "code": f"bench{i}"}),
+            ),
+        ),
+        "on_integration_create": (
+            None,
+            lambda i: ("INTEGRATION_CREATE", integration(i)),
+        ),
+        "on_integration_update": (
+            None,
+            lambda i: ("INTEGRATION_UPDATE", integration(i % 20)),
+        ),
+        "on_guild_integrat_update": (
+            None,
+            lambda i: ("GUILD_INTEGRATIONS_UPDATE", _guild_id({})),
+        ),
+        "on_webhooks_update": (
+            None,
+            lambda i: ("WEBHOOKS_UPDATE", _guild_id({"channel_id": "4000"})),
+        ),
+        "on_member_join": (
+            None,
+            lambda i: ("GUILD_MEMBER_ADD", _guild_id(member(100_000 + i))),
+        ),
+        "on_member_remove": (
+            lambda i: ("GUILD_MEMBER_ADD", _guild_id(member(100_000 + i))),
+            lambda i: ("GUILD_MEMBER_REMOVE", _guild_id({"user": user(100_000 + i)})),
+        ),
+        "on_member_update": (
+            None,
+            lambda i: (
+                "GUILD_MEMBER_UPDATE",
+                _guild_id(member(10_000 + i % 500, [3000 + i % 20], f"nick{i}")),
+            ),
+        ),
+        "on_member_ban": (
+            None,
+            lambda i: ("GUILD_BAN_ADD", _guild_id({"user": user(10_000 + i % 500)})),
+        ),
+        "on_member_unban": (
+            None,
+            lambda i: ("GUILD_BAN_REMOVE", _guild_id({"user": user(10_000 + i % 500)})),
+        ),
+        "on_message_edit": (
+            None,
+            lambda i: (
+                "MESSAGE_UPDATE",
+                {
+                    **message(50_000 + i % 200, 4000, 10_000, f"edited{i}"),
+                    "edited_timestamp": NOW,
+                    "pinned": i // 200 % 2 == 0,
+                },
+            ),
+        ),
+        "on_message_delete": (
+            lambda i: ("MESSAGE_CREATE", message(60_000 + i, 4000, 10_000, "hi")),
+            lambda i: (
+                "MESSAGE_DELETE",
+                _guild_id({"id": str(60_000 + i), "channel_id": "4000"}),
+            ),
+        ),
+        "on_bulk_message_delete": (
+            lambda i: ("MESSAGE_CREATE", message(60_000 + i, 4000, 10_000, "hi")),
+            lambda i: (
+                "MESSAGE_DELETE_BULK",
+                _guild_id({"ids": [str(60_000 + i)], "channel_id": "4000"}),
+            ),
+        ),
+        "on_reaction_add": (
+            None,
+            lambda i: (
+                "MESSAGE_REACTION_ADD",
+                reaction(50_000 + i % 200, 10_000 + i % 500),
+            ),
+        ),
+        "on_reaction_remove": (
+            lambda i: (
+                "MESSAGE_REACTION_ADD",
+                reaction(50_000 + i % 200, 10_000 + i // 200 % 500),
+            ),
+            lambda i: (
+                "MESSAGE_REACTION_REMOVE",
+                reaction(50_000 + i % 200, 10_000 + i // 200 % 500),
+            ),
+        ),
+        "on_reaction_clear": (
+            lambda i: ("MESSAGE_CREATE", message(60_000 + i, 4000, 10_000, "hi")),
+            lambda i: (
+                "MESSAGE_REACTION_REMOVE_ALL",
+                _guild_id({"channel_id": "4000", "message_id": str(60_000 + i)}),
+            ),
+        ),
+        "on_reaction_clear_emoji": (
+            lambda i: (
+                "MESSAGE_REACTION_ADD",
+                reaction(50_000 + i % 200, 10_000, f"e{i}"),
+            ),
+            lambda i: (
+                "MESSAGE_REACTION_REMOVE_EMOJI",
+                _guild_id(
+                    {
+                        "channel_id": "4000",
+                        "message_id": str(50_000 + i % 200),
+                        "emoji": {"id": None, "name": f"e{i}"},
+                    }
+                ),
+            ),
+        ),
+        "on_guild_role_create": (
+            None,
+            lambda i: ("GUILD_ROLE_CREATE", _guild_id({"role": role(110_000 + i, 30)})),
+        ),
+        "on_guild_role_delete": (
+            lambda i: ("GUILD_ROLE_CREATE", _guild_id({"role": role(110_000 + i, 30)})),
+            lambda i: ("GUILD_ROLE_DELETE", _guild_id({"role_id": str(110_000 + i)})),
+        ),
+        "on_guild_role_update": (
+            None,
+            lambda i: (
+                "GUILD_ROLE_UPDATE",
+                _guild_id({"role": role(3000 + i % 20, i % 20 + 1, f"role{i}-")}),
+            ),
+        ),
+        "on_scheduled_event_create": (
+            None,
+            lambda i: ("GUILD_SCHEDULED_EVENT_CREATE", scheduled_event(i)),
+        ),
+        "on_scheduled_event_delete": (
+            lambda i: ("GUILD_SCHEDULED_EVENT_CREATE", scheduled_event(i)),
+            lambda i: ("GUILD_SCHEDULED_EVENT_DELETE", scheduled_event(i)),
+        ),
+        "on_scheduled_event_update": (
+            lambda i: ("GUILD_SCHEDULED_EVENT_CREATE", scheduled_event(0)),
+            lambda i: (
+                "GUILD_SCHEDULED_EVENT_UPDATE",
+                scheduled_event(0, f"event{i}"),
+            ),
+        ),
+        "on_sched_event_user_add": (
+            lambda i: ("GUILD_SCHEDULED_EVENT_CREATE", scheduled_event(0)),
+            lambda i: (
+                "GUILD_SCHEDULED_EVENT_USER_ADD",
+                _guild_id(
+                    {
+                        "guild_scheduled_event_id": "80000",
+                        "user_id": str(10_000 + i % 500),
+                    }
+                ),
+            ),
+        ),
+        "on_sched_event_user_remove": (
+            lambda i: ("GUILD_SCHEDULED_EVENT_CREATE", scheduled_event(0)),
+            lambda i: (
+                "GUILD_SCHEDULED_EVENT_USER_REMOVE",
+                _guild_id(
+                    {
+                        "guild_scheduled_event_id": "80000",
+                        "user_id": str(10_000 + i % 500),
+                    }
+                ),
+            ),
+        ),
+        "on_stage_instance_create": (
+            None,
+            lambda i: ("STAGE_INSTANCE_CREATE", stage_instance(i)),
+        ),
+        "on_stage_instance_delete": (
+            lambda i: ("STAGE_INSTANCE_CREATE", stage_instance(i)),
+            lambda i: ("STAGE_INSTANCE_DELETE", stage_instance(i)),
+        ),
+        "on_stage_instance_update": (
+            lambda i: ("STAGE_INSTANCE_CREATE", stage_instance(0)),
+            lambda i: ("STAGE_INSTANCE_UPDATE", stage_instance(0, f"topic{i}")),
+        ),
+        "on_thread_create": (None, lambda i: ("THREAD_CREATE", thread(i + 1))),
+        "on_thread_join": (None, lambda i: ("THREAD_CREATE", thread(i + 1, new=False))),
+        "on_thread_update": (
+            None,
+            lambda i: ("THREAD_UPDATE", thread(0, f"thread{i}")),
+        ),
+        "on_thread_remove": (
+            lambda i: ("THREAD_CREATE", thread(i)),
+            lambda i: ("THREAD_MEMBERS_UPDATE", thread_members(i, removed=1)),
+        ),
+        "on_thread_delete": (
+            lambda i: ("THREAD_CREATE", thread(i)),
+            lambda i: (
+                "THREAD_DELETE",
+                _guild_id({"id": str(90_000 + i), "parent_id": "4000", "type": 11}),
+            ),
+        ),
+        "on_thread_member_join": (
+            None,
+            lambda i: (
+                "THREAD_MEMBERS_UPDATE",
+                thread_members(0, added=10_000 + i % 500),
+            ),
+        ),
+        "on_thread_member_remove": (
+            lambda i: ("THREAD_MEMBERS_UPDATE", thread_members(0, added=200_000 + i)),
+            lambda i: (
+                "THREAD_MEMBERS_UPDATE",
+                thread_members(0, removed=200_000 + i),
+            ),
+        ),
+        "on_voice_state_update": (
+            None,
+            lambda i: ("VOICE_STATE_UPDATE", voice_state(i)),
+        ),
+    }
+
+
+async def offline(
+    configs: dict[int, dict], collapse: bool = False
+) -> tuple[Xanno, CountingSink]:
+    """A bot with its logging subsystem running and no gateway or REST"""
+    bot = Xanno(config_repository=MemoryRepository(configs))
+    await bot._async_setup_hook()
+
+    sink = CountingSink()
+    bot.log_batcher.sink = sink
+    bot.log_batcher.window = 0
+    if not collapse:
+        bot.log_collapser.windows = {}
+
+    async def request(route, **kwargs) -> Any:
+        return ROUTES.get(route.path)
+
+    bot.http.request = request
+    bot.metrics.install(bot.http)
+    await bot.logging_config.start()
+    bot.log_pipeline.start()
+    await bot.load_extension("cogs.events")
+    return bot, sink
+
+
+async def build(callback: str, collapse: bool) -> tuple[Xanno, CountingSink]:
+    """An offline bot with a populated guild that only logs ``callback``"""
+    config = {
+        "channel": LOG_CHANNEL,
+        "callbacks": {c: c == callback for c in LOGGING_CALLBACKS},
+    }
+    bot, sink = await offline({GUILD: config}, collapse)
+
+    state = bot._connection
+    state.user = discord.ClientUser(state=state, data=user(1))
+    state._messages = deque(maxlen=None)
+    state._add_guild(discord.Guild(data=guild(500, 20, 20), state=state))
+    text = state._get_guild(GUILD).get_channel(4000)
+    for i in range(200):
+        state._messages.append(
+            discord.Message(
+                state=state, channel=text, data=message(50_000 + i, 4000, 10_000, "hi")
+            )
+        )
+    return bot, sink
+
+
+async def drain(bot: Xanno) -> None:
+    while True:
+        listeners = [
+            t
+            for t in asyncio.all_tasks()
+            if t.get_name().startswith("discord.py:") and not t.done()
+        ]
+        if not listeners:
+            break
+        await asyncio.gather(*listeners)
+    await bot.log_pipeline.join()
+    bot.log_collapser.close()
+    await bot.log_pipeline.join()
+    bot.audit_log.close()
+    await bot.log_batcher.close()
+
+
+async def run(name: str, events: int, collapse: bool) -> dict[str, Any]:
+    bot, sink = await build(name, collapse)
+    setup, factory = scenarios()[name]
+    parsers = bot._connection.parsers
+    errors = 0
+
+    async def on_error(event: str, *args, **kwargs) -> None:
+        nonlocal errors
+        errors += 1
+
+    bot.on_error = on_error
+    if setup:
+        for event, data in map(setup, range(events)):
+            parsers[event](data)
+        await drain(bot)
+        sink.messages = sink.embeds = 0
+        bot.metrics.stats.clear()
+        bot.metrics.routes.clear()
+    payloads = [factory(i) for i in range(events)]
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    for i, (event, data) in enumerate(payloads):
+        parsers[event](data)
+        if i % 100 == 99:
+            await asyncio.sleep(0)
+    await drain(bot)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    listeners = [
+        s.histogram for n, s in bot.metrics.stats.items() if n.startswith("listener:")
+    ]
+    histogram = max(listeners, key=lambda h: h.count) if listeners else None
+    pipeline = bot.log_pipeline.stats()
+    await bot.log_pipeline.close()
+    await bot.logging_config.close()
+    await bot.http.close()
+    return {
+        "scenario": name,
+        "events_per_sec": round(events / elapsed),
+        "listener_p50_us": round(histogram.percentile(0.5) * 1e6, 1)
+        if histogram
+        else 0,
+        "listener_p99_us": round(histogram.percentile(0.99) * 1e6, 1)
+        if histogram
+        else 0,
+        "pipeline_p99_ms": round(pipeline["latency_p99_ms"], 2),
+        "peak_kib": peak // 1024,
+        "rest_per_event": sum(bot.metrics.routes.values()) / events,
+        "messages": sink.messages,
+        "embeds": sink.embeds,
+        "errors": errors,
+    }
+
+
+async def compare_config(events: int) -> dict[str, float]:
+    """Per-event cost of the ConfigStore gate against reading the file"""
+    config = {"channel": LOG_CHANNEL, "callbacks": dict.fromkeys(LOGGING_CALLBACKS, 1)}
+    configs = {GUILD + i: config for i in range(100)}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "logging.json")
+        with open(path, "w") as fp:
+            json.dump({str(k): v for k, v in configs.items()}, fp, indent=4)
+        repository = JSONConfigRepository(path)
+        file_read = timeit.timeit(lambda: repository._read().get(GUILD), number=events)
+
+    store = ConfigStore(MemoryRepository(configs))
+    await store.load()
+    cached = timeit.timeit(
+        lambda: store.is_enabled("on_member_update", GUILD), number=events
+    )
+    return {
+        "file_read_us": round(file_read / events * 1e6, 2),
+        "cached_us": round(cached / events * 1e6, 3),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--collapse", action="store_true", help="collapse bursts")
+    parser.add_argument("--scenario", action="append", help="only run these")
+    args = parser.parse_args()
+
+    missing = LOGGING_CALLBACKS.keys() - scenarios().keys()
+    if missing:
+        parser.error(f"no scenario for {', '.join(sorted(missing))}")
+    for name in args.scenario or LOGGING_CALLBACKS:
+        print(json.dumps(await run(name, args.events, args.collapse)))
+    print(json.dumps({"scenario": "config", **await compare_config(args.events)}))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
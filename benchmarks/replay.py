@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""Replays a gateway recording through the bot with no network.
+
+Feeds the dispatches captured by GATEWAY_RECORD back through discord.py's
+state parsers and the loaded cogs, at recorded speed, N times faster or as
+fast as possible, and reports whether the logging pipeline kept up.
+
+    python -m benchmarks.replay gateway.jsonl.gz.1 gateway.jsonl.gz [--speed 0]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+import discord
+
+from benchmarks.events import drain, offline
+from utils.mappings import LOGGING_CALLBACKS
+from utils.recorder import read_recording
+
+
+async def replay(paths: list[str], speed: float) -> dict:
+    bot, sink = await offline({})
+    state = bot._connection
+    parsers = state.parsers
+    skipped, depth = 0, 0
+
+    count, started, first = 0, time.perf_counter(), None
+    for path in paths:
+        for t, event, data in read_recording(path):
+            if first is None:
+                first = t
+            if speed:
+                delay = (t - first) / speed - (time.perf_counter() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            elif count % 100 == 99:
+                await asyncio.sleep(0)
+
+            # the handshake needs a live gateway, so seed the cache directly
+            if event == "READY":
+                state.user = discord.ClientUser(state=state, data=data["user"])
+            elif event == "GUILD_CREATE" and not data.get("unavailable"):
+                guild = state._add_guild_from_data(data)
+                text = next(iter(guild.text_channels), None)
+                await bot.logging_config.set(
+                    guild.id,
+                    {
+                        "channel": text and text.id,
+                        "callbacks": dict.fromkeys(LOGGING_CALLBACKS, 1),
+                    },
+                )
+            elif event in parsers:
+                try:
+                    parsers[event](data)
+                except Exception:
+                    skipped += 1
+            else:
+                skipped += 1
+            count += 1
+            if count % 50 == 0:
+                depth = max(depth, bot.log_pipeline.stats()["depth"])
+
+    await drain(bot)
+    elapsed = time.perf_counter() - started
+    stats = bot.log_pipeline.stats()
+    await bot.log_pipeline.close()
+    await bot.logging_config.close()
+    await bot.http.close()
+    return {
+        "dispatches": count,
+        "skipped": skipped,
+        "seconds": round(elapsed, 2),
+        "dispatches_per_sec": round(count / elapsed) if elapsed else count,
+        "max_queue_depth": depth,
+        "dropped": stats["dropped"],
+        "pipeline_p99_ms": round(stats["latency_p99_ms"], 2),
+        "messages": sink.messages,
+        "embeds": sink.embeds,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="recordings, oldest first")
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="1 for real time, 0 for max speed"
+    )
+    args = parser.parse_args()
+    print(json.dumps(await replay(args.paths, args.speed)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,19 +2,28 @@
 from __future__ import annotations
 
 import datetime
-import json
 import traceback
-from typing import Optional, Sequence, List
+from typing import List, Optional, Sequence
 
 import discord
 from discord.ext import commands
 
 from main import Xanno
+from utils.diff import changes
+from utils.mappings import CALLBACK_EVENTS, LOGGING_CALLBACKS
+from utils.pipeline import LogRecord
 
 
 class Events(commands.Cog):
     def __init__(self, bot: Xanno) -> None:
         self.bot: Xanno = bot
+        self._registered = {CALLBACK_EVENTS.get(c, c) for c in LOGGING_CALLBACKS}
+
+    async def cog_load(self) -> None:
+        self.bot.logging_config.subscribe(self.sync_listeners)
+
+    async def cog_unload(self) -> None:
+        self.bot.logging_config.unsubscribe(self.sync_listeners)
 
     async def error_embed(self, ctx: commands.Context, message: str) -> discord.Message:
         embed = discord.Embed(
@@ -29,6 +38,7 @@ class Events(commands.Cog):
     async def on_command_error(
         self, ctx: commands.Context, error: commands.CommandError
     ) -> discord.Message | None:
+        self.bot.telemetry.finish(ctx, False)
         cog = ctx.cog
 
         if hasattr(ctx.command, "on_error") or (
@@ -82,313 +92,159 @@ class Events(commands.Cog):
             )
 
     @commands.Cog.listener(name="on_command")
-    async def on_command(self, ctx: commands.Context) -> discord.Message | None:
-        if ctx.guild.id in (745942562648621109, 336642139381301249):
-            return
+    async def on_command(self, ctx: commands.Context) -> None:
+        self.bot.telemetry.begin(ctx)
 
-        dump = json.dumps(
-            {
-                k: str(getattr(ctx, k))
-                for k in [
-                    attr for attr in dir(ctx) if attr[:2] != "__" and attr[0] != "_"
-                ]
-                if "bound method" not in str(getattr(ctx, k))
-            },
-            indent=4,
-        )
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title="Unknown guild command usage",
-            description=f"```json\n{dump}\n```",
-        )
-        return await self.bot.get_channel(758101380878565376).send(embed=embed)
+    @commands.Cog.listener(name="on_command_completion")
+    async def on_command_completion(self, ctx: commands.Context) -> None:
+        self.bot.telemetry.finish(ctx, True)
+
+    @commands.Cog.listener(name="on_audit_log_entry_create")
+    async def on_audit_log_entry_create(self, entry: discord.AuditLogEntry) -> None:
+        self.bot.audit_log.add(entry)
 
     # |-------|         0       0
     # |LOGGING|             |
     # |-------|         \_______/
 
-    @staticmethod
-    async def get_guild_config(guild: discord.Guild):
-        with open("logging.json") as fp:
-            data = json.load(fp)
-        if not data.get(str(guild.id)) or not data[str(guild.id)].get("channel"):
+    def record(
+        self, callback: str, guild: discord.Guild | None, target_id: int | None = None
+    ) -> LogRecord | None:
+        """A log record for ``callback`` in ``guild``, or None if the guild skips it"""
+        if not guild or not self.bot.logging_config.is_enabled(callback, guild.id):
             return None
-        return data[str(guild.id)]
-
-    async def handle_automodrule_event(
-        self, rule: discord.AutoModRule, config: dict, event: str
-    ) -> discord.Message | None:
-        channel = rule.guild.get_channel(config["channel"])
-        creator = rule.guild.get_member(rule.creator_id)
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"An automod rule was {event}",
-            description=f"`NAME:` {rule.name}\n"
-            f"`ID:` {rule.id}\n"
-            f"`CREATOR:` {creator.mention}\n"
-            f"`TYPE:` {str(rule.trigger.type).split('.')[-1]}\n"
-            f"`PRESETS:` {'Yes' if rule.trigger.presets else 'No'}\n"
-            f"`FILTERED:` {len(rule.trigger.keyword_filter) if rule.trigger.keyword_filter else 0}\n"
-            f"`ALLOWED:` {len(rule.trigger.allow_list) if rule.trigger.allow_list else 0}\n"
-            f"`EXEMPT ROLES:` {len(rule.exempt_role_ids)}\n"
-            f"`EXEMPT CHANS:` {len(rule.exempt_channel_ids)}\n"
-            f"`ACTIONS:` {', '.join([str(a.type).split('.')[-1] for a in rule.actions])}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=creator.display_avatar.url)
-        return await channel.send(embed=embed)
+        config = self.bot.logging_config.get(guild.id)
+        return LogRecord(callback, guild.id, config["channel"], target_id)
+
+    def log(self, record: LogRecord, **fields) -> None:
+        record.fields = fields
+        self.bot.log_collapser.submit(record)
+
+    def sync_listeners(self) -> None:
+        """Only keep logging listeners registered while some guild enables them"""
+        for callback in LOGGING_CALLBACKS:
+            event = CALLBACK_EVENTS.get(callback, callback)
+            listener = getattr(self, f"_logging_{event}")
+            wanted = bool(self.bot.logging_config.enabled.get(callback))
+
+            if wanted and event not in self._registered:
+                self.bot.add_listener(listener, event)
+                self._registered.add(event)
+            elif not wanted and event in self._registered:
+                self.bot.remove_listener(listener, event)
+                self._registered.discard(event)
+
+    def log_automod_rule(self, callback: str, rule: discord.AutoModRule) -> None:
+        record = self.record(callback, rule.guild, rule.id)
+        if record:
+            self.log(
+                record,
+                name=rule.name,
+                creator_id=rule.creator_id,
+                type=rule.trigger.type,
+                presets=rule.trigger.presets,
+                filtered=len(rule.trigger.keyword_filter),
+                allowed=len(rule.trigger.allow_list),
+                exempt_roles=len(rule.exempt_role_ids),
+                exempt_channels=len(rule.exempt_channel_ids),
+                actions=[action.type for action in rule.actions],
+            )
 
     @commands.Cog.listener(name="on_automod_rule_create")
-    async def _logging_on_automod_rule_create(
-        self, rule: discord.AutoModRule
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(rule.guild)
-        if not config or not config["callbacks"]["on_automod_rule_create"]:
-            return
-        return await self.handle_automodrule_event(rule, config, "created")
+    async def _logging_on_automod_rule_create(self, rule: discord.AutoModRule) -> None:
+        self.log_automod_rule("on_automod_rule_create", rule)
 
     @commands.Cog.listener(name="on_automod_rule_update")
     async def _logging_on_automod_rule_update(self, rule: discord.AutoModRule) -> None:
-        config = await self.get_guild_config(rule.guild)
-        if not config or not config["callbacks"]["on_automod_rule_update"]:
-            return
-        return await self.handle_automodrule_event(rule, config, "updated")
+        self.log_automod_rule("on_automod_rule_update", rule)
 
     @commands.Cog.listener(name="on_automod_rule_delete")
     async def _logging_on_automod_rule_delete(self, rule: discord.AutoModRule) -> None:
-        config = await self.get_guild_config(rule.guild)
-        if not config or not config["callbacks"]["on_automod_rule_delete"]:
-            return
-        return await self.handle_automodrule_event(rule, config, "deleted")
+        self.log_automod_rule("on_automod_rule_delete", rule)
 
     @commands.Cog.listener(name="on_automod_action")
     async def _logging_on_automod_action(
         self, execution: discord.AutoModAction
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(execution.guild)
-        if not config or not config["callbacks"]["on_automod_action"]:
-            return
-
-        rule = await execution.fetch_rule()
-        user = self.bot.get_user(execution.user_id)
-        channel = rule.guild.get_channel(config["channel"])
-        asterisk = "*\u200b"
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"An automod rule was triggered by a message",
-            description=f"`RULE:` {rule.name}\n"
-            f"`USER:` {user.mention}\n"
-            f"`MATCH:` {execution.matched_keyword[0] + asterisk * (len(execution.matched_keyword) - 1) if execution.matched_keyword else 'NaN'}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=user.display_avatar.url)
-        return await channel.send(embed=embed)
-
-    async def handle_gchannel_event(
-        self, channel: discord.abc.GuildChannel, config: dict, event: str
-    ) -> discord.Message | None:
-        logchannel = channel.guild.get_channel(config["channel"])
+    ) -> None:
+        record = self.record("on_automod_action", execution.guild, execution.user_id)
+        if record:
+            self.log(
+                record, rule_id=execution.rule_id, keyword=execution.matched_keyword
+            )
 
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A guild channel was {event}",
-            description=f"`NAME:` {channel.name}\n"
-            f"`CREATED:` {discord.utils.format_dt(channel.created_at, 'R')}\n"
-            f"`CATEGORY:` {channel.category if not channel.category else channel.category.name}\n"
-            f"`TYPE:` {type(channel).__name__}\n"
-            f"`POSITION:` {channel.position}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=channel.guild.icon.url)
-        return await logchannel.send(embed=embed)
+    def log_guild_channel(
+        self, callback: str, channel: discord.abc.GuildChannel, **fields
+    ) -> None:
+        record = self.record(callback, channel.guild, channel.id)
+        if record:
+            self.log(
+                record,
+                name=channel.name,
+                created=channel.created_at,
+                category=channel.category.name if channel.category else None,
+                type=type(channel).__name__,
+                position=channel.position,
+                **fields,
+            )
 
     @commands.Cog.listener(name="on_guild_channel_delete")
     async def _logging_on_guild_channel_delete(
         self, channel: discord.abc.GuildChannel
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(channel.guild)
-        if not config or not config["callbacks"]["on_guild_channel_delete"]:
-            return
-        return await self.handle_gchannel_event(channel, config, "deleted")
+    ) -> None:
+        self.log_guild_channel("on_guild_channel_delete", channel)
 
     @commands.Cog.listener(name="on_guild_channel_create")
     async def _logging_on_guild_channel_create(
         self, channel: discord.abc.GuildChannel
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(channel.guild)
-        if not config or not config["callbacks"]["on_guild_channel_create"]:
-            return
-        return await self.handle_gchannel_event(channel, config, "created")
+    ) -> None:
+        self.log_guild_channel("on_guild_channel_create", channel)
 
     @commands.Cog.listener(name="on_guild_channel_update")
     async def _logging_on_guild_channel_update(
         self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(after.guild)
-        if not config or not config["callbacks"]["on_guild_channel_update"]:
-            return
-
-        logchannel = after.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"#{before.name} was updated",
-            description="",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=after.guild.icon.url)
-
-        beforeattrs = {
-            k: (
-                str(getattr(before, k))
-                if k not in ("changed_roles", "overwrites")
-                else (
-                    len(getattr(before, k))
-                    if isinstance(getattr(before, k), list)
-                    else len(getattr(before, k).keys())
-                )
-            )
-            for k in [
-                attr for attr in dir(before) if attr[:2] != "__" and attr[0] != "_"
-            ]
-            if "bound method" not in str(getattr(before, k))
-        }
-        afterattrs = {
-            k: (
-                str(getattr(after, k))
-                if k not in ("changed_roles", "overwrites")
-                else (
-                    len(getattr(after, k))
-                    if isinstance(getattr(after, k), list)
-                    else len(getattr(after, k).keys())
-                )
-            )
-            for k in [
-                attr for attr in dir(after) if attr[:2] != "__" and attr[0] != "_"
-            ]
-            if "bound method" not in str(getattr(after, k))
-        }
-        differences = {
-            k: (beforeattrs[k], v) for k, v in afterattrs.items() if beforeattrs[k] != v
-        }
-
-        for name, change in differences.items():
-            embed.description += f"`{name.upper()}:` {change[0]} → {change[1]}\n"
-        embed.description = embed.description.removesuffix("\n")
-        if not embed.description:
-            embed.description = (
-                "Existing role overwrites were modified by an administrator"
-            )
-
-        return await logchannel.send(embed=embed)
+    ) -> None:
+        record = self.record("on_guild_channel_update", after.guild, after.id)
+        if record:
+            self.log(record, name=before.name, changes=changes(before, after))
 
     @commands.Cog.listener(name="on_guild_channel_pins_update")
     async def _logging_on_guild_channel_pins_update(
         self,
         channel: discord.abc.GuildChannel | discord.Thread,
         last_pin: Optional[datetime.datetime],
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(channel.guild)
-        if not config or not config["callbacks"]["on_guild_channel_pins_update"]:
-            return
-
-        logchannel = channel.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A guild channel's pins were updated",
-            description=f"`NAME:` {channel.name}\n"
-            f"`CREATED:` {discord.utils.format_dt(channel.created_at, 'R')}\n"
-            f"`CATEGORY:` {channel.category if not channel.category else channel.category.name}\n"
-            f"`TYPE:` {type(channel).__name__}\n"
-            f"`POSITION:` {channel.position}\n"
-            f"`LAST PIN:` {discord.utils.format_dt(last_pin, 'R') if last_pin else 'NaN'}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=channel.guild.icon.url)
-
-        return await logchannel.send(embed=embed)
+    ) -> None:
+        self.log_guild_channel(
+            "on_guild_channel_pins_update", channel, last_pin=last_pin
+        )
 
     @commands.Cog.listener(name="on_guild_available")
-    async def _logging_on_guild_available(
-        self, guild: discord.Guild
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(guild)
-        if not config or not config["callbacks"]["on_guild_available"]:
-            return
-
-        logchannel = guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"The guild is now available",
-            description=f"{guild.me.mention} is now responding to commands in this guild",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=guild.icon.url)
-
-        return await logchannel.send(embed=embed)
+    async def _logging_on_guild_available(self, guild: discord.Guild) -> None:
+        record = self.record("on_guild_available", guild)
+        if record:
+            self.log(record)
 
     @commands.Cog.listener(name="on_guild_update")
     async def _logging_on_guild_update(
         self, before: discord.Guild, after: discord.Guild
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(after)
-        if not config or not config["callbacks"]["on_guild_update"]:
-            return
+    ) -> None:
+        record = self.record("on_guild_update", after)
+        if record:
+            self.log(record, changes=changes(before, after))
 
-        logchannel = after.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"The guild was updated",
-            description="",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=after.icon.url)
-
-        k_ignores = (
-            "members",
-            "channels",
-            "roles",
-            "scheduled_events",
-            "threads",
-            "stage_instances",
-        )
-        beforeattrs = {
-            k: (
-                str(getattr(before, k))
-                if k not in ("features", "system_channel_flags")
-                else (
-                    len(getattr(before, k))
-                    if k == "features"
-                    else getattr(before, k).value
-                )
-            )
-            for k in [
-                attr for attr in dir(before) if attr[:2] != "__" and attr[0] != "_"
-            ]
-            if "bound method" not in str(getattr(before, k)) and k not in k_ignores
-        }
-        afterattrs = {
-            k: (
-                str(getattr(after, k))
-                if k not in ("features", "system_channel_flags")
-                else (
-                    len(getattr(after, k))
-                    if k == "features"
-                    else getattr(after, k).value
-                )
+    def log_guild_assets(
+        self,
+        callback: str,
+        guild: discord.Guild,
+        before: Sequence[discord.Emoji | discord.GuildSticker],
+        after: Sequence[discord.Emoji | discord.GuildSticker],
+    ) -> None:
+        record = self.record(callback, guild)
+        if record:
+            self.log(
+                record,
+                added=[asset.name for asset in after if asset not in before],
+                removed=[asset.name for asset in before if asset not in after],
             )
-            for k in [
-                attr for attr in dir(after) if attr[:2] != "__" and attr[0] != "_"
-            ]
-            if "bound method" not in str(getattr(after, k)) and k not in k_ignores
-        }
-        differences = {
-            k: (beforeattrs[k], v) for k, v in afterattrs.items() if beforeattrs[k] != v
-        }
-
-        for name, change in differences.items():
-            embed.description += f"`{name.upper()}:` {change[0]} → {change[1]}\n"
-        embed.description = embed.description.removesuffix("\n")
-
-        return await logchannel.send(embed=embed)
 
     @commands.Cog.listener(name="on_guild_emojis_update")
     async def _logging_on_guild_emojis_update(
@@ -396,33 +252,8 @@ class Events(commands.Cog):
         guild: discord.Guild,
         before: Sequence[discord.Emoji],
         after: Sequence[discord.Emoji],
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(guild)
-        if not config or not config["callbacks"]["on_guild_emojis_update"]:
-            return
-
-        logchannel = guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"The guild emojis were updated",
-            description="",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=guild.icon.url)
-
-        added = [emoji.name for emoji in after if emoji not in before]
-        removed = [emoji.name for emoji in before if emoji not in after]
-
-        embed.description += f"`ADDED:` {', '.join(added)}\n" if len(added) > 0 else ""
-        embed.description += (
-            f"`REMOVED:` {', '.join(removed)}\n" if len(removed) > 0 else ""
-        )
-        embed.description = embed.description.removesuffix("\n")
-
-        if not embed.description:
-            embed.description = "Emoji names were modified"
-
-        return await logchannel.send(embed=embed)
+    ) -> None:
+        self.log_guild_assets("on_guild_emojis_update", guild, before, after)
 
     @commands.Cog.listener(name="on_guild_stickers_update")
     async def _logging_on_guild_stickers_update(
@@ -430,1031 +261,380 @@ class Events(commands.Cog):
         guild: discord.Guild,
         before: Sequence[discord.GuildSticker],
         after: Sequence[discord.GuildSticker],
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(guild)
-        if not config or not config["callbacks"]["on_guild_stickers_update"]:
-            return
-
-        logchannel = guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"The guild stickers were updated",
-            description="",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=guild.icon.url)
-
-        added = [sticker.name for sticker in after if sticker not in before]
-        removed = [sticker.name for sticker in before if sticker not in after]
-
-        embed.description += f"`ADDED:` {', '.join(added)}\n" if len(added) > 0 else ""
-        embed.description += (
-            f"`REMOVED:` {', '.join(removed)}\n" if len(removed) > 0 else ""
-        )
-        embed.description = embed.description.removesuffix("\n")
-
-        if not embed.description:
-            embed.description = "Sticker names were modified"
-
-        return await logchannel.send(embed=embed)
-
-    async def handle_inv_event(
-        self, invite: discord.Invite, event: str, config: dict
-    ) -> discord.Message | None:
-        logchannel = invite.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A guild invite was {event}",
-            description=f"`CHANNEL:` {invite.channel.mention}\n"
-            f"`USER:` {invite.inviter.mention}\n"
-            f"`CODE:` {invite.code}\n"
-            f"`CREATED AT:` {discord.utils.format_dt(invite.created_at, 'R')}\n"
-            f"`MAX AGE:` {invite.max_age}\n"
-            f"`TEMPORARY:` {invite.temporary}\n"
-            f"`USES:` {invite.uses}/{invite.max_uses}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=invite.guild.icon.url)
-        return await logchannel.send(embed=embed)
+    ) -> None:
+        self.log_guild_assets("on_guild_stickers_update", guild, before, after)
+
+    def log_invite(self, callback: str, invite: discord.Invite) -> None:
+        record = self.record(callback, invite.guild)
+        if record:
+            self.log(
+                record,
+                channel_id=invite.channel.id,
+                inviter_id=invite.inviter.id if invite.inviter else None,
+                code=invite.code,
+                created=invite.created_at,
+                max_age=invite.max_age,
+                temporary=invite.temporary,
+                uses=invite.uses,
+                max_uses=invite.max_uses,
+            )
 
     @commands.Cog.listener(name="on_invite_create")
-    async def _logging_on_invite_create(
-        self, invite: discord.Invite
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(invite.guild)
-        if not config or not config["callbacks"]["on_invite_create"]:
-            return
-        return await self.handle_inv_event(invite, "created", config)
+    async def _logging_on_invite_create(self, invite: discord.Invite) -> None:
+        self.log_invite("on_invite_create", invite)
 
     @commands.Cog.listener(name="on_invite_delete")
-    async def _logging_on_invite_delete(
-        self, invite: discord.Invite
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(invite.guild)
-        if not config or not config["callbacks"]["on_invite_delete"]:
-            return
-        return await self.handle_inv_event(invite, "deleted", config)
+    async def _logging_on_invite_delete(self, invite: discord.Invite) -> None:
+        self.log_invite("on_invite_delete", invite)
+
+    def log_integration(self, callback: str, integration: discord.Integration) -> None:
+        record = self.record(callback, integration.guild, integration.id)
+        if record:
+            self.log(
+                record,
+                name=integration.name,
+                type=integration.type,
+                user_id=integration.user.id,
+                account=integration.account.name,
+            )
 
     @commands.Cog.listener(name="on_integration_create")
     async def _logging_on_integration_create(
         self, integration: discord.Integration
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(integration.guild)
-        if not config or not config["callbacks"]["on_integration_create"]:
-            return
-
-        logchannel = integration.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A guild integration was created",
-            description=f"`NAME:` {integration.name}\n"
-            f"`TYPE:` {integration.type}\n"
-            f"`CREATOR:` {integration.user.mention}\n"
-            f"`ACCOUNT:` {integration.account.name}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=integration.guild.icon.url)
-
-        return await logchannel.send(embed=embed)
+    ) -> None:
+        self.log_integration("on_integration_create", integration)
 
     @commands.Cog.listener(name="on_integration_update")
     async def _logging_on_integration_update(
         self, integration: discord.Integration
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(integration.guild)
-        if not config or not config["callbacks"]["on_integration_update"]:
-            return
-
-        logchannel = integration.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A guild integration was updated",
-            description=f"`NAME:` {integration.name}\n"
-            f"`TYPE:` {integration.type}\n"
-            f"`CREATOR:` {integration.user.mention}\n"
-            f"`ACCOUNT:` {integration.account.name}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=integration.guild.icon.url)
-
-        return await logchannel.send(embed=embed)
+    ) -> None:
+        self.log_integration("on_integration_update", integration)
 
     @commands.Cog.listener(name="on_guild_integrations_update")
-    async def _logging_on_guild_integrations_update(
-        self, guild: discord.Guild
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(guild)
-        if not config or not config["callbacks"]["on_guild_integrat_update"]:
-            return
-
-        logchannel = guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"Guild integrations were updated",
-            description=f"`INTEGRATIONS:` {len(await guild.integrations())}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=guild.icon.url)
-
-        return await logchannel.send(embed=embed)
+    async def _logging_on_guild_integrations_update(self, guild: discord.Guild) -> None:
+        record = self.record("on_guild_integrat_update", guild)
+        if record:
+            self.log(record)
 
     @commands.Cog.listener(name="on_webhooks_update")
     async def _logging_on_webhooks_update(
         self, channel: discord.abc.GuildChannel
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(channel.guild)
-        if not config or not config["callbacks"]["on_webhooks_update"]:
-            return
-
-        logchannel = channel.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"Channel webhooks were updated",
-            description=f"`CHANNEL:` {channel.mention}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=channel.guild.icon.url)
-
-        return await logchannel.send(embed=embed)
-
-    async def handle_member_event(
-        self, member: discord.Member, event: str, config: dict
-    ) -> discord.Message | None:
-        logchannel = member.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A member has {event} the guild",
-            description=f"`MEMBER:` {member.mention}\n"
-            f"`ID:` {member.id}\n"
-            f"`CREATED:` {discord.utils.format_dt(member.created_at, 'R')}\n"
-            f"`JOINED:` {discord.utils.format_dt(member.joined_at, 'R')}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=member.display_avatar.url)
-
-        return await logchannel.send(embed=embed)
+    ) -> None:
+        record = self.record("on_webhooks_update", channel.guild, channel.id)
+        if record:
+            self.log(record)
+
+    def log_member(self, callback: str, member: discord.Member) -> None:
+        record = self.record(callback, member.guild, member.id)
+        if record:
+            self.log(
+                record,
+                created=member.created_at,
+                joined=member.joined_at,
+                avatar=member.display_avatar,
+            )
 
     @commands.Cog.listener(name="on_member_join")
-    async def _logging_on_member_join(
-        self, member: discord.Member
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(member.guild)
-        if not config or not config["callbacks"]["on_member_join"]:
-            return
-        return await self.handle_member_event(member, "joined", config)
+    async def _logging_on_member_join(self, member: discord.Member) -> None:
+        self.log_member("on_member_join", member)
 
     @commands.Cog.listener(name="on_member_remove")
-    async def _logging_on_member_remove(
-        self, member: discord.Member
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(member.guild)
-        if not config or not config["callbacks"]["on_member_remove"]:
-            return
-        return await self.handle_member_event(member, "left", config)
+    async def _logging_on_member_remove(self, member: discord.Member) -> None:
+        self.log_member("on_member_remove", member)
 
     @commands.Cog.listener(name="on_member_update")
     async def _logging_on_member_update(
         self, before: discord.Member, after: discord.Member
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(after.guild)
-        if not config or not config["callbacks"]["on_member_update"]:
-            return
-
-        logchannel = after.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A guild member was updated",
-            description=f"`MEMBER:` {after.mention}\n",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=after.guild.icon.url)
-
-        k_ignore = ("guild_permissions", "roles")
-        beforeattrs = {
-            k: (
-                str(getattr(before, k))
-                if k not in k_ignore
-                else (
-                    len(getattr(before, k))
-                    if isinstance(getattr(before, k), list)
-                    else (getattr(before, k).value)
-                )
-            )
-            for k in [
-                attr for attr in dir(before) if attr[:2] != "__" and attr[0] != "_"
-            ]
-            if "bound method" not in str(getattr(before, k))
-        }
-        afterattrs = {
-            k: (
-                str(getattr(after, k))
-                if k not in k_ignore
-                else (
-                    len(getattr(after, k))
-                    if isinstance(getattr(after, k), list)
-                    else (getattr(after, k).value)
-                )
+    ) -> None:
+        record = self.record("on_member_update", after.guild, after.id)
+        if record:
+            self.log(record, changes=changes(before, after))
+
+    def log_member_ban(
+        self, callback: str, guild: discord.Guild, user: discord.Member | discord.User
+    ) -> None:
+        record = self.record(callback, guild, user.id)
+        if record:
+            self.log(
+                record,
+                name=str(user),
+                created=user.created_at,
+                avatar=user.display_avatar,
             )
-            for k in [
-                attr for attr in dir(after) if attr[:2] != "__" and attr[0] != "_"
-            ]
-            if "bound method" not in str(getattr(after, k))
-        }
-        differences = {
-            k: (beforeattrs[k], v) for k, v in afterattrs.items() if beforeattrs[k] != v
-        }
-
-        for name, change in differences.items():
-            embed.description += f"`{name.upper()}:` {change[0]} → {change[1]}\n"
-        embed.description = embed.description.removesuffix("\n")
-
-        return await logchannel.send(embed=embed)
-
-    async def handle_memberban_event(
-        self,
-        member: discord.Member | discord.User,
-        guild: discord.Guild,
-        event: str,
-        config: dict,
-    ) -> discord.Message | None:
-        logchannel = guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A member was {event} from the guild",
-            description=f"`MEMBER:` {member.mention}\n"
-            f"`NAME:` {str(member)}\n"
-            f"`ID:` {member.id}\n"
-            f"`CREATED:` {discord.utils.format_dt(member.created_at, 'R')}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=member.display_avatar.url)
-
-        return await logchannel.send(embed=embed)
 
     @commands.Cog.listener(name="on_member_ban")
     async def _logging_on_member_ban(
         self, guild: discord.Guild, user: discord.Member | discord.User
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(guild)
-        if not config or not config["callbacks"]["on_member_ban"]:
-            return
-        return await self.handle_memberban_event(user, guild, "banned", config)
+    ) -> None:
+        self.log_member_ban("on_member_ban", guild, user)
 
     @commands.Cog.listener(name="on_member_unban")
     async def _logging_on_member_unban(
         self, guild: discord.Guild, user: discord.User
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(guild)
-        if not config or not config["callbacks"]["on_member_unban"]:
-            return
-        return await self.handle_memberban_event(user, guild, "unbanned", config)
+    ) -> None:
+        self.log_member_ban("on_member_unban", guild, user)
 
     @commands.Cog.listener(name="on_message_edit")
     async def _logging_on_message_edit(
         self, before: discord.Message, after: discord.Message
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(after.guild)
-        if not config or not config["callbacks"]["on_message_edit"]:
-            return
-
-        logchannel = after.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A message was edited in #{after.channel.name}",
-            description=f"",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=after.guild.icon.url)
-
-        before.embeds = after.embeds = []
-
-        k_ignore = ("attachments",)
-        beforeattrs = {
-            k: (
-                str(getattr(before, k))
-                if k not in k_ignore
-                else (len(getattr(before, k)))
-            )
-            for k in [
-                attr for attr in dir(before) if attr[:2] != "__" and attr[0] != "_"
-            ]
-            if "bound method" not in str(getattr(before, k))
-        }
-        afterattrs = {
-            k: (
-                str(getattr(after, k))
-                if k not in k_ignore
-                else (len(getattr(after, k)))
-            )
-            for k in [
-                attr for attr in dir(after) if attr[:2] != "__" and attr[0] != "_"
-            ]
-            if "bound method" not in str(getattr(after, k))
-        }
-        differences = {
-            k: (beforeattrs[k], v)
-            for k, v in afterattrs.items()
-            if (
-                beforeattrs[k] != v
-                and k not in ("embeds", "system_content", "content", "edited_at")
+    ) -> None:
+        record = self.record("on_message_edit", after.guild, after.id)
+        if not record:
+            return
+
+        changed = changes(before, after)
+        if changed:
+            self.log(
+                record,
+                changes=changed,
+                channel_id=after.channel.id,
+                channel_name=after.channel.name,
             )
-        }
-
-        if len(differences.keys()) == 0:
-            return
-
-        for name, change in differences.items():
-            embed.description += f"`{name.upper()}:` {change[0]} → {change[1]}\n"
-        embed.description = embed.description.removesuffix("\n")
-        embed.description += f"\n{after.jump_url}"
-
-        return await logchannel.send(embed=embed)
 
     @commands.Cog.listener(name="on_message_delete")
-    async def _logging_on_message_delete(
-        self, message: discord.Message
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(message.guild)
-        if not config or not config["callbacks"]["on_message_delete"]:
-            return
-
-        logchannel = message.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A message was deleted",
-            description=f"`CONTENT:` {message.clean_content}\n"
-            f"`AUTHOR:` {message.author.mention}\n"
-            f"`CHANNEL:` {message.channel.mention}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=message.author.display_avatar.url)
-
-        return await logchannel.send(embed=embed)
+    async def _logging_on_message_delete(self, message: discord.Message) -> None:
+        record = self.record("on_message_delete", message.guild, message.id)
+        if record:
+            self.log(
+                record,
+                content=message.clean_content,
+                author_id=message.author.id,
+                channel_id=message.channel.id,
+                avatar=message.author.display_avatar,
+            )
 
     @commands.Cog.listener(name="on_bulk_message_delete")
     async def _logging_on_bulk_message_delete(
         self, messages: List[discord.Message]
-    ) -> discord.Message | None:
+    ) -> None:
         message = messages[0]
-        config = await self.get_guild_config(message.guild)
-        if not config or not config["callbacks"]["on_bulk_message_delete"]:
-            return
-
-        logchannel = message.guild.get_channel(config["channel"])
-
-        authors = set([m.author.id for m in messages])
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"{len(messages)} messages were bulk deleted",
-            description=f"`CHANNEL:` {message.channel.mention}\n"
-            f"`AUTHORS:` {len(authors)}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=message.guild.icon.url)
+        record = self.record("on_bulk_message_delete", message.guild)
+        if record:
+            self.log(
+                record,
+                count=len(messages),
+                channel_id=message.channel.id,
+                authors=len(set([m.author.id for m in messages])),
+            )
 
-        return await logchannel.send(embed=embed)
+    def log_reaction(
+        self,
+        callback: str,
+        reaction: discord.Reaction,
+        user: discord.Member | discord.User,
+    ) -> None:
+        message = reaction.message
+        record = self.record(callback, message.guild, message.id)
+        if record:
+            self.log(
+                record,
+                user_id=user.id,
+                channel_id=message.channel.id,
+                count=reaction.count,
+                avatar=user.display_avatar,
+            )
 
     @commands.Cog.listener(name="on_reaction_add")
     async def _logging_on_reaction_add(
         self, reaction: discord.Reaction, user: discord.Member | discord.User
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(reaction.message.guild)
-        if not config or not config["callbacks"]["on_reaction_add"]:
-            return
-
-        logchannel = reaction.message.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A reaction was added to a message",
-            description=f"`USER:` {user.mention}\n"
-            f"`CHANNEL:` {reaction.message.channel.mention}\n"
-            f"`COUNT:` {reaction.count}\n"
-            f"{reaction.message.jump_url}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=user.display_avatar.url)
-
-        return await logchannel.send(embed=embed)
+    ) -> None:
+        self.log_reaction("on_reaction_add", reaction, user)
 
     @commands.Cog.listener(name="on_reaction_remove")
     async def _logging_on_reaction_remove(
         self, reaction: discord.Reaction, user: discord.Member | discord.User
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(reaction.message.guild)
-        if not config or not config["callbacks"]["on_reaction_remove"]:
-            return
-
-        logchannel = reaction.message.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A reaction was removed from a message",
-            description=f"`USER:` {user.mention}\n"
-            f"`CHANNEL:` {reaction.message.channel.mention}\n"
-            f"`COUNT:` {reaction.count}\n"
-            f"{reaction.message.jump_url}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=user.display_avatar.url)
-
-        return await logchannel.send(embed=embed)
+    ) -> None:
+        self.log_reaction("on_reaction_remove", reaction, user)
+
+    def log_reaction_clear(
+        self, callback: str, message: discord.Message, count: int | None = None
+    ) -> None:
+        record = self.record(callback, message.guild, message.id)
+        if record:
+            self.log(
+                record,
+                count=count,
+                author_id=message.author.id,
+                channel_id=message.channel.id,
+                avatar=message.author.display_avatar,
+            )
 
     @commands.Cog.listener(name="on_reaction_clear")
     async def _logging_on_reaction_clear(
         self, message: discord.Message, reactions: List[discord.Reaction]
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(message.guild)
-        if not config or not config["callbacks"]["on_reaction_clear"]:
-            return
-
-        logchannel = message.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"{len(reactions)} reactions were cleared",
-            description=f"`AUTHOR:` {message.author.mention}\n"
-            f"`CHANNEL:` {message.channel.mention}\n"
-            f"{message.jump_url}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=message.author.display_avatar.url)
-
-        return await logchannel.send(embed=embed)
+    ) -> None:
+        self.log_reaction_clear("on_reaction_clear", message, len(reactions))
 
     @commands.Cog.listener(name="on_reaction_clear_emoji")
     async def _logging_on_reaction_clear_emoji(
         self, reaction: discord.Reaction
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(reaction.message.guild)
-        if not config or not config["callbacks"]["on_reaction_clear_emoji"]:
-            return
-
-        logchannel = reaction.message.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"Reaction emojis were cleared",
-            description=f"`AUTHOR:` {reaction.message.author.mention}\n"
-            f"`CHANNEL:` {reaction.message.channel.mention}\n"
-            f"{reaction.message.jump_url}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=reaction.message.author.display_avatar.url)
-
-        return await logchannel.send(embed=embed)
+    ) -> None:
+        self.log_reaction_clear("on_reaction_clear_emoji", reaction.message)
+
+    def log_role(self, callback: str, role: discord.Role) -> None:
+        record = self.record(callback, role.guild, role.id)
+        if record:
+            self.log(
+                record,
+                name=role.name,
+                hoist=role.hoist,
+                position=role.position,
+                managed=role.managed,
+            )
 
     @commands.Cog.listener(name="on_guild_role_create")
-    async def _logging_on_guild_role_create(
-        self, role: discord.Role
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(role.guild)
-        if not config or not config["callbacks"]["on_guild_role_create"]:
-            return
-
-        logchannel = role.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A new role was created",
-            description=f"`NAME:` {role.name}\n"
-            f"`HOISTED:` {role.hoist}\n"
-            f"`POSITION:` {role.position}\n"
-            f"`MANAGED:` {role.managed}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=role.guild.icon.url)
-
-        return await logchannel.send(embed=embed)
+    async def _logging_on_guild_role_create(self, role: discord.Role) -> None:
+        self.log_role("on_guild_role_create", role)
 
     @commands.Cog.listener(name="on_guild_role_delete")
-    async def _logging_on_guild_role_delete(
-        self, role: discord.Role
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(role.guild)
-        if not config or not config["callbacks"]["on_guild_role_delete"]:
-            return
-
-        logchannel = role.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A role was deleted",
-            description=f"`NAME:` {role.name}\n"
-            f"`HOISTED:` {role.hoist}\n"
-            f"`POSITION:` {role.position}\n"
-            f"`MANAGED:` {role.managed}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=role.guild.icon.url)
-
-        return await logchannel.send(embed=embed)
+    async def _logging_on_guild_role_delete(self, role: discord.Role) -> None:
+        self.log_role("on_guild_role_delete", role)
 
     @commands.Cog.listener(name="on_guild_role_update")
     async def _logging_on_guild_role_update(
         self, before: discord.Role, after: discord.Role
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(after.guild)
-        if not config or not config["callbacks"]["on_guild_role_update"]:
-            return
-
-        logchannel = after.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"The '{before.name}' role was updated",
-            description="",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=after.guild.icon.url)
-
-        k_ignores = ("tags", "permissions", "color")
-        beforeattrs = {
-            k: (
-                str(getattr(before, k))
-                if not isinstance(getattr(before, k), (list, dict))
-                else (
-                    len(getattr(before, k))
-                    if isinstance(getattr(before, k), list)
-                    else len(getattr(before, k).keys())
-                )
+    ) -> None:
+        record = self.record("on_guild_role_update", after.guild, after.id)
+        if record:
+            self.log(record, name=before.name, changes=changes(before, after))
+
+    def log_scheduled_event(self, callback: str, event: discord.ScheduledEvent) -> None:
+        record = self.record(callback, event.guild, event.id)
+        if record:
+            self.log(
+                record,
+                name=event.name,
+                description=event.description,
+                start=event.start_time,
+                end=event.end_time,
+                creator_id=event.creator_id,
+                location=event.location,
+                status=event.status,
             )
-            for k in [
-                attr for attr in dir(before) if attr[:2] != "__" and attr[0] != "_"
-            ]
-            if "bound method" not in str(getattr(before, k)) and k not in k_ignores
-        }
-        afterattrs = {
-            k: (
-                str(getattr(after, k))
-                if not isinstance(getattr(after, k), (list, dict))
-                else (
-                    len(getattr(after, k))
-                    if isinstance(getattr(after, k), list)
-                    else len(getattr(after, k).keys())
-                )
-            )
-            for k in [
-                attr for attr in dir(after) if attr[:2] != "__" and attr[0] != "_"
-            ]
-            if "bound method" not in str(getattr(after, k)) and k not in k_ignores
-        }
-        differences = {
-            k: (beforeattrs[k], v) for k, v in afterattrs.items() if beforeattrs[k] != v
-        }
-
-        for name, change in differences.items():
-            embed.description += f"`{name.upper()}:` {change[0]} → {change[1]}\n"
-        embed.description = embed.description.removesuffix("\n")
-
-        return await logchannel.send(embed=embed)
 
     @commands.Cog.listener(name="on_scheduled_event_create")
     async def _logging_on_scheduled_event_create(
         self, event: discord.ScheduledEvent
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(event.guild)
-        if not config or not config["callbacks"]["on_scheduled_event_create"]:
-            return
-
-        logchannel = event.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A scheduled event was created",
-            description=f"`NAME:` {event.name}\n"
-            f"`DESC:` {event.description}\n"
-            f"`START:` {discord.utils.format_dt(event.start_time, 'R')}\n"
-            f"`END:` {discord.utils.format_dt(event.end_time, 'R')}\n"
-            f"`CREATOR:` {event.creator.mention if event.creator else 'NaN'}\n"
-            f"`LOCATION:` {event.location}\n"
-            f"`STATUS:` {event.status}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=event.guild.icon.url)
-
-        return await logchannel.send(embed=embed)
+    ) -> None:
+        self.log_scheduled_event("on_scheduled_event_create", event)
 
     @commands.Cog.listener(name="on_scheduled_event_delete")
     async def _logging_on_scheduled_event_delete(
         self, event: discord.ScheduledEvent
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(event.guild)
-        if not config or not config["callbacks"]["on_scheduled_event_delete"]:
-            return
-
-        logchannel = event.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A scheduled event was deleted",
-            description=f"`NAME:` {event.name}\n"
-            f"`DESC:` {event.description}\n"
-            f"`START:` {discord.utils.format_dt(event.start_time, 'R')}\n"
-            f"`END:` {discord.utils.format_dt(event.end_time, 'R')}\n"
-            f"`CREATOR:` {event.creator.mention if event.creator else 'NaN'}\n"
-            f"`LOCATION:` {event.location}\n"
-            f"`STATUS:` {event.status}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=event.guild.icon.url)
-
-        return await logchannel.send(embed=embed)
+    ) -> None:
+        self.log_scheduled_event("on_scheduled_event_delete", event)
 
     @commands.Cog.listener(name="on_scheduled_event_update")
     async def _logging_on_scheduled_event_update(
         self, before: discord.ScheduledEvent, after: discord.ScheduledEvent
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(after.guild)
-        if not config or not config["callbacks"]["on_scheduled_event_update"]:
-            return
-
-        logchannel = after.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"The '{before.name}' event was updated",
-            description="",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=after.guild.icon.url)
-
-        k_ignores = ("entity_type", "entity_id", "privacy_level")
-        ktypes = (list, dict, datetime.datetime)
-        beforeattrs = {
-            k: (
-                str(getattr(before, k))
-                if not isinstance(getattr(before, k), ktypes)
-                else (
-                    len(getattr(before, k))
-                    if isinstance(getattr(before, k), list)
-                    else len(getattr(before, k).keys())
-                    if isinstance(getattr(before, k), dict)
-                    else discord.utils.format_dt(getattr(before, k), "R")
-                )
-            )
-            for k in [
-                attr for attr in dir(before) if attr[:2] != "__" and attr[0] != "_"
-            ]
-            if "bound method" not in str(getattr(before, k)) and k not in k_ignores
-        }
-        afterattrs = {
-            k: (
-                str(getattr(after, k))
-                if not isinstance(getattr(after, k), ktypes)
-                else (
-                    len(getattr(after, k))
-                    if isinstance(getattr(after, k), list)
-                    else len(getattr(after, k).keys())
-                    if isinstance(getattr(after, k), dict)
-                    else discord.utils.format_dt(getattr(after, k), "R")
-                )
-            )
-            for k in [
-                attr for attr in dir(after) if attr[:2] != "__" and attr[0] != "_"
-            ]
-            if "bound method" not in str(getattr(after, k)) and k not in k_ignores
-        }
-        differences = {
-            k: (beforeattrs[k], v) for k, v in afterattrs.items() if beforeattrs[k] != v
-        }
-
-        for name, change in differences.items():
-            embed.description += f"`{name.upper()}:` {change[0]} → {change[1]}\n"
-        embed.description = embed.description.removesuffix("\n")
-
-        return await logchannel.send(embed=embed)
+    ) -> None:
+        record = self.record("on_scheduled_event_update", after.guild, after.id)
+        if record:
+            self.log(record, name=before.name, changes=changes(before, after))
+
+    def log_scheduled_event_user(
+        self, callback: str, event: discord.ScheduledEvent, user: discord.User
+    ) -> None:
+        record = self.record(callback, event.guild, user.id)
+        if record:
+            self.log(record, event=event.name, avatar=user.display_avatar)
 
     @commands.Cog.listener(name="on_scheduled_event_user_add")
     async def _logging_on_scheduled_event_user_add(
         self, event: discord.ScheduledEvent, user: discord.User
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(event.guild)
-        if not config or not config["callbacks"]["on_sched_event_user_add"]:
-            return
-
-        logchannel = event.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A user joined an event",
-            description=f"`EVENT:` {event.name}\n" f"`USER:` {user.mention}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=user.display_avatar.url)
-
-        return await logchannel.send(embed=embed)
+    ) -> None:
+        self.log_scheduled_event_user("on_sched_event_user_add", event, user)
 
     @commands.Cog.listener(name="on_scheduled_event_user_remove")
     async def _logging_on_scheduled_event_user_remove(
         self, event: discord.ScheduledEvent, user: discord.User
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(event.guild)
-        if not config or not config["callbacks"]["on_sched_event_user_remove"]:
-            return
-
-        logchannel = event.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A user left an event",
-            description=f"`EVENT:` {event.name}\n" f"`USER:` {user.mention}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=user.display_avatar.url)
-
-        return await logchannel.send(embed=embed)
+    ) -> None:
+        self.log_scheduled_event_user("on_sched_event_user_remove", event, user)
+
+    def log_stage_instance(
+        self, callback: str, stage_instance: discord.StageInstance
+    ) -> None:
+        record = self.record(callback, stage_instance.guild, stage_instance.id)
+        if record:
+            self.log(
+                record,
+                channel_id=stage_instance.channel_id,
+                topic=stage_instance.topic,
+                discoverable_disabled=stage_instance.discoverable_disabled,
+            )
 
     @commands.Cog.listener(name="on_stage_instance_create")
     async def _logging_on_stage_instance_create(
         self, stage_instance: discord.StageInstance
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(stage_instance.guild)
-        if not config or not config["callbacks"]["on_stage_instance_create"]:
-            return
-
-        logchannel = stage_instance.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A stage instance was created",
-            description=f"`CHANNEL:` {stage_instance.channel_id}\n"
-            f"`TOPIC:` {stage_instance.topic}\n"
-            f"`DISCOVERABLE:` {not stage_instance.discoverable_disabled}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=stage_instance.guild.icon.url)
-
-        return await logchannel.send(embed=embed)
+    ) -> None:
+        self.log_stage_instance("on_stage_instance_create", stage_instance)
 
     @commands.Cog.listener(name="on_stage_instance_delete")
     async def _logging_on_stage_instance_delete(
         self, stage_instance: discord.StageInstance
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(stage_instance.guild)
-        if not config or not config["callbacks"]["on_stage_instance_delete"]:
-            return
-
-        logchannel = stage_instance.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A stage instance was deleted",
-            description=f"`CHANNEL:` {stage_instance.channel_id}\n"
-            f"`TOPIC:` {stage_instance.topic}\n"
-            f"`DISCOVERABLE:` {not stage_instance.discoverable_disabled}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=stage_instance.guild.icon.url)
-
-        return await logchannel.send(embed=embed)
+    ) -> None:
+        self.log_stage_instance("on_stage_instance_delete", stage_instance)
 
     @commands.Cog.listener(name="on_stage_instance_update")
     async def _logging_on_stage_instance_update(
         self, before: discord.StageInstance, after: discord.StageInstance
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(after.guild)
-        if not config or not config["callbacks"]["on_stage_instance_update"]:
-            return
-
-        logchannel = after.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A stage instance was updated",
-            description="",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=after.guild.icon.url)
-
-        k_ignores = ("privacy_level",)
-        ktypes = (list, dict, datetime.datetime)
-        beforeattrs = {
-            k: (
-                str(getattr(before, k))
-                if not isinstance(getattr(before, k), ktypes)
-                else (
-                    len(getattr(before, k))
-                    if isinstance(getattr(before, k), list)
-                    else len(getattr(before, k).keys())
-                    if isinstance(getattr(before, k), dict)
-                    else discord.utils.format_dt(getattr(before, k), "R")
-                )
-            )
-            for k in [
-                attr for attr in dir(before) if attr[:2] != "__" and attr[0] != "_"
-            ]
-            if "bound method" not in str(getattr(before, k)) and k not in k_ignores
-        }
-        afterattrs = {
-            k: (
-                str(getattr(after, k))
-                if not isinstance(getattr(after, k), ktypes)
-                else (
-                    len(getattr(after, k))
-                    if isinstance(getattr(after, k), list)
-                    else len(getattr(after, k).keys())
-                    if isinstance(getattr(after, k), dict)
-                    else discord.utils.format_dt(getattr(after, k), "R")
-                )
+    ) -> None:
+        record = self.record("on_stage_instance_update", after.guild, after.id)
+        if record:
+            self.log(record, changes=changes(before, after))
+
+    def log_thread(self, callback: str, thread: discord.Thread, **fields) -> None:
+        record = self.record(callback, thread.guild, thread.id)
+        if record:
+            self.log(
+                record,
+                name=thread.name,
+                parent_id=thread.parent_id,
+                owner_id=thread.owner_id,
+                auto_archive_duration=thread.auto_archive_duration,
+                **fields,
             )
-            for k in [
-                attr for attr in dir(after) if attr[:2] != "__" and attr[0] != "_"
-            ]
-            if "bound method" not in str(getattr(after, k)) and k not in k_ignores
-        }
-        differences = {
-            k: (beforeattrs[k], v) for k, v in afterattrs.items() if beforeattrs[k] != v
-        }
-
-        for name, change in differences.items():
-            embed.description += f"`{name.upper()}:` {change[0]} → {change[1]}\n"
-        embed.description = embed.description.removesuffix("\n")
-
-        return await logchannel.send(embed=embed)
 
     @commands.Cog.listener(name="on_thread_create")
-    async def _logging_on_thread_create(
-        self, thread: discord.Thread
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(thread.guild)
-        if not config or not config["callbacks"]["on_thread_create"]:
-            return
-
-        logchannel = thread.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A thread was created",
-            description=f"`NAME:` {thread.name}\n"
-            f"`CHANNEL:` <#{thread.parent_id}>\n"
-            f"`OWNER:` <@!{thread.owner_id}>\n"
-            f"`AUTO ARCHIVE:` {thread.auto_archive_duration}\n"
-            f"{thread.jump_url}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=thread.guild.icon.url)
-
-        return await logchannel.send(embed=embed)
+    async def _logging_on_thread_create(self, thread: discord.Thread) -> None:
+        self.log_thread("on_thread_create", thread)
 
     @commands.Cog.listener(name="on_thread_join")
-    async def _logging_on_thread_join(
-        self, thread: discord.Thread
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(thread.guild)
-        if not config or not config["callbacks"]["on_thread_join"]:
-            return
-
-        logchannel = thread.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A user joined a thread",
-            description=f"`NAME:` {thread.name}\n"
-            f"`CHANNEL:` <#{thread.parent_id}>\n"
-            f"`OWNER:` <@!{thread.owner_id}>\n"
-            f"`AUTO ARCHIVE:` {thread.auto_archive_duration}\n"
-            f"{thread.jump_url}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=thread.guild.icon.url)
-
-        return await logchannel.send(embed=embed)
+    async def _logging_on_thread_join(self, thread: discord.Thread) -> None:
+        self.log_thread("on_thread_join", thread)
 
     @commands.Cog.listener(name="on_thread_update")
     async def _logging_on_thread_update(
         self, before: discord.Thread, after: discord.Thread
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(after.guild)
-        if not config or not config["callbacks"]["on_thread_update"]:
-            return
-
-        logchannel = after.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"The thread '{before.name}' was updated",
-            description="",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=after.guild.icon.url)
-
-        k_ignores = ("",)
-        ktypes = (list, dict, datetime.datetime)
-        beforeattrs = {
-            k: (
-                str(getattr(before, k))
-                if not isinstance(getattr(before, k), ktypes)
-                else (
-                    len(getattr(before, k))
-                    if isinstance(getattr(before, k), list)
-                    else len(getattr(before, k).keys())
-                    if isinstance(getattr(before, k), dict)
-                    else discord.utils.format_dt(getattr(before, k), "R")
-                )
-            )
-            for k in [
-                attr for attr in dir(before) if attr[:2] != "__" and attr[0] != "_"
-            ]
-            if "bound method" not in str(getattr(before, k)) and k not in k_ignores
-        }
-        afterattrs = {
-            k: (
-                str(getattr(after, k))
-                if not isinstance(getattr(after, k), ktypes)
-                else (
-                    len(getattr(after, k))
-                    if isinstance(getattr(after, k), list)
-                    else len(getattr(after, k).keys())
-                    if isinstance(getattr(after, k), dict)
-                    else discord.utils.format_dt(getattr(after, k), "R")
-                )
-            )
-            for k in [
-                attr for attr in dir(after) if attr[:2] != "__" and attr[0] != "_"
-            ]
-            if "bound method" not in str(getattr(after, k)) and k not in k_ignores
-        }
-        differences = {
-            k: (beforeattrs[k], v) for k, v in afterattrs.items() if beforeattrs[k] != v
-        }
-
-        for name, change in differences.items():
-            embed.description += f"`{name.upper()}:` {change[0]} → {change[1]}\n"
-        embed.description = embed.description.removesuffix("\n")
-
-        return await logchannel.send(embed=embed)
+    ) -> None:
+        record = self.record("on_thread_update", after.guild, after.id)
+        if record:
+            self.log(record, name=before.name, changes=changes(before, after))
 
     @commands.Cog.listener(name="on_thread_remove")
-    async def _logging_on_thread_remove(
-        self, thread: discord.Thread
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(thread.guild)
-        if not config or not config["callbacks"]["on_thread_remove"]:
-            return
-
-        logchannel = thread.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A thread was removed",
-            description=f"`NAME:` {thread.name}\n"
-            f"`CHANNEL:` <#{thread.parent_id}>\n"
-            f"`OWNER:` <@!{thread.owner_id}>\n"
-            f"`AUTO ARCHIVE:` {thread.auto_archive_duration}\n"
-            f"`MESSAGES:` {thread.message_count}\n"
-            f"{thread.jump_url}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=thread.guild.icon.url)
-
-        return await logchannel.send(embed=embed)
+    async def _logging_on_thread_remove(self, thread: discord.Thread) -> None:
+        self.log_thread("on_thread_remove", thread, message_count=thread.message_count)
 
     @commands.Cog.listener(name="on_thread_delete")
-    async def _logging_on_thread_delete(
-        self, thread: discord.Thread
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(thread.guild)
-        if not config or not config["callbacks"]["on_thread_delete"]:
-            return
+    async def _logging_on_thread_delete(self, thread: discord.Thread) -> None:
+        self.log_thread("on_thread_delete", thread, message_count=thread.message_count)
 
-        logchannel = thread.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A thread was deleted",
-            description=f"`NAME:` {thread.name}\n"
-            f"`CHANNEL:` <#{thread.parent_id}>\n"
-            f"`OWNER:` <@!{thread.owner_id}>\n"
-            f"`AUTO ARCHIVE:` {thread.auto_archive_duration}\n"
-            f"`MESSAGES:` {thread.message_count}\n"
-            f"{thread.jump_url}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=thread.guild.icon.url)
-
-        return await logchannel.send(embed=embed)
+    def log_thread_member(self, callback: str, member: discord.ThreadMember) -> None:
+        record = self.record(callback, member.thread.guild, member.id)
+        if record:
+            self.log(record, thread_id=member.thread_id)
 
     @commands.Cog.listener(name="on_thread_member_join")
     async def _logging_on_thread_member_join(
         self, member: discord.ThreadMember
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(member.thread.guild)
-        if not config or not config["callbacks"]["on_thread_member_join"]:
-            return
-
-        logchannel = member.thread.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A member joined a thread",
-            description=f"`USER:` {member.id}\n"
-            f"`THREAD:` {member.thread.mention}\n"
-            f"{member.thread.jump_url}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=member.thread.guild.icon.url)
-
-        return await logchannel.send(embed=embed)
+    ) -> None:
+        self.log_thread_member("on_thread_member_join", member)
 
     @commands.Cog.listener(name="on_thread_member_remove")
     async def _logging_on_thread_member_remove(
         self, member: discord.ThreadMember
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(member.thread.guild)
-        if not config or not config["callbacks"]["on_thread_member_remove"]:
-            return
-
-        logchannel = member.thread.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A member left a thread",
-            description=f"`USER:` {member.id}\n"
-            f"`THREAD:` {member.thread.mention}\n"
-            f"{member.thread.jump_url}",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=member.thread.guild.icon.url)
-
-        return await logchannel.send(embed=embed)
+    ) -> None:
+        self.log_thread_member("on_thread_member_remove", member)
 
     @commands.Cog.listener(name="on_voice_state_update")
     async def _logging_on_voice_state_update(
@@ -1462,76 +642,14 @@ class Events(commands.Cog):
         member: discord.Member,
         before: discord.VoiceState,
         after: discord.VoiceState,
-    ) -> discord.Message | None:
-        config = await self.get_guild_config(member.guild)
-        if not config or not config["callbacks"]["on_voice_state_update"]:
-            return
-
-        logchannel = member.guild.get_channel(config["channel"])
-
-        embed = discord.Embed(
-            colour=self.bot.colour,
-            title=f"A member's voice state was updated",
-            description=f"`MEMBER:` {member.mention}\n",
-            timestamp=datetime.datetime.now(),
-        ).set_thumbnail(url=member.guild.icon.url)
-
-        k_ignores = ("",)
-        ktypes = (
-            list,
-            dict,
-            datetime.datetime,
-            discord.VoiceChannel,
-            discord.StageChannel,
-        )
-        beforeattrs = {
-            k: (
-                str(getattr(before, k))
-                if not isinstance(getattr(before, k), ktypes)
-                else (
-                    len(getattr(before, k))
-                    if isinstance(getattr(before, k), list)
-                    else len(getattr(before, k).keys())
-                    if isinstance(getattr(before, k), dict)
-                    else discord.utils.format_dt(getattr(before, k), "R")
-                    if isinstance(getattr(before, k), datetime.datetime)
-                    else getattr(before, k).name
-                )
-            )
-            for k in [
-                attr for attr in dir(before) if attr[:2] != "__" and attr[0] != "_"
-            ]
-            if "bound method" not in str(getattr(before, k)) and k not in k_ignores
-        }
-        afterattrs = {
-            k: (
-                str(getattr(after, k))
-                if not isinstance(getattr(after, k), ktypes)
-                else (
-                    len(getattr(after, k))
-                    if isinstance(getattr(after, k), list)
-                    else len(getattr(after, k).keys())
-                    if isinstance(getattr(after, k), dict)
-                    else discord.utils.format_dt(getattr(after, k), "R")
-                    if isinstance(getattr(after, k), datetime.datetime)
-                    else getattr(after, k).name
-                )
-            )
-            for k in [
-                attr for attr in dir(after) if attr[:2] != "__" and attr[0] != "_"
-            ]
-            if "bound method" not in str(getattr(after, k)) and k not in k_ignores
-        }
-        differences = {
-            k: (beforeattrs[k], v) for k, v in afterattrs.items() if beforeattrs[k] != v
-        }
-
-        for name, change in differences.items():
-            embed.description += f"`{name.upper()}:` {change[0]} → {change[1]}\n"
-        embed.description = embed.description.removesuffix("\n")
-
-        return await logchannel.send(embed=embed)
+    ) -> None:
+        record = self.record("on_voice_state_update", member.guild, member.id)
+        if record:
+            self.log(record, changes=changes(before, after))
 
 
 async def setup(bot: Xanno) -> None:
-    await bot.add_cog(Events(bot))
+    cog = Events(bot)
+    await bot.add_cog(cog)
+    # listeners are only injected by add_cog, so prune them afterwards
+    cog.sync_listeners()
@@ -1,9 +1,9 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-import asyncio
 import datetime
-import json
+import re
+import time
 from itertools import zip_longest
 
 import discord
@@ -11,13 +11,60 @@ from discord import app_commands
 from discord.ext import commands
 
 from main import Xanno
+from utils.bans import Duration, Moment, Progress, ban_all
+from utils.cases import Case
 from utils.mappings import LOGGING_CALLBACKS
-from utils.views import RevokeView
+from utils.views import (
+    RevokeAllButton,
+    RevokeAllView,
+    RevokeButton,
+    RevokeExpiry,
+    RevokeView,
+)
+
+
+class MassbanFlags(commands.FlagConverter):
+    users: str = commands.flag(
+        default="", description="User IDs or mentions, separated by spaces"
+    )
+    joined_after: Moment = commands.flag(
+        default=None, description="Members who joined after this time or ID"
+    )
+    account_age: Duration = commands.flag(
+        default=None, description="Members whose account is younger than this, e.g. 2d"
+    )
+    name: str = commands.flag(
+        default=None, description="Members whose name matches this regex"
+    )
+    days_to_purge: int = commands.flag(
+        default=0, description="Last n days to delete their messages"
+    )
+    reason: str = commands.flag(default="None", description="Reason for the bans")
+    dry_run: bool = commands.flag(
+        default=False, description="Only list who would be banned"
+    )
 
 
 class Moderation(commands.Cog):
+    # seconds a ban can be revoked from its confirmation message
+    REVOKE_WINDOW = 60
+    REVOKE_ALL_WINDOW = 600
+    MASSBAN_LIMIT = 1000
+    CASES_PER_PAGE = 10
+
     def __init__(self, bot: Xanno) -> None:
         self.bot: Xanno = bot
+        self.revoke_expiry = RevokeExpiry(bot)
+        # mass ban ID -> (expires, banned user IDs), for its revoke-all button
+        self.ban_batches: dict[int, tuple[int, list[int]]] = {}
+
+    async def cog_load(self) -> None:
+        self.bot.add_dynamic_items(RevokeButton, RevokeAllButton)
+        self.revoke_expiry.start()
+
+    async def cog_unload(self) -> None:
+        self.bot.remove_dynamic_items(RevokeButton, RevokeAllButton)
+        self.revoke_expiry.close()
 
     @commands.guild_only()
     @commands.has_permissions(ban_members=True)
@@ -65,16 +112,193 @@ class Moderation(commands.Cog):
             cont = "User could not be informed"
 
         await member.ban(delete_message_days=dtp, reason=freason)
+        self.bot.cases.record(
+            ctx.guild.id, "ban", member.id, ctx.author.id, reason, dtp
+        )
+
+        expires = int(time.time()) + self.REVOKE_WINDOW
+        resp = await ctx.reply(
+            content=cont, embed=embed, view=RevokeView(member.id, expires)
+        )
+        self.revoke_expiry.add(resp, RevokeView, member.id, expires)
+        return resp
+
+    def massban_targets(
+        self, ctx: commands.Context, flags: MassbanFlags
+    ) -> tuple[list[int], int]:
+        """IDs matched by ``flags``, and how many were skipped as protected"""
+        targets = {int(i) for i in re.findall(r"[0-9]{15,20}", flags.users)}
 
-        view = RevokeView(bot=self.bot, member=member)
-        resp = await ctx.reply(content=cont, embed=embed, view=view)
-        await asyncio.sleep(60)
+        if flags.joined_after or flags.account_age or flags.name:
+            try:
+                pattern = flags.name and re.compile(flags.name, re.I)
+            except re.error as e:
+                raise commands.BadArgument(f"Invalid name pattern: {e}") from None
+            now = discord.utils.utcnow()
+            for member in ctx.guild.members:
+                if flags.joined_after and (
+                    not member.joined_at or member.joined_at <= flags.joined_after
+                ):
+                    continue
+                if flags.account_age and now - member.created_at > flags.account_age:
+                    continue
+                if pattern and not (
+                    pattern.search(member.name) or pattern.search(member.display_name)
+                ):
+                    continue
+                targets.add(member.id)
 
-        button = view.children[0]
-        if not button.disabled:
-            button.disabled = True
-            await resp.edit(view=view)
-            view.stop()
+        protected = {ctx.me.id, ctx.author.id, ctx.guild.owner_id}
+        for user_id in targets:
+            member = ctx.guild.get_member(user_id)
+            if member and (
+                member.top_role >= ctx.me.top_role
+                or (
+                    ctx.author.id != ctx.guild.owner_id
+                    and member.top_role >= ctx.author.top_role
+                )
+            ):
+                protected.add(user_id)
+        allowed = sorted(targets - protected)
+        return allowed, len(targets) - len(allowed)
+
+    @commands.guild_only()
+    @commands.has_permissions(ban_members=True)
+    @commands.bot_has_permissions(ban_members=True)
+    @commands.hybrid_command(name="massban")
+    async def massban(
+        self, ctx: commands.Context, *, flags: MassbanFlags
+    ) -> discord.Message:
+        """Ban many users at once, by ID, mention or member filters"""
+        targets, skipped = self.massban_targets(ctx, flags)
+        if not targets:
+            return await ctx.reply(
+                f"No users matched, {skipped} were skipped as protected"
+            )
+        if len(targets) > self.MASSBAN_LIMIT:
+            return await ctx.reply(
+                f"{len(targets)} users matched, narrow it down to "
+                f"{self.MASSBAN_LIMIT} or fewer"
+            )
+
+        listed = "\n".join(
+            f"{str(ctx.guild.get_member(u) or u)}({u})" for u in targets[:20]
+        ) + (f"\n...and {len(targets) - 20} more" if len(targets) > 20 else "")
+        if flags.dry_run:
+            return await ctx.reply(
+                embed=discord.Embed(
+                    colour=self.bot.colour,
+                    title=f"{len(targets)} users would be banned",
+                    description=f"`Skipped:` {skipped}\n```\n{listed}\n```",
+                    timestamp=datetime.datetime.now(),
+                )
+            )
+
+        dtp = 0 if flags.days_to_purge < 0 else min(flags.days_to_purge, 7)
+        status = await ctx.reply(f"Banning 0/{len(targets)}...")
+        progress = Progress(status, len(targets), "Banning")
+        banned, failed = await ban_all(
+            ctx.guild,
+            targets,
+            reason=f"{str(ctx.author)}({ctx.author.id}): {flags.reason}",
+            delete_message_seconds=dtp * 86400,
+            progress=progress,
+        )
+        await progress.close()
+        for user_id in banned:
+            self.bot.cases.record(
+                ctx.guild.id, "ban", user_id, ctx.author.id, flags.reason, dtp
+            )
+
+        embed = discord.Embed(
+            colour=self.bot.colour,
+            title=f"{len(banned)} users successfully banned",
+            description=f"`Moderator:` {str(ctx.author)}({ctx.author.id})\n"
+            f"`Reason:` {flags.reason}\n"
+            f"`DTP:` {dtp}\n"
+            f"`Failed:` {len(failed)}\n"
+            f"`Skipped:` {skipped}\n```\n{listed}\n```",
+            timestamp=datetime.datetime.now(),
+        )
+        if not banned:
+            return await status.edit(content=None, embed=embed)
+
+        now = int(time.time())
+        expires = now + self.REVOKE_ALL_WINDOW
+        self.ban_batches = {k: v for k, v in self.ban_batches.items() if v[0] > now}
+        self.ban_batches[ctx.message.id] = (expires, banned)
+        await status.edit(
+            content=None,
+            embed=embed,
+            view=RevokeAllView(ctx.message.id, expires),
+        )
+        self.revoke_expiry.add(status, RevokeAllView, ctx.message.id, expires)
+        return status
+
+    def case_page(
+        self, title: str, cases: list[Case], total: int, page: int
+    ) -> discord.Embed:
+        lines = []
+        for case in cases:
+            target = self.bot.get_user(case.target_id)
+            lines.append(
+                f"`#{case.id}` **{case.action}** <t:{int(case.created_at)}:R> "
+                f"{str(target or case.target_id)}({case.target_id}) "
+                f"by <@{case.moderator_id}>"
+                + (f" for {case.dtp} DTP" if case.dtp else "")
+                + f"\n`Reason:` {case.reason}"
+            )
+        pages = max(-(-total // self.CASES_PER_PAGE), 1)
+        embed = discord.Embed(
+            colour=self.bot.colour,
+            title=title,
+            description="\n".join(lines) or "No cases found",
+            timestamp=datetime.datetime.now(),
+        )
+        embed.set_footer(text=f"Page {page}/{pages}, {total} cases")
+        return embed
+
+    @commands.guild_only()
+    @commands.has_permissions(ban_members=True)
+    @commands.hybrid_command(name="cases")
+    @app_commands.describe(
+        moderator="Only cases opened by this moderator", page="Page to show"
+    )
+    async def cases(
+        self,
+        ctx: commands.Context,
+        moderator: discord.User | None = None,
+        page: int = 1,
+    ) -> discord.Message:
+        """List the moderation cases of this guild, newest first"""
+        page = max(page, 1)
+        cases, total = await self.bot.cases.cases(
+            ctx.guild.id,
+            moderator.id if moderator else None,
+            limit=self.CASES_PER_PAGE,
+            offset=(page - 1) * self.CASES_PER_PAGE,
+        )
+        title = f"Cases by {str(moderator)}" if moderator else f"Cases in {ctx.guild}"
+        return await ctx.reply(embed=self.case_page(title, cases, total, page))
+
+    @commands.guild_only()
+    @commands.has_permissions(ban_members=True)
+    @commands.hybrid_command(name="history")
+    @app_commands.describe(user="The user to look up", page="Page to show")
+    async def history(
+        self, ctx: commands.Context, user: discord.User, page: int = 1
+    ) -> discord.Message:
+        """List the moderation cases against a user, newest first"""
+        page = max(page, 1)
+        cases, total = await self.bot.cases.history(
+            ctx.guild.id,
+            user.id,
+            limit=self.CASES_PER_PAGE,
+            offset=(page - 1) * self.CASES_PER_PAGE,
+        )
+        embed = self.case_page(f"History of {str(user)}", cases, total, page)
+        embed.set_thumbnail(url=str(user.display_avatar))
+        return await ctx.reply(embed=embed)
 
     @commands.guild_only()
     @commands.has_permissions(administrator=True)
@@ -87,14 +311,10 @@ class Moderation(commands.Cog):
     @logging.command(name="config")
     async def config(self, ctx: commands.Context) -> None | discord.Message:
         """Configure the logging extension for your server"""
-        with open("logging.json", "r") as fp:
-            data = json.load(fp)
-
-        if not data.get(str(ctx.guild.id)):
-            config = {"channel": None, "callbacks": LOGGING_CALLBACKS}
-            data[str(ctx.guild.id)] = config
-        else:
-            config = data[str(ctx.guild.id)]
+        config = self.bot.logging_config.get(ctx.guild.id)
+        if not config:
+            config = {"channel": None, "callbacks": dict(LOGGING_CALLBACKS)}
+            await self.bot.logging_config.set(ctx.guild.id, config)
 
         channel = (
             None if not config["channel"] else ctx.guild.get_channel(config["channel"])
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import datetime
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from main import Xanno
+
+
+class Owner(commands.Cog):
+    def __init__(self, bot: Xanno) -> None:
+        self.bot: Xanno = bot
+
+    @commands.is_owner()
+    @commands.hybrid_command(name="stats")
+    async def stats(self, ctx: commands.Context) -> discord.Message:
+        """Show listener and command timings"""
+        lines = []
+        for name, stat in self.bot.metrics.top():
+            h = stat.histogram
+            lines.append(
+                f"`{name}:` {h.count}× p50 {h.percentile(0.5) * 1000:.1f}ms "
+                f"p99 {h.percentile(0.99) * 1000:.1f}ms max {h.max * 1000:.1f}ms "
+                f"rest {stat.rest} err {stat.errors}"
+            )
+        pipeline = self.bot.log_pipeline.stats()
+
+        embed = discord.Embed(
+            colour=self.bot.colour,
+            title="Instrumentation",
+            description="\n".join(lines) or "Nothing recorded yet",
+            timestamp=datetime.datetime.now(),
+        )
+        embed.add_field(
+            name="Log pipeline",
+            value=f"`DEPTH:` {pipeline['depth']}/{pipeline['maxsize']}\n"
+            f"`PROCESSED:` {pipeline['processed']}\n"
+            f"`DROPPED:` {sum(pipeline['dropped'].values())}\n"
+            f"`P99:` {pipeline['latency_p99_ms']:.0f}ms",
+        )
+        shards = []
+        for shard_id, stats in pipeline.get("shards", {}).items():
+            shard = self.bot.get_shard(shard_id)
+            ping = f"{shard.latency * 1000:.0f}ms, " if shard else ""
+            shards.append(
+                f"`{shard_id}:` {ping}queue {stats['depth']}, "
+                f"dropped {sum(stats['dropped'].values())}"
+            )
+        if shards:
+            embed.add_field(name="Shards", value="\n".join(shards[:20]))
+        if self.bot.cluster:
+            embed.add_field(
+                name="Clusters",
+                value="\n".join(
+                    f"`{c['cluster']}:` shards {c['shards'][0]}-{c['shards'][-1]}, "
+                    f"{c['guilds']} guilds, lag {c['loop_lag'] * 1000:.0f}ms, "
+                    f"queue {c['log_queue_depth']}"
+                    for c in await self.bot.cluster.stats()
+                ),
+            )
+        embed.add_field(
+            name="REST",
+            value="\n".join(
+                f"`{route}:` {count}"
+                for route, count in self.bot.metrics.routes.most_common(5)
+            )
+            or "None",
+        )
+        return await ctx.reply(embed=embed)
+
+    @commands.is_owner()
+    @commands.hybrid_command(name="loopdebug")
+    @app_commands.describe(
+        enabled="Whether asyncio debug mode should be on",
+        slow_ms="Callbacks slower than this are logged",
+    )
+    async def loopdebug(
+        self, ctx: commands.Context, enabled: bool, slow_ms: int = 100
+    ) -> discord.Message:
+        """Toggle asyncio slow callback reporting"""
+        self.bot.watchdog.debug(enabled, slow_ms / 1000)
+        state = f"on, logging callbacks over {slow_ms}ms" if enabled else "off"
+        return await ctx.reply(
+            f"Asyncio debug mode is {state}. "
+            f"{self.bot.watchdog.stalls} loop stalls were detected so far"
+        )
+
+
+async def setup(bot: Xanno) -> None:
+    await bot.add_cog(Owner(bot))
@@ -1,83 +1,152 @@
 # -*- coding: utf-8 -*-
 import asyncio
-import datetime
 import logging
 import os
 import sys
-import traceback
 
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
 
+from utils.audit import AuditLogCache
+from utils.cases import CaseStore
+from utils.cluster import launch
+from utils.collapse import LogCollapser
+from utils.config import ConfigStore, open_repository
+from utils.delivery import ChannelSink, LogBatcher, WebhookSink
+from utils.errors import ErrorReporter
+from utils.intents import from_env
+from utils.logs import QueuedLogging
+from utils.metrics import Metrics, TimedCommandTree
+from utils.pipeline import LogPipeline, ShardedPipeline
+from utils.recorder import GatewayRecorder
+from utils.server import MetricsServer
+from utils.telemetry import CommandTelemetry, open_sink
+from utils.watchdog import LoopWatchdog
+
 
 class Xanno(commands.Bot):
+    pipeline_class = LogPipeline
+
     def __init__(self, *args, **kwargs) -> None:
+        repository = kwargs.pop("config_repository", None) or open_repository()
+        profile = kwargs.pop("cache_profile", None) or from_env(repository)
         super().__init__(
             command_prefix=kwargs.pop(
                 "command_prefix", commands.when_mentioned_or("xo.")
             ),
-            intents=kwargs.pop("intents", discord.Intents.all()),
+            intents=kwargs.pop("intents", profile.intents),
+            member_cache_flags=kwargs.pop(
+                "member_cache_flags", profile.member_cache_flags
+            ),
+            max_messages=kwargs.pop("max_messages", profile.max_messages),
+            chunk_guilds_at_startup=kwargs.pop(
+                "chunk_guilds_at_startup", profile.member_cache_flags.joined
+            ),
             case_insensitive=kwargs.pop("case_insensitive", True),
             description=kwargs.pop("description", "General utility bot"),
             owner_ids=kwargs.pop("owner_ids", []).append(670564722218762240),
             strip_after_prefix=kwargs.pop("strip_after_prefix", True),
-            log_handler=kwargs.pop(
-                "log_handler", logging.FileHandler(filename="log.LOG", encoding="utf-8")
-            ),
             allowed_mentions=discord.AllowedMentions(everyone=False),
+            tree_cls=kwargs.pop("tree_cls", TimedCommandTree),
             *args,
             **kwargs,
         )
-        self.logger = self.fetchlogger()
+        self.log_output = QueuedLogging.from_env()
+        self.logger = logging.getLogger("xanno")
+        self.cache_profile = profile
+        self._uncovered: set[str] = set()
         self.synced = False
         self.colour = 0x6AC9B8
-
-    async def on_error(self, event_method, *args, **kwargs) -> None:
-        ei = sys.exc_info()
-        private = "".join(traceback.format_exception(ei[0], ei[1], ei[2]))
-        public = (
-            "".join(traceback.format_exception(ei[0], ei[1], ei[2], 2))
-            .replace(os.getcwd(), "CWD")
-            .replace("CWD/venv/lib/python3.10/site-packages/discord", "discord")
+        self.metrics = Metrics()
+        self.metrics_server = MetricsServer(self)
+        self.watchdog = LoopWatchdog(
+            self, threshold=float(os.getenv("WATCHDOG_THRESHOLD", 0.5))
         )
-
-        channel = self.get_channel(1008350814730993675)
-        embed = discord.Embed(
-            colour=self.colour,
-            title="An unknown error occurred",
-            description=f"`FUNC:` {event_method}\n```ansi\n\u001b[31m"
-            + public
-            + "\n```",
-            timestamp=datetime.datetime.now(),
+        self.logging_config = ConfigStore(repository)
+        self.error_reporter = ErrorReporter(
+            self,
+            int(os.getenv("ERROR_CHANNEL", 1008350814730993675)),
+            interval=float(os.getenv("ERROR_DIGEST_INTERVAL", 300)),
         )
-        await channel.send(embed=embed)
-        return self.logger.error(
-            private
-            + f"{', '.join([str(a) for a in args])} —— {', '.join(list(kwargs))}"
+        sink = WebhookSink if os.getenv("LOG_SINK") == "webhook" else ChannelSink
+        self.log_batcher = LogBatcher(
+            self, sink=sink(self), window=float(os.getenv("LOG_BATCH_WINDOW", 1.5))
         )
-
-    @staticmethod
-    def fetchlogger() -> logging.Logger:
-        logger = logging.getLogger("xanno")
-        logger.setLevel(logging.DEBUG)
-
-        handler = logging.FileHandler(filename="log.LOG", encoding="utf-8")
-        streamer = logging.StreamHandler()
-
-        dt_fmt = "%Y-%m-%d %H:%M:%S"
-        formatter = logging.Formatter(
-            "[{asctime}] [{levelname:<8}] {name}: {message}", dt_fmt, style="{"
+        self.log_pipeline = self.pipeline_class(
+            self,
+            workers=int(os.getenv("LOG_WORKERS", 4)),
+            maxsize=int(os.getenv("LOG_QUEUE_SIZE", 2000)),
+        )
+        self.log_collapser = LogCollapser(self)
+        self.recorder = (
+            GatewayRecorder(self, os.environ["GATEWAY_RECORD"])
+            if os.getenv("GATEWAY_RECORD")
+            else None
+        )
+        self.audit_log = AuditLogCache(
+            self, wait=float(os.getenv("AUDIT_LOG_WAIT", 1.0))
+        )
+        self.cases = CaseStore(self, os.getenv("CASES_PATH", "cases.db"))
+        # set by utils.cluster when this process is one of several clusters
+        self.cluster = None
+        self.telemetry = CommandTelemetry(
+            self,
+            open_sink(),
+            channel_id=int(os.getenv("TELEMETRY_CHANNEL", 758101380878565376)),
+            interval=float(os.getenv("TELEMETRY_INTERVAL", 300)),
+            sample=float(os.getenv("TELEMETRY_SAMPLE", 1.0)),
         )
 
-        handler.setFormatter(formatter)
-        streamer.setFormatter(formatter)
+    async def _run_event(self, coro, event_name, *args, **kwargs) -> None:
+        # discord.py's own _run_event, with every listener timed
+        try:
+            with self.metrics.timer(
+                f"listener:{getattr(coro, '__qualname__', event_name)}"
+            ):
+                await coro(*args, **kwargs)
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            try:
+                await self.on_error(event_name, *args, **kwargs)
+            except asyncio.CancelledError:
+                pass
 
-        logger.addHandler(handler)
-        logger.addHandler(streamer)
-        return logger
+    async def invoke(self, ctx: commands.Context) -> None:
+        if ctx.command is None:
+            return await super().invoke(ctx)
+        with self.metrics.timer(f"command:{ctx.command.qualified_name}") as timer:
+            await super().invoke(ctx)
+        if ctx.command_failed:
+            timer.stat.errors += 1
+
+    async def on_error(self, event_method, *args, **kwargs) -> None:
+        self.error_reporter.report(event_method, sys.exc_info()[1], args, kwargs)
 
     async def setup_hook(self) -> None:
+        # started here rather than in __init__, so building a bot (in tests or
+        # benchmarks) does not take over the root logger or open log files
+        self.log_output.start()
+        await self.logging_config.start()
+        self.metrics.install(self.http)
+        self.metrics.start(os.getenv("METRICS_FILE"))
+        self.watchdog.start()
+        if os.getenv("ASYNCIO_DEBUG"):
+            self.watchdog.debug(True)
+        if os.getenv("METRICS_PORT"):
+            await self.metrics_server.start(
+                os.getenv("METRICS_HOST", "127.0.0.1"), int(os.environ["METRICS_PORT"])
+            )
+        self.error_reporter.start()
+        self.telemetry.start()
+        self.cases.start()
+        self.log_pipeline.start()
+        if self.recorder:
+            self.recorder.install()
+        if self.cluster:
+            self.cluster.start()
+
         for filename in os.listdir("cogs"):
             if filename.endswith(".py"):
                 try:
@@ -86,17 +155,113 @@ class Xanno(commands.Bot):
                     self.logger.warning(f"Extension {filename} failed to load")
         await self.load_extension("jishaku")
 
+        self.logger.info(f"Connecting with {self.cache_profile!r}")
+        self.check_cache_profile()
+        self.logging_config.subscribe(self.check_cache_profile)
+
+    def check_cache_profile(self) -> None:
+        """Warn about enabled callbacks the cache profile cannot dispatch"""
+        uncovered = {
+            c
+            for c, guilds in self.logging_config.enabled.items()
+            if guilds and not self.cache_profile.covers(c)
+        }
+        if uncovered - self._uncovered:
+            self.logger.warning(
+                f"{', '.join(sorted(uncovered - self._uncovered))} are enabled but "
+                f"not dispatched under the {self.cache_profile.name} cache profile, "
+                f"restart with CACHE_PROFILE=auto or full to log them"
+            )
+        self._uncovered = uncovered
+
+    async def close(self) -> None:
+        await self.metrics_server.close()
+        self.metrics.close()
+        self.watchdog.close()
+        self.log_collapser.close()
+        await self.log_pipeline.close()
+        self.audit_log.close()
+        await self.log_batcher.close()
+        await self.error_reporter.close()
+        await self.telemetry.close()
+        await super().close()
+        await self.logging_config.close()
+        await self.cases.close()
+        if self.recorder:
+            self.recorder.close()
+        if self.cluster:
+            self.cluster.close()
+
+    @property
+    def syncs_commands(self) -> bool:
+        """Whether this client owns the global application command sync"""
+        return True
+
     # noinspection PyMethodMayBeStatic
     async def on_ready(self) -> None:
         self.logger.info(f"Bot initiated and ready")
+        members = sum(g.member_count or 0 for g in self.guilds)
+        self.logger.info(
+            f"Cache profile {self.cache_profile.name} holds "
+            f"~{self.cache_profile.estimate(members) / 2**20:.0f} MiB for {members} "
+            f"members, against ~{full().estimate(members) / 2**20:.0f} MiB for full"
+        )
 
-        if not self.synced:
+        if not self.synced and self.syncs_commands:
             await self.tree.sync()
             self.synced = True
 
 
+class ShardedXanno(Xanno, commands.AutoShardedBot):
+    """Xanno over several gateway shards, each with its own log queue.
+
+    ``setup_hook`` still runs once for the whole client, and ``on_ready``
+    only fires once every shard this client runs is ready.
+    """
+
+    pipeline_class = ShardedPipeline
+
+    @property
+    def syncs_commands(self) -> bool:
+        # with shards split over processes, only the one running shard 0 syncs
+        return self.shard_ids is None or 0 in self.shard_ids
+
+    async def before_identify_hook(
+        self, shard_id: int | None, *, initial: bool = False
+    ) -> None:
+        # IDENTIFY limits are per bot, so clusters queue with the launcher
+        if self.cluster:
+            await self.cluster.identify(shard_id)
+        else:
+            await super().before_identify_hook(shard_id, initial=initial)
+
+    async def on_shard_ready(self, shard_id: int) -> None:
+        self.logger.info(f"Shard {shard_id} ready")
+        # the shard count is known by now, route anything queued before it was
+        self.log_pipeline.release()
+
+    async def on_shard_disconnect(self, shard_id: int) -> None:
+        self.logger.warning(f"Shard {shard_id} disconnected")
+
+    async def on_shard_resumed(self, shard_id: int) -> None:
+        self.logger.info(f"Shard {shard_id} resumed")
+
+
+def create_bot(**kwargs) -> Xanno:
+    """Xanno, or ShardedXanno when ``SHARD_COUNT`` is ``auto`` or a number"""
+    shards = os.getenv("SHARD_COUNT")
+    if not shards:
+        return Xanno(**kwargs)
+    if shards != "auto":
+        kwargs.setdefault("shard_count", int(shards))
+    if os.getenv("SHARD_IDS"):
+        kwargs.setdefault(
+            "shard_ids", [int(i) for i in os.environ["SHARD_IDS"].split(",")]
+        )
+    return ShardedXanno(**kwargs)
+
+
 async def main(bot: Xanno) -> None:
-    load_dotenv()
     token = os.getenv("TOKEN")
 
     async with bot:
@@ -104,8 +269,12 @@ async def main(bot: Xanno) -> None:
 
 
 if __name__ == "__main__":
-    xanno = Xanno()
-    try:
-        asyncio.run(main(bot=xanno))
-    except KeyboardInterrupt:
-        xanno.logger.info("KeyboardInterrupt, exiting gracefully")
+    load_dotenv()
+    if os.getenv("CLUSTERS"):
+        asyncio.run(launch(int(os.environ["CLUSTERS"])))
+    else:
+        xanno = create_bot()
+        try:
+            asyncio.run(main(bot=xanno))
+        except KeyboardInterrupt:
+            xanno.logger.info("KeyboardInterrupt, exiting gracefully")
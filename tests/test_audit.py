@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import datetime
+import time
+from types import SimpleNamespace
+
+import discord
+
+from utils.audit import AuditLogCache
+from utils.pipeline import LogRecord
+
+GUILD = 1
+
+
+def cache(
+    wait: float = 60.0, readable: bool = True
+) -> tuple[AuditLogCache, list[LogRecord]]:
+    batched: list[LogRecord] = []
+    me = SimpleNamespace(guild_permissions=SimpleNamespace(view_audit_log=readable))
+    bot = SimpleNamespace(
+        intents=discord.Intents(moderation=True),
+        get_guild=lambda guild_id: SimpleNamespace(me=me),
+        log_batcher=SimpleNamespace(enqueue=batched.append),
+    )
+    return AuditLogCache(bot, size=2, wait=wait), batched
+
+
+def entry(target_id: int, user_id: int = 20, action: str = "ban", at: float = 0):
+    return SimpleNamespace(
+        id=discord.utils.time_snowflake(
+            datetime.datetime.fromtimestamp(at or time.time(), datetime.timezone.utc)
+        ),
+        action=SimpleNamespace(name=action),
+        target=SimpleNamespace(id=target_id),
+        guild=SimpleNamespace(id=GUILD),
+        user_id=user_id,
+        reason="raid",
+    )
+
+
+def ban(target_id: int) -> LogRecord:
+    return LogRecord("on_member_ban", GUILD, 2000, target_id)
+
+
+def test_a_cached_entry_names_the_actor() -> None:
+    audit_log, batched = cache()
+
+    async def main() -> None:
+        audit_log.add(entry(10))
+        record = ban(10)
+        assert not audit_log.attach(record)
+        assert record.fields == {"actor_id": 20, "audit_reason": "raid"}
+
+    asyncio.run(main())
+    assert audit_log.hits == 1 and not batched
+
+
+def test_stale_and_evicted_entries_explain_nothing() -> None:
+    audit_log, _ = cache()
+    audit_log.add(entry(10, at=time.time() - 60))
+    assert audit_log.get(ban(10)) is None
+
+    for target_id in (11, 12, 13):
+        audit_log.add(entry(target_id))
+    assert audit_log.get(ban(11)) is None
+    assert audit_log.get(ban(13)).user_id == 20
+    # actions no callback is enriched from are not kept
+    audit_log.add(entry(14, action="message_pin"))
+    assert audit_log.get(ban(12)).user_id == 20
+
+
+def test_parked_records_are_released_by_their_entry() -> None:
+    audit_log, batched = cache()
+
+    async def main() -> None:
+        record = ban(10)
+        assert audit_log.attach(record)
+        assert not batched
+        audit_log.add(entry(10))
+        assert batched == [record]
+        assert record.fields["actor_id"] == 20
+        assert not audit_log.parked and not audit_log._waiting
+
+    asyncio.run(main())
+
+
+def test_unreadable_guilds_are_not_parked() -> None:
+    audit_log, _ = cache(readable=False)
+
+    async def main() -> None:
+        assert not audit_log.attach(ban(10))
+
+    asyncio.run(main())
+    assert audit_log.misses == 1
+
+
+def test_records_expire_by_deadline_not_arrival() -> None:
+    audit_log, batched = cache(wait=0.05)
+
+    async def main() -> None:
+        late = ban(10)
+        assert audit_log.attach(late)
+        # a collapsed record parks with its first event's time, due sooner
+        early = ban(11)
+        early.created -= 0.04
+        assert audit_log.attach(early)
+
+        await asyncio.sleep(0.03)
+        assert batched == [early]
+        await asyncio.sleep(0.05)
+        assert batched == [early, late]
+
+    asyncio.run(main())
+    assert audit_log.misses == 2 and not audit_log._expiry
+
+
+def test_close_releases_everything_parked() -> None:
+    audit_log, batched = cache()
+
+    async def main() -> None:
+        records = [ban(10), ban(11)]
+        for record in records:
+            audit_log.attach(record)
+        audit_log.close()
+        assert batched == records
+
+    asyncio.run(main())
+    assert not audit_log.parked
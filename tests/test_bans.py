@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import discord
+
+from utils.bans import Progress, ban_all
+
+
+class SlowMessage:
+    def __init__(self) -> None:
+        self.contents: list[str | None] = []
+
+    async def edit(self, content: str | None = None, **kwargs) -> None:
+        if content is not None:
+            # a progress edit still in flight when the final one is sent
+            await asyncio.sleep(0.01)
+        self.contents.append(content)
+
+
+def test_close_waits_for_the_edit_in_flight() -> None:
+    message = SlowMessage()
+
+    async def main() -> None:
+        progress = Progress(message, 10, "Banning", interval=0)
+        progress(4)
+        await progress.close()
+        progress(10)
+        await message.edit(content=None, embed=discord.Embed())
+
+    asyncio.run(main())
+    assert message.contents == ["Banning 4/10...", None]
+
+
+def test_forbidden_bulk_bans_fall_back_to_one_at_a_time() -> None:
+    banned: list[int] = []
+
+    async def bulk_ban(users, **kwargs) -> None:
+        raise discord.Forbidden(SimpleNamespace(status=403, reason="Forbidden"), "")
+
+    async def ban(user, **kwargs) -> None:
+        if user.id == 3:
+            raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "")
+        banned.append(user.id)
+
+    guild = SimpleNamespace(bulk_ban=bulk_ban, ban=ban)
+    counts: list[int] = []
+    done, failed = asyncio.run(
+        ban_all(guild, [1, 2, 3, 4], "raid", progress=counts.append)
+    )
+    assert sorted(done) == sorted(banned) == [1, 2, 4]
+    assert failed == [3]
+    assert sorted(counts) == [1, 2, 3, 4]
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from types import SimpleNamespace
+
+from utils.cases import CaseStore
+
+
+def store(tmp_path, **kwargs) -> CaseStore:
+    return CaseStore(SimpleNamespace(), str(tmp_path / "cases.db"), **kwargs)
+
+
+def rows(tmp_path) -> int:
+    with sqlite3.connect(tmp_path / "cases.db") as conn:
+        return conn.execute("SELECT COUNT(*) FROM cases").fetchone()[0]
+
+
+def test_history_pages_newest_first(tmp_path) -> None:
+    cases = store(tmp_path)
+
+    async def main() -> None:
+        for i in range(5):
+            cases.record(1, "ban", 10, 20, f"reason {i}")
+            cases.pending[-1].created_at = float(i)
+        cases.record(1, "ban", 11, 20, "someone else")
+        cases.record(2, "ban", 10, 20, "another guild")
+
+        page, total = await cases.history(1, 10, limit=2, offset=1)
+        assert total == 5
+        assert [c.reason for c in page] == ["reason 3", "reason 2"]
+        assert all(c.id is not None for c in page)
+        await cases.close()
+
+    asyncio.run(main())
+
+
+def test_cases_filter_by_moderator(tmp_path) -> None:
+    cases = store(tmp_path)
+
+    async def main() -> None:
+        cases.record(1, "ban", 10, 20, "a")
+        cases.record(1, "unban", 10, 21, "b", dtp=1)
+        cases.record(2, "ban", 10, 20, "c")
+
+        assert (await cases.cases(1))[1] == 2
+        [case], total = await cases.cases(1, moderator_id=21)
+        assert total == 1
+        assert (case.action, case.dtp) == ("unban", 1)
+        await cases.close()
+
+    asyncio.run(main())
+
+
+def test_a_full_batch_is_written_before_the_interval(tmp_path) -> None:
+    cases = store(tmp_path, interval=60, batch=3)
+
+    async def main() -> None:
+        cases.start()
+        cases.record(1, "ban", 10, 20, "a")
+        cases.record(1, "ban", 11, 20, "b")
+        await asyncio.sleep(0.05)
+        assert cases.pending and not (tmp_path / "cases.db").exists()
+
+        cases.record(1, "ban", 12, 20, "c")
+        await asyncio.sleep(0.05)
+        assert not cases.pending and rows(tmp_path) == 3
+
+        cases.record(1, "ban", 13, 20, "d")
+        await cases.close()
+
+    asyncio.run(main())
+    assert rows(tmp_path) == 4
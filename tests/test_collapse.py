@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from utils.collapse import LogCollapser
+from utils.diff import Field
+from utils.pipeline import LogRecord
+
+NAME, POSITION = Field("name"), Field("position")
+UPDATE = "on_guild_role_update"
+
+
+def collapser(window: float = 60.0) -> tuple[LogCollapser, list[LogRecord]]:
+    submitted: list[LogRecord] = []
+    bot = SimpleNamespace(log_pipeline=SimpleNamespace(submit=submitted.append))
+    return LogCollapser(bot, {UPDATE: window, "on_reaction_add": window}), submitted
+
+
+def update(target_id: int, *changes: tuple[Field, object, object]) -> LogRecord:
+    return LogRecord(
+        UPDATE, 1, 2000, target_id, name=f"role{target_id}", changes=list(changes)
+    )
+
+
+def reaction(user_id: int, message_id: int) -> LogRecord:
+    record = LogRecord("on_reaction_add", 1, 2000, message_id)
+    record.fields = {"user_id": user_id, "channel_id": 4000}
+    return record
+
+
+def test_uncollapsed_kinds_pass_straight_through() -> None:
+    log_collapser, submitted = collapser()
+    record = LogRecord("on_member_join", 1, 2000, 10)
+    log_collapser.submit(record)
+    assert submitted == [record]
+
+
+def test_updates_to_one_target_merge_into_their_net_change() -> None:
+    log_collapser, submitted = collapser()
+
+    async def main() -> None:
+        log_collapser.submit(update(3000, (NAME, "a", "b")))
+        log_collapser.submit(update(3000, (NAME, "b", "c"), (POSITION, 1, 2)))
+        log_collapser.close()
+
+    asyncio.run(main())
+    [merged] = submitted
+    assert merged.fields["changes"] == [(NAME, "a", "c"), (POSITION, 1, 2)]
+    assert merged.fields["name"] == "role3000"
+    assert log_collapser.collapsed == 1
+
+
+def test_reverted_updates_are_dropped() -> None:
+    log_collapser, submitted = collapser()
+
+    async def main() -> None:
+        log_collapser.submit(update(3000, (NAME, "a", "b")))
+        log_collapser.submit(update(3000, (NAME, "b", "a")))
+        log_collapser.close()
+
+    asyncio.run(main())
+    assert submitted == []
+
+
+def test_a_reorder_becomes_one_summary() -> None:
+    log_collapser, submitted = collapser()
+
+    async def main() -> None:
+        for i in range(5):
+            log_collapser.submit(update(3000 + i, (POSITION, i, i + 1)))
+        # a rename is keyed on its own target, not folded into the reorder
+        log_collapser.submit(update(3000, (NAME, "a", "b")))
+        log_collapser.close()
+
+    asyncio.run(main())
+    summary, rename = submitted
+    assert [r.target_id for r in summary.fields["records"]] == list(range(3000, 3005))
+    assert rename.fields["changes"] == [(NAME, "a", "b")]
+
+
+def test_reactions_collapse_per_user_and_flush_after_the_window() -> None:
+    log_collapser, submitted = collapser(window=0.01)
+
+    async def main() -> None:
+        for i in range(3):
+            log_collapser.submit(reaction(10, 50_000 + i))
+        log_collapser.submit(reaction(11, 50_000))
+        await asyncio.sleep(0.05)
+
+    asyncio.run(main())
+    summary, single = submitted
+    assert len(summary.fields["records"]) == 3
+    assert single.fields["user_id"] == 11
+    assert not log_collapser._pending and not log_collapser._timers
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from utils.config import ConfigRepository, ConfigStore, JSONConfigRepository
+
+CONFIG = {"channel": 2000, "callbacks": {"on_member_join": True}}
+
+
+class MemoryRepository(ConfigRepository):
+    def __init__(self, data: dict[int, dict]) -> None:
+        self.data = data
+        self.stale = False
+        self.failures = 0
+
+    async def load_all(self) -> dict[int, dict]:
+        return dict(self.data)
+
+    async def set(self, guild_id: int, config: dict) -> None:
+        self.data[guild_id] = config
+
+    async def changed(self) -> bool:
+        if self.failures:
+            self.failures -= 1
+            raise OSError("database is locked")
+        stale, self.stale = self.stale, False
+        return stale
+
+
+def test_json_read_failure_is_retried(tmp_path) -> None:
+    path = tmp_path / "logging.json"
+    path.write_text('{"1": {"channel": 20')
+    repository = JSONConfigRepository(str(path))
+
+    async def main() -> None:
+        with pytest.raises(json.JSONDecodeError):
+            await repository.load_all()
+        assert await repository.changed()
+
+        path.write_text(json.dumps({"1": CONFIG}))
+        assert await repository.load_all() == {1: CONFIG}
+        assert not await repository.changed()
+
+    asyncio.run(main())
+
+
+def test_json_missing_file_is_empty(tmp_path) -> None:
+    repository = JSONConfigRepository(str(tmp_path / "logging.json"))
+
+    async def main() -> None:
+        assert await repository.load_all() == {}
+        assert not await repository.changed()
+
+    asyncio.run(main())
+
+
+def test_poll_survives_a_failed_check() -> None:
+    repository = MemoryRepository({})
+    repository.failures = 1
+    store = ConfigStore(repository, interval=0.01)
+
+    async def main() -> None:
+        await store.start()
+        repository.data[1] = CONFIG
+        repository.stale = True
+        await asyncio.sleep(0.1)
+        assert not store._task.done()
+        await store.close()
+
+    asyncio.run(main())
+    assert store.get(1) == CONFIG
+
+
+def test_enabled_index_follows_every_change() -> None:
+    repository = MemoryRepository({1: CONFIG, 2: {**CONFIG, "channel": None}})
+    store = ConfigStore(repository)
+    notified = []
+    store.subscribe(lambda: notified.append(True))
+
+    async def main() -> None:
+        await store.load()
+        # a guild without a logging channel is not indexed
+        assert store.enabled == {"on_member_join": {1}}
+
+        await store.set(2, CONFIG)
+        assert store.enabled["on_member_join"] == {1, 2}
+        assert repository.data[2] == CONFIG
+
+        store.apply(1, {"channel": 2000, "callbacks": {"on_member_join": False}})
+        assert store.enabled["on_member_join"] == {2}
+
+        # apply() never persisted, so a reload brings guild 1 back
+        repository.data.pop(2)
+        await store.load()
+        assert store.enabled["on_member_join"] == {1}
+
+    asyncio.run(main())
+    assert len(notified) == 4
+
+
+def test_is_enabled_counts_once_per_check() -> None:
+    store = ConfigStore(MemoryRepository({1: CONFIG}))
+    asyncio.run(store.load())
+
+    assert store.is_enabled("on_member_join", 1)
+    assert not store.is_enabled("on_member_join", 3)
+    assert not store.is_enabled("on_member_remove", 1)
+    store.get(1)
+    assert (store.enabled_hits, store.disabled_hits) == (1, 2)
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import discord
+import pytest
+
+from utils.delivery import LogBatcher
+from utils.metrics import Metrics
+from utils.pipeline import LogRecord
+from utils.renderers import RENDERERS
+
+CHANNEL = 2000
+
+
+class CountingSink:
+    def __init__(self) -> None:
+        self.sent: list[list[discord.Embed]] = []
+
+    async def send(self, channel, embeds: list[discord.Embed]) -> None:
+        self.sent.append(embeds)
+
+
+@pytest.fixture(autouse=True)
+def renderer(monkeypatch) -> None:
+    monkeypatch.setitem(
+        RENDERERS,
+        "test",
+        lambda bot, record: discord.Embed(description=record.fields["text"]),
+    )
+
+
+def batcher(window: float = 60.0) -> tuple[LogBatcher, CountingSink]:
+    async def on_error(*args) -> None:
+        raise AssertionError("a record failed to render")
+
+    bot = SimpleNamespace(
+        get_channel=lambda channel_id: object() if channel_id == CHANNEL else None,
+        on_error=on_error,
+        metrics=Metrics(),
+    )
+    sink = CountingSink()
+    return LogBatcher(bot, sink=sink, window=window), sink
+
+
+def record(text: str = "x", channel_id: int = CHANNEL) -> LogRecord:
+    return LogRecord("test", 1, channel_id, text=text)
+
+
+def test_chunks_respect_embed_and_character_limits() -> None:
+    embeds = [discord.Embed(description="x") for _ in range(25)]
+    assert [len(c) for c in LogBatcher.chunk(embeds)] == [10, 10, 5]
+
+    embeds = [discord.Embed(description="x" * 2500) for _ in range(5)]
+    assert [len(c) for c in LogBatcher.chunk(embeds)] == [2, 2, 1]
+
+
+def test_full_buffer_schedules_one_flush() -> None:
+    log_batcher, sink = batcher()
+
+    async def main() -> None:
+        for _ in range(LogBatcher.MAX_EMBEDS + 5):
+            log_batcher.enqueue(record())
+        assert len(log_batcher._tasks) == 1
+        await asyncio.gather(*log_batcher._tasks)
+        assert [len(s) for s in sink.sent] == [10, 5]
+        await log_batcher.close()
+
+    asyncio.run(main())
+    assert [len(s) for s in sink.sent] == [10, 5]
+
+
+def test_window_flushes_a_partial_buffer() -> None:
+    log_batcher, sink = batcher(window=0.01)
+
+    async def main() -> None:
+        for _ in range(3):
+            log_batcher.enqueue(record())
+        await asyncio.sleep(0.05)
+        assert [len(s) for s in sink.sent] == [3]
+        assert not log_batcher._buffers and not log_batcher._timers
+        await log_batcher.close()
+
+    asyncio.run(main())
+
+
+def test_close_flushes_every_channel_and_drops_unknown_ones() -> None:
+    log_batcher, sink = batcher()
+
+    async def main() -> None:
+        log_batcher.enqueue(record("a"))
+        log_batcher.enqueue(record("b", channel_id=CHANNEL + 1))
+        await log_batcher.close()
+
+    asyncio.run(main())
+    assert [[e.description for e in s] for s in sink.sent] == [["a"]]
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import discord
+
+from benchmarks.events import MemoryRepository
+from main import Xanno
+from utils.intents import derive, from_env, lean
+
+
+def config(*callbacks: str) -> dict:
+    return {"channel": 2000, "callbacks": {c: True for c in callbacks}}
+
+
+def test_lean_skips_member_and_message_cache_callbacks() -> None:
+    profile = lean()
+    assert not profile.covers("on_member_update")
+    assert not profile.covers("on_message_edit")
+    assert not profile.member_cache_flags.value and profile.max_messages is None
+
+
+def test_voice_states_need_no_member_cache() -> None:
+    # VOICE_STATE_UPDATE carries the member, so it dispatches without a cache
+    profile = derive(["on_voice_state_update"], commands=False)
+    assert profile.intents == discord.Intents(guilds=True, voice_states=True)
+    assert not profile.member_cache_flags.value
+    assert profile.covers("on_voice_state_update")
+
+
+def test_derive_enables_only_what_the_callbacks_need() -> None:
+    profile = derive(["on_message_delete"], commands=False)
+    assert profile.intents == discord.Intents(
+        guilds=True, guild_messages=True, message_content=True
+    )
+    assert profile.max_messages and not profile.member_cache_flags.value
+    assert profile.covers("on_message_delete")
+    assert not profile.covers("on_member_update")
+
+
+def test_auto_profile_is_derived_before_the_bot_is_constructed(monkeypatch) -> None:
+    monkeypatch.setenv("CACHE_PROFILE", "auto")
+    repository = MemoryRepository(
+        {
+            1: config("on_member_update"),
+            # no logging channel, so nothing here is dispatched
+            2: {"channel": None, "callbacks": {"on_message_edit": True}},
+        }
+    )
+    profile = from_env(repository)
+    assert profile.covers("on_member_update")
+    assert profile.max_messages is None
+
+    bot = Xanno(config_repository=repository, cache_profile=profile)
+    assert bot.intents == profile.intents
+    assert bot._connection.max_messages is None
+    assert bot._connection.member_cache_flags.value == (
+        profile.member_cache_flags.value
+    )
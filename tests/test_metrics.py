@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import discord
+from discord import app_commands
+
+from utils.metrics import Histogram, Metrics, TimedCommandTree
+from utils.pipeline import LogPipeline, LogRecord
+from utils.renderers import ENRICHERS
+
+
+def test_histogram_percentiles_stay_within_a_bucket() -> None:
+    histogram = Histogram()
+    for ms in range(1, 101):
+        histogram.record(ms / 1000)
+    assert histogram.count == 100
+    assert 0.05 <= histogram.percentile(0.5) <= 0.05 * 1.19
+    assert histogram.percentile(1.0) == histogram.max == 0.1
+
+
+def interaction(client: discord.Client, data: dict) -> discord.Interaction:
+    return discord.Interaction(
+        data={
+            "id": "1",
+            "application_id": "2",
+            "type": 2,
+            "token": "token",
+            "version": 1,
+            "channel_id": "3",
+            "user": {"id": "4", "username": "u", "discriminator": "0", "avatar": None},
+            "locale": "en-US",
+            "attachment_size_limit": 8 * 1024 * 1024,
+            "data": data,
+        },
+        state=client._connection,
+    )
+
+
+def test_app_commands_are_timed_by_qualified_name() -> None:
+    async def main() -> Metrics:
+        client = discord.Client(intents=discord.Intents.none())
+        client.metrics = Metrics()
+        tree = TimedCommandTree(client)
+        group = app_commands.Group(name="case", description="Cases")
+
+        @group.command(description="Show a case")
+        async def show(interaction: discord.Interaction, id: int) -> None:
+            pass
+
+        @tree.command(description="Always fails")
+        async def broken(interaction: discord.Interaction) -> None:
+            raise RuntimeError
+
+        tree.add_command(group)
+        option = {"name": "id", "type": 4, "value": 1}
+        subcommand = {"name": "show", "type": 1, "options": [option]}
+        await tree._call(
+            interaction(
+                client, {"id": "5", "name": "case", "type": 1, "options": [subcommand]}
+            )
+        )
+        await tree._call(interaction(client, {"id": "6", "name": "broken", "type": 1}))
+        await client.close()
+        return client.metrics
+
+    metrics = asyncio.run(main())
+    counts = {n: (s.histogram.count, s.errors) for n, s in metrics.stats.items()}
+    assert counts == {"command:case show": (1, 0), "command:broken": (1, 1)}
+
+
+def test_enricher_rest_calls_count_against_the_pipeline(monkeypatch) -> None:
+    async def request(route, **kwargs) -> None:
+        return None
+
+    async def enrich(bot, record: LogRecord) -> None:
+        await bot.http.request(SimpleNamespace(method="GET", path="/test"))
+
+    monkeypatch.setitem(ENRICHERS, "test", enrich)
+    metrics = Metrics()
+    batched: list[LogRecord] = []
+    bot = SimpleNamespace(
+        metrics=metrics,
+        http=SimpleNamespace(request=request),
+        log_batcher=SimpleNamespace(enqueue=batched.append),
+    )
+    metrics.install(bot.http)
+
+    async def main() -> None:
+        pipeline = LogPipeline(bot, workers=1)
+        pipeline.start()
+        pipeline.submit(LogRecord("test", 1, 2000))
+        await pipeline.close()
+
+    asyncio.run(main())
+    metrics.close()
+    assert len(batched) == 1
+    assert metrics.stats["enrich:test"].rest == 1
+    assert metrics.routes == {"GET /test": 1}
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from utils.metrics import Metrics
+from utils.pipeline import LogPipeline, LogRecord, ShardedPipeline
+
+
+def stand_in(shard_count: int | None = None) -> SimpleNamespace:
+    batched: list[LogRecord] = []
+    return SimpleNamespace(
+        shard_count=shard_count,
+        metrics=Metrics(),
+        log_batcher=SimpleNamespace(enqueue=batched.append),
+        batched=batched,
+    )
+
+
+def record(guild_id: int = 1, kind: str = "on_member_join") -> LogRecord:
+    return LogRecord(kind, guild_id, 2000)
+
+
+def test_noisy_records_are_shed_before_the_queue_is_full() -> None:
+    async def main() -> LogPipeline:
+        pipeline = LogPipeline(
+            stand_in(), maxsize=4, shed_at=0.5, rates={"on_reaction_add": 0.0}
+        )
+        for _ in range(2):
+            assert pipeline.submit(record())
+        assert not pipeline.submit(record(kind="on_reaction_add"))
+        for _ in range(2):
+            assert pipeline.submit(record())
+        assert not pipeline.submit(record())
+        return pipeline
+
+    pipeline = asyncio.run(main())
+    assert pipeline.dropped == {"on_reaction_add": 1, "on_member_join": 1}
+
+
+def test_records_are_routed_by_the_shard_of_their_guild() -> None:
+    bot = stand_in(shard_count=2)
+
+    async def main() -> ShardedPipeline:
+        pipeline = ShardedPipeline(bot, workers=1)
+        pipeline.start()
+        pipeline.submit(record(0 << 22))
+        pipeline.submit(record(1 << 22))
+        pipeline.submit(record(3 << 22))
+        await pipeline.close()
+        return pipeline
+
+    pipeline = asyncio.run(main())
+    assert {i: p.processed for i, p in pipeline.pipelines.items()} == {0: 1, 1: 2}
+    assert len(bot.batched) == 3
+
+
+def test_records_are_held_until_the_shard_count_is_known() -> None:
+    bot = stand_in()
+
+    async def main() -> ShardedPipeline:
+        pipeline = ShardedPipeline(bot, workers=1, maxsize=2)
+        pipeline.start()
+        assert pipeline.submit(record(0 << 22))
+        assert pipeline.submit(record(1 << 22))
+        assert not pipeline.submit(record(1 << 22))
+        assert not pipeline.pipelines and pipeline.stats()["depth"] == 2
+
+        bot.shard_count = 2
+        pipeline.release()
+        await pipeline.close()
+        return pipeline
+
+    pipeline = asyncio.run(main())
+    assert {i: p.processed for i, p in pipeline.pipelines.items()} == {0: 1, 1: 1}
+    assert pipeline.stats()["dropped"] == {"on_member_join": 1}
+    assert not pipeline.held
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import json
+
+from utils.recorder import SCRUBBED_URL, scrub
+
+PRIVATE = "private words"
+
+
+def attachment() -> dict:
+    return {
+        "id": "30",
+        "filename": "holiday photo.png",
+        "description": PRIVATE,
+        "url": "https://cdn.discordapp.com/attachments/1/30/holiday%20photo.png",
+        "proxy_url": "https://media.discordapp.net/attachments/1/30/holiday.png",
+        "size": 1024,
+    }
+
+
+def embed() -> dict:
+    return {
+        "type": "rich",
+        "title": PRIVATE,
+        "description": PRIVATE,
+        "url": "https://example.com/private",
+        "fields": [{"name": PRIVATE, "value": PRIVATE, "inline": False}],
+        "footer": {"text": PRIVATE, "icon_url": "https://example.com/f.png"},
+        "author": {"name": PRIVATE, "url": "https://example.com/author"},
+        "image": {"url": "https://example.com/i.png", "width": 10},
+    }
+
+
+def message() -> dict:
+    return {
+        "id": "20",
+        "channel_id": "4000",
+        "content": PRIVATE,
+        "author": {"id": "10", "username": "alice", "global_name": "Alice"},
+        "embeds": [embed()],
+        "attachments": [attachment()],
+        "token": "secret",
+    }
+
+
+def leaks(value: dict) -> list[str]:
+    text = json.dumps(value)
+    return [
+        s
+        for s in (PRIVATE, "alice", "Alice", "holiday", "example.com", "secret")
+        if s in text
+    ]
+
+
+def test_message_content_embeds_and_attachments_are_scrubbed() -> None:
+    data = {**message(), "referenced_message": message()}
+    scrubbed = scrub(data)
+
+    assert leaks(scrubbed) == []
+    assert scrubbed["id"] == "20" and scrubbed["channel_id"] == "4000"
+    assert "token" not in scrubbed
+    file = scrubbed["attachments"][0]
+    assert file["filename"] == "x" * len("holiday photo") + ".png"
+    assert file["url"] == file["proxy_url"] == SCRUBBED_URL
+    assert file["size"] == 1024
+    fields = scrubbed["embeds"][0]["fields"][0]
+    assert fields == {
+        "name": "x" * len(PRIVATE),
+        "value": "x" * len(PRIVATE),
+        "inline": False,
+    }
+    assert scrubbed["embeds"][0]["image"]["width"] == 10
+
+
+def test_interaction_attachments_keyed_by_id_are_scrubbed() -> None:
+    data = {"data": {"resolved": {"attachments": {"30": attachment()}}}}
+    assert leaks(scrub(data)) == []
+
+
+def test_names_get_stable_pseudonyms() -> None:
+    first, second = scrub(message()), scrub(message())
+    assert first["author"]["username"] == second["author"]["username"]
+    assert first["author"]["username"].startswith("username-")
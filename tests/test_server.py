@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import re
+from types import SimpleNamespace
+
+from utils.config import ConfigRepository, ConfigStore
+from utils.metrics import Metrics
+from utils.server import MetricsServer
+
+SAMPLE = re.compile(r"^(?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})? \S+$")
+
+
+def stand_in() -> SimpleNamespace:
+    metrics = Metrics()
+    with metrics.timer("listener:on_member_join"):
+        pass
+    return SimpleNamespace(
+        latency=0.05,
+        is_ready=lambda: True,
+        metrics=metrics,
+        logging_config=ConfigStore(ConfigRepository()),
+        log_pipeline=SimpleNamespace(
+            stats=lambda: {
+                "depth": 0,
+                "maxsize": 2000,
+                "processed": 0,
+                "dropped": {},
+                "shards": {0: {"depth": 1, "processed": 2, "dropped": {}}},
+            }
+        ),
+        shards={},
+    )
+
+
+def exposition() -> str:
+    response = asyncio.run(MetricsServer(stand_in()).metrics(None))
+    return response.text
+
+
+def test_every_family_is_typed_once() -> None:
+    families: list[str] = []
+    for line in exposition().splitlines():
+        if line.startswith("# TYPE "):
+            families.append(line.split()[2])
+    assert len(families) == len(set(families))
+
+
+def test_every_sample_belongs_to_a_typed_family() -> None:
+    typed: set[str] = set()
+    for line in exposition().splitlines():
+        if line.startswith("# TYPE "):
+            typed.add(line.split()[2])
+        elif line and not line.startswith("#"):
+            match = SAMPLE.match(line)
+            assert match, line
+            name = re.sub(r"_(bucket|sum|count)$", "", match["name"])
+            assert match["name"] in typed or name in typed, line
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import discord
+
+from utils.views import RevokeExpiry, RevokeView
+
+
+class EditedMessages:
+    def __init__(self) -> None:
+        self.edits: list[tuple[int, int, discord.ui.View]] = []
+
+    def get_partial_messageable(self, channel_id: int) -> SimpleNamespace:
+        return SimpleNamespace(
+            get_partial_message=lambda message_id: SimpleNamespace(
+                edit=lambda view: self.edit(channel_id, message_id, view)
+            )
+        )
+
+    async def edit(self, channel_id: int, message_id: int, view) -> None:
+        self.edits.append((channel_id, message_id, view))
+
+
+def message(message_id: int) -> SimpleNamespace:
+    return SimpleNamespace(id=message_id, channel=SimpleNamespace(id=4000))
+
+
+def test_expired_views_are_disabled_in_order() -> None:
+    bot = EditedMessages()
+    expiry = RevokeExpiry(bot)
+    now = int(time.time())
+
+    async def main() -> None:
+        expiry.add(message(2), RevokeView, 10, now - 1)
+        expiry.add(message(1), RevokeView, 11, now - 2)
+        expiry.start()
+        await asyncio.sleep(0.01)
+        expiry.close()
+
+    asyncio.run(main())
+    assert [(c, m) for c, m, _ in bot.edits] == [(4000, 1), (4000, 2)]
+    assert all(isinstance(v, RevokeView) for _, _, v in bot.edits)
+    assert all(item.item.disabled for _, _, v in bot.edits for item in v.children)
+    assert bot.edits[0][2].children[0].item.custom_id == f"xanno:revoke:11:{now - 2}"
+    assert not expiry.heap
+
+
+def test_an_earlier_expiry_wakes_the_task() -> None:
+    bot = EditedMessages()
+    expiry = RevokeExpiry(bot)
+
+    async def main() -> None:
+        now = int(time.time())
+        expiry.add(message(1), RevokeView, 10, now + 3600)
+        expiry.start()
+        await asyncio.sleep(0.01)
+        assert bot.edits == []
+
+        expiry.add(message(2), RevokeView, 11, now - 1)
+        await asyncio.sleep(0.01)
+        expiry.close()
+
+    asyncio.run(main())
+    assert [m for _, m, _ in bot.edits] == [2]
+    assert [entry[2] for entry in expiry.heap] == [1]
+
+
+def test_failed_edits_do_not_stop_the_task() -> None:
+    bot = EditedMessages()
+    expiry = RevokeExpiry(bot)
+    response = SimpleNamespace(status=404, reason="Not Found")
+
+    async def edit(channel_id: int, message_id: int, view) -> None:
+        if message_id == 1:
+            raise discord.NotFound(response, "Unknown Message")
+        bot.edits.append((channel_id, message_id, view))
+
+    bot.edit = edit
+
+    async def main() -> None:
+        now = int(time.time())
+        expiry.add(message(1), RevokeView, 10, now - 2)
+        expiry.add(message(2), RevokeView, 11, now - 1)
+        expiry.start()
+        await asyncio.sleep(0.01)
+        expiry.close()
+
+    asyncio.run(main())
+    assert [m for _, m, _ in bot.edits] == [2]
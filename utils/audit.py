@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from typing import TYPE_CHECKING
+
+import discord
+
+from utils.mappings import AUDIT_ACTIONS, AUDIT_OPTIONAL
+
+if TYPE_CHECKING:
+    from main import Xanno
+    from utils.pipeline import LogRecord
+
+# every action any callback is enriched from, the only ones worth keeping
+ACTIONS = frozenset(a for actions in AUDIT_ACTIONS.values() for a in actions)
+
+
+class AuditEntry:
+    """The parts of an audit log entry a log record is enriched with"""
+
+    __slots__ = ("action", "target_id", "user_id", "reason", "created")
+
+    def __init__(
+        self,
+        action: str,
+        target_id: int,
+        user_id: int | None,
+        reason: str | None,
+        created: float,
+    ) -> None:
+        self.action = action
+        self.target_id = target_id
+        self.user_id = user_id
+        self.reason = reason
+        self.created = created
+
+
+class AuditLogCache:
+    """Recent audit log entries per guild, fed by ``on_audit_log_entry_create``.
+
+    Each guild keeps its last ``size`` entries in a ring, indexed by
+    (action, target ID), so finding who performed an action is a dict
+    lookup rather than a REST call. An entry only explains an event when it
+    was created at most ``skew`` seconds before the event was received.
+
+    The gateway may send an entry just after the event it explains. Such
+    records are parked by (guild, action, target) rather than awaited, and
+    handed to the batcher by :meth:`add` once their entry arrives, or
+    without an actor ``wait`` seconds after the event.
+    """
+
+    def __init__(
+        self, bot: Xanno, size: int = 50, wait: float = 1.0, skew: float = 2.0
+    ) -> None:
+        self.bot = bot
+        self.size = size
+        self.wait = wait
+        self.skew = skew
+        self.guilds: dict[
+            int, tuple[deque[AuditEntry], dict[tuple[str, int], AuditEntry]]
+        ] = {}
+        self.parked: dict[tuple[int, str, int], list[LogRecord]] = {}
+        # parked records by deadline, since a collapsed record parks with the
+        # deadline of its first event, so arrival order is not deadline order
+        self._waiting: set[LogRecord] = set()
+        self._expiry: list[tuple[float, int, LogRecord]] = []
+        self._order = itertools.count()
+        self._sweep: asyncio.TimerHandle | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def add(self, entry: discord.AuditLogEntry) -> None:
+        action = entry.action.name
+        target_id = getattr(entry.target, "id", None)
+        if action not in ACTIONS or target_id is None:
+            return
+
+        ring, index = self.guilds.setdefault(entry.guild.id, (deque(), {}))
+        if len(ring) >= self.size:
+            old = ring.popleft()
+            if index.get((old.action, old.target_id)) is old:
+                del index[old.action, old.target_id]
+        cached = AuditEntry(
+            action,
+            target_id,
+            entry.user_id,
+            entry.reason,
+            discord.utils.snowflake_time(entry.id).timestamp(),
+        )
+        ring.append(cached)
+        index[action, target_id] = cached
+
+        for record in self.parked.pop((entry.guild.id, action, target_id), ()):
+            if self.explains(cached, record):
+                self._release(record, cached)
+
+    def explains(self, entry: AuditEntry, record: LogRecord) -> bool:
+        return entry.created >= record.created - self.skew
+
+    def get(self, record: LogRecord) -> AuditEntry | None:
+        """The cached entry explaining ``record``, None if it has not arrived"""
+        guild = self.guilds.get(record.guild_id)
+        if not guild:
+            return None
+        for action in AUDIT_ACTIONS.get(record.kind, ()):
+            entry = guild[1].get((action, record.target_id))
+            if entry and self.explains(entry, record):
+                return entry
+        return None
+
+    def readable(self, guild_id: int) -> bool:
+        """Whether the bot receives audit log entries for this guild at all"""
+        guild = self.bot.get_guild(guild_id)
+        return bool(
+            self.bot.intents.moderation
+            and guild
+            and guild.me
+            and guild.me.guild_permissions.view_audit_log
+        )
+
+    def _keys(self, record: LogRecord) -> list[tuple[int, str, int]]:
+        return [
+            (record.guild_id, action, record.target_id)
+            for action in AUDIT_ACTIONS[record.kind]
+        ]
+
+    def _release(self, record: LogRecord, entry: AuditEntry | None) -> None:
+        if record not in self._waiting:
+            return
+        self._waiting.discard(record)
+        for key in self._keys(record):
+            records = self.parked.get(key)
+            if records and record in records:
+                records.remove(record)
+                if not records:
+                    del self.parked[key]
+
+        self._annotate(record, entry)
+        self.bot.log_batcher.enqueue(record)
+
+    def _annotate(self, record: LogRecord, entry: AuditEntry | None) -> None:
+        if entry:
+            self.hits += 1
+            record.fields["actor_id"] = entry.user_id
+            record.fields["audit_reason"] = entry.reason
+        else:
+            self.misses += 1
+
+    def attach(self, record: LogRecord) -> bool:
+        """Add the actor to ``record``, or park it until its entry arrives.
+
+        Returns whether the record was parked, in which case it reaches the
+        batcher through :meth:`add` or its timeout instead of the caller.
+        """
+        entry = self.get(record)
+        timeout = record.created + self.wait - time.time()
+        if (
+            entry
+            or timeout <= 0
+            or record.kind in AUDIT_OPTIONAL
+            or not self.readable(record.guild_id)
+        ):
+            self._annotate(record, entry)
+            return False
+
+        for key in self._keys(record):
+            self.parked.setdefault(key, []).append(record)
+        self._waiting.add(record)
+        heapq.heappush(
+            self._expiry, (record.created + self.wait, next(self._order), record)
+        )
+        # sweep sooner when this record is due before the current head
+        if self._expiry[0][2] is record:
+            if self._sweep:
+                self._sweep.cancel()
+            self._sweep = asyncio.get_running_loop().call_later(timeout, self._expire)
+        return True
+
+    def _expire(self) -> None:
+        now = time.time()
+        while self._expiry and self._expiry[0][0] <= now:
+            self._release(heapq.heappop(self._expiry)[2], None)
+        self._sweep = None
+        if self._expiry:
+            self._sweep = asyncio.get_running_loop().call_later(
+                self._expiry[0][0] - now, self._expire
+            )
+
+    def close(self) -> None:
+        """Hand every parked record to the batcher without an actor"""
+        if self._sweep:
+            self._sweep.cancel()
+            self._sweep = None
+        while self._expiry:
+            self._release(heapq.heappop(self._expiry)[2], None)
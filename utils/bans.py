@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import datetime
+import math
+import re
+import time
+from typing import Awaitable, Callable
+
+import discord
+from discord.ext import commands
+
+# users per bulk ban request, Discord's own limit
+BULK_LIMIT = 200
+# requests in flight when banning or unbanning one user at a time
+CONCURRENCY = 5
+
+DURATION = re.compile(r"(?P<amount>[0-9]+)\s*(?P<unit>[smhdw])", re.I)
+UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+TIMESTAMP = re.compile(r"<t:(?P<ts>-?[0-9]+)(?::[tTdDfFR])?>")
+
+
+class Moment(commands.Converter):
+    """A point in time, from a Discord timestamp, unix time, ISO date or snowflake"""
+
+    async def convert(self, ctx: commands.Context, argument: str) -> datetime.datetime:
+        argument = argument.strip()
+        match = TIMESTAMP.fullmatch(argument)
+        if match:
+            argument = match["ts"]
+        if argument.lstrip("-").isdigit():
+            number = int(argument)
+            if number > 10**15:
+                return discord.utils.snowflake_time(number)
+            return datetime.datetime.fromtimestamp(number, datetime.timezone.utc)
+        try:
+            moment = datetime.datetime.fromisoformat(argument)
+        except ValueError:
+            raise commands.BadArgument(f"{argument!r} is not a time") from None
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=datetime.timezone.utc)
+        return moment
+
+
+class Duration(commands.Converter):
+    """A span of time written like ``90m``, ``12h`` or ``1d 6h``"""
+
+    async def convert(self, ctx: commands.Context, argument: str) -> datetime.timedelta:
+        parts = DURATION.findall(argument)
+        if not parts or DURATION.sub("", argument).strip():
+            raise commands.BadArgument(f"{argument!r} is not a duration like 12h")
+        return datetime.timedelta(
+            seconds=sum(int(n) * UNITS[unit.lower()] for n, unit in parts)
+        )
+
+
+class Progress:
+    """Edits one status message with a running count, at most every ``interval`` seconds"""
+
+    def __init__(
+        self, message: discord.Message, total: int, verb: str, interval: float = 3.0
+    ) -> None:
+        self.message = message
+        self.total = total
+        self.verb = verb
+        self.interval = interval
+        self.done = 0
+        self._next = time.monotonic() + interval
+        self._task: asyncio.Task | None = None
+
+    def __call__(self, done: int) -> None:
+        self.done = done
+        if time.monotonic() >= self._next and (self._task is None or self._task.done()):
+            self._next = time.monotonic() + self.interval
+            self._task = asyncio.create_task(self._edit())
+
+    async def _edit(self) -> None:
+        try:
+            await self.message.edit(content=f"{self.verb} {self.done}/{self.total}...")
+        except discord.HTTPException:
+            pass
+
+    async def close(self) -> None:
+        """Stop updating and wait out an edit in flight, so it cannot land last"""
+        self._next = math.inf
+        if self._task:
+            await self._task
+
+
+async def each(
+    action: Callable[[int], Awaitable],
+    user_ids: list[int],
+    progress: Callable[[int], None] | None = None,
+    concurrency: int = CONCURRENCY,
+) -> tuple[list[int], list[int]]:
+    """Run ``action`` on every ID from ``concurrency`` workers, returning (done, failed).
+
+    discord.py already waits out each route's rate limit; the fixed pool
+    keeps a raid's worth of IDs from becoming as many queued requests.
+    """
+    done: list[int] = []
+    failed: list[int] = []
+    pending = iter(user_ids)
+
+    async def worker() -> None:
+        for user_id in pending:
+            try:
+                await action(user_id)
+            except discord.HTTPException:
+                failed.append(user_id)
+            else:
+                done.append(user_id)
+            if progress:
+                progress(len(done) + len(failed))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return done, failed
+
+
+async def ban_all(
+    guild: discord.Guild,
+    user_ids: list[int],
+    reason: str,
+    delete_message_seconds: int = 0,
+    progress: Callable[[int], None] | None = None,
+) -> tuple[list[int], list[int]]:
+    """Ban every ID, ``BULK_LIMIT`` per request where the bot may bulk ban"""
+    banned: list[int] = []
+    failed: list[int] = []
+    for start in range(0, len(user_ids), BULK_LIMIT):
+        chunk = user_ids[start : start + BULK_LIMIT]
+        try:
+            result = await guild.bulk_ban(
+                [discord.Object(u) for u in chunk],
+                reason=reason,
+                delete_message_seconds=delete_message_seconds,
+            )
+        except discord.Forbidden:
+            # bulk bans also need Manage Server, so ban the rest one by one
+            rest, rest_failed = await each(
+                lambda u: guild.ban(
+                    discord.Object(u),
+                    reason=reason,
+                    delete_message_seconds=delete_message_seconds,
+                ),
+                user_ids[start:],
+                progress and (lambda n: progress(len(banned) + len(failed) + n)),
+            )
+            return banned + rest, failed + rest_failed
+        except discord.HTTPException:
+            # Discord answers with an error when no user in the chunk was banned
+            failed += chunk
+        else:
+            banned += [u.id for u in result.banned]
+            failed += [u.id for u in result.failed]
+        if progress:
+            progress(len(banned) + len(failed))
+    return banned, failed
+
+
+async def unban_all(
+    guild: discord.Guild,
+    user_ids: list[int],
+    reason: str,
+    progress: Callable[[int], None] | None = None,
+) -> tuple[list[int], list[int]]:
+    return await each(
+        lambda u: guild.unban(discord.Object(u), reason=reason), user_ids, progress
+    )
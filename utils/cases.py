@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from main import Xanno
+
+
+class Case:
+    """One moderation action, as stored in the case database"""
+
+    __slots__ = (
+        "id",
+        "guild_id",
+        "action",
+        "target_id",
+        "moderator_id",
+        "reason",
+        "dtp",
+        "created_at",
+    )
+
+    def __init__(
+        self,
+        id: int | None,
+        guild_id: int,
+        action: str,
+        target_id: int,
+        moderator_id: int,
+        reason: str,
+        dtp: int,
+        created_at: float,
+    ) -> None:
+        self.id = id
+        self.guild_id = guild_id
+        self.action = action
+        self.target_id = target_id
+        self.moderator_id = moderator_id
+        self.reason = reason
+        self.dtp = dtp
+        self.created_at = created_at
+
+    def row(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__[1:])
+
+
+class CaseStore:
+    """Moderation cases in a WAL-mode SQLite database.
+
+    :meth:`record` only queues the case. A background task writes queued
+    cases in one transaction every ``interval`` seconds, or as soon as
+    ``batch`` are waiting, so a mass ban costs one commit rather than one
+    per user. Reads run after any queued writes on the same single thread,
+    and page through indexes on (guild, target) and (guild, moderator).
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS cases ("
+        "id INTEGER PRIMARY KEY, "
+        "guild_id INTEGER NOT NULL, "
+        "action TEXT NOT NULL, "
+        "target_id INTEGER NOT NULL, "
+        "moderator_id INTEGER NOT NULL, "
+        "reason TEXT, "
+        "dtp INTEGER NOT NULL DEFAULT 0, "
+        "created_at REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS cases_target "
+        "ON cases (guild_id, target_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS cases_moderator "
+        "ON cases (guild_id, moderator_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS cases_guild ON cases (guild_id, created_at)",
+    )
+    COLUMNS = ", ".join(Case.__slots__)
+
+    def __init__(
+        self,
+        bot: Xanno,
+        path: str = "cases.db",
+        interval: float = 2.0,
+        batch: int = 200,
+    ) -> None:
+        self.bot = bot
+        self.path = path
+        self.interval = interval
+        self.batch = batch
+        self.pending: list[Case] = []
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="xanno-cases"
+        )
+        self._conn: sqlite3.Connection | None = None
+        self._full = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in self.SCHEMA:
+                self._conn.execute(statement)
+            self._conn.commit()
+        return self._conn
+
+    async def _run(self, func: Callable, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _write(self, cases: list[Case]) -> None:
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                f"INSERT INTO cases ({', '.join(Case.__slots__[1:])}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [c.row() for c in cases],
+            )
+
+    def _page(
+        self, where: str, args: tuple, limit: int, offset: int
+    ) -> tuple[list[Case], int]:
+        conn = self._connect()
+        total = conn.execute(f"SELECT COUNT(*) FROM cases WHERE {where}", args)
+        rows = conn.execute(
+            f"SELECT {self.COLUMNS} FROM cases WHERE {where} "
+            "ORDER BY created_at DESC LIMIT ? OFFSET ?",
+            (*args, limit, offset),
+        )
+        return [Case(*r) for r in rows], total.fetchone()[0]
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def record(
+        self,
+        guild_id: int,
+        action: str,
+        target_id: int,
+        moderator_id: int,
+        reason: str,
+        dtp: int = 0,
+    ) -> None:
+        """Queue a case for the next batched write"""
+        self.pending.append(
+            Case(
+                None,
+                guild_id,
+                action,
+                target_id,
+                moderator_id,
+                reason,
+                dtp,
+                time.time(),
+            )
+        )
+        if len(self.pending) >= self.batch:
+            self._full.set()
+
+    async def flush(self) -> None:
+        cases, self.pending = self.pending, []
+        self._full.clear()
+        if not cases:
+            return
+        try:
+            await self._run(self._write, cases)
+        except sqlite3.Error as e:
+            self.bot.logger.warning(f"Dropped {len(cases)} moderation cases: {e}")
+
+    async def _flushes(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    async def history(
+        self, guild_id: int, target_id: int, limit: int = 10, offset: int = 0
+    ) -> tuple[list[Case], int]:
+        """A page of cases against ``target_id``, newest first, and the total"""
+        await self.flush()
+        return await self._run(
+            self._page,
+            "guild_id = ? AND target_id = ?",
+            (guild_id, target_id),
+            limit,
+            offset,
+        )
+
+    async def cases(
+        self,
+        guild_id: int,
+        moderator_id: int | None = None,
+        limit: int = 10,
+        offset: int = 0,
+    ) -> tuple[list[Case], int]:
+        """A page of the guild's or one moderator's cases, and the total"""
+        await self.flush()
+        if moderator_id is None:
+            return await self._run(
+                self._page, "guild_id = ?", (guild_id,), limit, offset
+            )
+        return await self._run(
+            self._page,
+            "guild_id = ? AND moderator_id = ?",
+            (guild_id, moderator_id),
+            limit,
+            offset,
+        )
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._flushes(), name="xanno: case writer")
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+        await self.flush()
+        await self._run(self._close)
+        self._executor.shutdown(wait=False)
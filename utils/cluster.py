@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""Runs Xanno's shards over several worker processes.
+
+The launcher splits ``SHARD_COUNT`` shards into ``CLUSTERS`` disjoint
+ranges, one :class:`~main.ShardedXanno` process each, and talks to every
+cluster over a multiprocessing pipe. It relays config changes between
+clusters, gathers cluster-wide stats, spaces out IDENTIFYs across
+processes and shuts every cluster down together.
+
+    CLUSTERS=4 SHARD_COUNT=16 python main.py
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import math
+import multiprocessing
+import os
+import signal
+import time
+from multiprocessing.connection import Connection
+from typing import TYPE_CHECKING, Any
+
+import discord
+
+if TYPE_CHECKING:
+    from main import Xanno
+
+# env vars naming a per-process file or port, made unique per cluster
+FILE_VARS = ("LOG_FILE", "GATEWAY_RECORD", "METRICS_FILE", "TELEMETRY_PATH")
+PORT_VARS = ("METRICS_PORT",)
+IDENTIFY_INTERVAL = 5.0
+
+
+def shard_ranges(clusters: int, shard_count: int) -> list[list[int]]:
+    """Split the shard IDs into ``clusters`` contiguous, disjoint ranges"""
+    size, extra = divmod(shard_count, clusters)
+    ranges, start = [], 0
+    for i in range(clusters):
+        end = start + size + (i < extra)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+class ClusterClient:
+    """A cluster's end of the launcher pipe, attached as ``bot.cluster``"""
+
+    def __init__(self, bot: Xanno, conn: Connection, index: int) -> None:
+        self.bot = bot
+        self.conn = conn
+        self.index = index
+        self._nonces = itertools.count()
+        self._pending: dict[int, asyncio.Future] = {}
+
+    def _send(self, op: str, **fields: Any) -> None:
+        try:
+            self.conn.send({"op": op, **fields})
+        except (BrokenPipeError, OSError):
+            self.bot.logger.warning(f"Cluster {self.index} lost the launcher")
+
+    def _receive(self) -> None:
+        try:
+            message = self.conn.recv()
+        except EOFError:
+            asyncio.get_running_loop().remove_reader(self.conn.fileno())
+            asyncio.create_task(self.bot.close())
+            return
+
+        op = message["op"]
+        if op == "config":
+            self.bot.logging_config.apply(message["guild_id"], message["config"])
+        elif op == "collect":
+            self._send("collected", nonce=message["nonce"], stats=self.stats_local())
+        elif op == "shutdown":
+            asyncio.create_task(self.bot.close())
+        else:
+            future = self._pending.pop(message.get("nonce"), None)
+            if future and not future.done():
+                future.set_result(message)
+
+    async def request(self, op: str, timeout: float | None = 10.0, **fields) -> dict:
+        nonce = next(self._nonces)
+        future = self._pending[nonce] = asyncio.get_running_loop().create_future()
+        self._send(op, nonce=nonce, **fields)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(nonce, None)
+
+    def publish_config(self, guild_id: int, config: dict) -> None:
+        self._send("config", guild_id=guild_id, config=config)
+
+    async def identify(self, shard_id: int) -> None:
+        """Wait for the launcher's go-ahead to IDENTIFY ``shard_id``"""
+        await self.request("identify", timeout=None, shard_id=shard_id)
+
+    async def stats(self) -> list[dict[str, Any]]:
+        """:meth:`stats_local` of every running cluster"""
+        return (await self.request("stats"))["clusters"]
+
+    def stats_local(self) -> dict[str, Any]:
+        pipeline = self.bot.log_pipeline.stats()
+        latency = self.bot.latency
+        return {
+            "cluster": self.index,
+            "pid": os.getpid(),
+            "shards": self.bot.shard_ids,
+            "guilds": len(self.bot.guilds),
+            "latency": latency if math.isfinite(latency) else -1,
+            "loop_lag": self.bot.metrics.loop_lag,
+            "log_queue_depth": pipeline["depth"],
+            "log_dropped": sum(pipeline["dropped"].values()),
+        }
+
+    def start(self) -> None:
+        asyncio.get_running_loop().add_reader(self.conn.fileno(), self._receive)
+        self.bot.logging_config.broadcast = self.publish_config
+
+    def close(self) -> None:
+        try:
+            asyncio.get_running_loop().remove_reader(self.conn.fileno())
+        except (OSError, ValueError):
+            pass
+        self.bot.logging_config.broadcast = None
+
+
+class ClusterLauncher:
+    """Starts one process per shard range and relays messages between them.
+
+    IDENTIFYs are granted one per ``IDENTIFY_INTERVAL`` per rate limit
+    bucket (``shard_id % concurrency``), whichever process asks.
+    """
+
+    def __init__(
+        self,
+        clusters: int,
+        shard_count: int,
+        concurrency: int = 1,
+        timeout: float = 5.0,
+    ) -> None:
+        self.ranges = shard_ranges(clusters, shard_count)
+        self.shard_count = shard_count
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.conns: dict[int, Connection] = {}
+        self.processes: dict[int, multiprocessing.Process] = {}
+        self._nonces = itertools.count()
+        self._pending: dict[int, dict[int, dict]] = {}
+        self._identify_at: dict[int, float] = {}
+        self._done = asyncio.Event()
+
+    def _send(self, index: int, op: str, **fields: Any) -> None:
+        try:
+            self.conns[index].send({"op": op, **fields})
+        except (BrokenPipeError, OSError, KeyError):
+            pass
+
+    def _receive(self, index: int) -> None:
+        conn = self.conns[index]
+        try:
+            message = conn.recv()
+        except EOFError:
+            asyncio.get_running_loop().remove_reader(conn.fileno())
+            del self.conns[index]
+            if not self.conns:
+                self._done.set()
+            return
+
+        op = message["op"]
+        if op == "config":
+            for other in self.conns:
+                if other != index:
+                    self._send(
+                        other,
+                        "config",
+                        guild_id=message["guild_id"],
+                        config=message["config"],
+                    )
+        elif op == "collected":
+            replies = self._pending.get(message["nonce"])
+            if replies is not None:
+                replies[index] = message["stats"]
+        elif op == "stats":
+            asyncio.create_task(self._stats(index, message["nonce"]))
+        elif op == "identify":
+            asyncio.create_task(
+                self._identify(index, message["nonce"], message["shard_id"])
+            )
+        elif op == "shutdown":
+            self.shutdown()
+
+    async def collect(self) -> list[dict[str, Any]]:
+        """Ask every cluster for its stats, waiting up to ``timeout``"""
+        nonce = next(self._nonces)
+        replies = self._pending[nonce] = {}
+        expected = set(self.conns)
+        for index in expected:
+            self._send(index, "collect", nonce=nonce)
+
+        deadline = time.monotonic() + self.timeout
+        while replies.keys() < expected and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+            expected &= set(self.conns)
+        del self._pending[nonce]
+        return [replies[i] for i in sorted(replies)]
+
+    async def _stats(self, index: int, nonce: int) -> None:
+        self._send(index, "stats", nonce=nonce, clusters=await self.collect())
+
+    async def _identify(self, index: int, nonce: int, shard_id: int) -> None:
+        bucket, now = shard_id % self.concurrency, time.monotonic()
+        at = max(now, self._identify_at.get(bucket, now))
+        self._identify_at[bucket] = at + IDENTIFY_INTERVAL
+        await asyncio.sleep(at - now)
+        self._send(index, "identify", nonce=nonce)
+
+    def shutdown(self) -> None:
+        for index in list(self.conns):
+            self._send(index, "shutdown")
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        context = multiprocessing.get_context("spawn")
+        for index, shard_ids in enumerate(self.ranges):
+            parent, child = context.Pipe()
+            process = context.Process(
+                target=run_cluster,
+                args=(index, shard_ids, self.shard_count, child),
+                name=f"xanno-cluster-{index}",
+            )
+            process.start()
+            child.close()
+            self.conns[index] = parent
+            self.processes[index] = process
+            loop.add_reader(parent.fileno(), self._receive, index)
+
+    async def run(self) -> None:
+        self.start()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.shutdown)
+        await self._done.wait()
+        for process in self.processes.values():
+            await asyncio.to_thread(process.join, 30)
+            if process.is_alive():
+                process.terminate()
+
+
+def _per_cluster(index: int) -> None:
+    os.environ.setdefault("LOG_FILE", "log.LOG")
+    for name in FILE_VARS:
+        if os.getenv(name):
+            head, tail = os.path.split(os.environ[name])
+            os.environ[name] = os.path.join(head, f"cluster{index}-{tail}")
+    for name in PORT_VARS:
+        if os.getenv(name):
+            os.environ[name] = str(int(os.environ[name]) + index)
+
+
+def run_cluster(
+    index: int, shard_ids: list[int], shard_count: int, conn: Connection
+) -> None:
+    """Entry point of a cluster process"""
+    from dotenv import load_dotenv
+
+    from main import ShardedXanno, main
+
+    # the launcher coordinates shutdown, so a terminal ^C only reaches it
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    load_dotenv()
+    _per_cluster(index)
+
+    bot = ShardedXanno(shard_ids=shard_ids, shard_count=shard_count)
+    bot.cluster = ClusterClient(bot, conn, index)
+    bot.logger.info(f"Cluster {index} running shards {shard_ids}")
+    asyncio.run(main(bot))
+
+
+async def recommended_shards(token: str) -> tuple[int, int]:
+    """Discord's recommended shard count and IDENTIFY concurrency"""
+    http = discord.http.HTTPClient(asyncio.get_running_loop())
+    try:
+        await http.static_login(token)
+        shards, _, limit = await http.get_bot_gateway()
+    finally:
+        await http.close()
+    return shards, limit["max_concurrency"]
+
+
+async def launch(clusters: int) -> None:
+    shards, concurrency = os.getenv("SHARD_COUNT", "auto"), 1
+    if shards == "auto":
+        shards, concurrency = await recommended_shards(os.environ["TOKEN"])
+    shard_count = int(shards)
+    await ClusterLauncher(min(clusters, shard_count), shard_count, concurrency).run()
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Callable, Hashable
+
+from utils.mappings import LOGGING_COLLAPSE_WINDOWS
+from utils.pipeline import LogRecord
+
+if TYPE_CHECKING:
+    from main import Xanno
+
+
+def _target(record: LogRecord) -> Hashable:
+    return record.target_id
+
+
+def _reactor(record: LogRecord) -> Hashable:
+    return record.fields["user_id"], record.fields["channel_id"]
+
+
+def _updated(record: LogRecord) -> Hashable:
+    # a reorder moves every sibling, so group position-only updates together
+    changed = record.fields["changes"]
+    if changed and all(field.name == "position" for field, _, _ in changed):
+        return "position"
+    return record.target_id
+
+
+# what a burst is keyed on besides guild and kind, the target by default
+KEYS: dict[str, Callable[[LogRecord], Hashable]] = {
+    "on_reaction_add": _reactor,
+    "on_reaction_remove": _reactor,
+    "on_guild_channel_update": _updated,
+    "on_guild_role_update": _updated,
+}
+
+
+def _net(records: list[LogRecord]) -> LogRecord | None:
+    """Fold updates to one target into its net change, None if it reverted"""
+    first, last = records[0], records[-1]
+    if len(records) == 1:
+        return first
+
+    before: dict[str, tuple[Any, Any]] = {}
+    after: dict[str, Any] = {}
+    for record in records:
+        for field, old, new in record.fields["changes"]:
+            before.setdefault(field.name, (field, old))
+            after[field.name] = new
+    changed = [
+        (field, old, after[name])
+        for name, (field, old) in before.items()
+        if old != after[name]
+    ]
+    if not changed and before:
+        return None
+
+    merged = LogRecord(last.kind, last.guild_id, last.channel_id, last.target_id)
+    merged.fields = {**last.fields, "changes": changed}
+    if "name" in first.fields:
+        merged.fields["name"] = first.fields["name"]
+    merged.created = first.created
+    return merged
+
+
+class LogCollapser:
+    """Collapses bursts of noisy logging callbacks before they reach the pipeline.
+
+    Records for a callback in ``windows`` are held for its window, keyed by
+    guild, callback and target. Repeated updates to one target are merged
+    into their net change, and a burst over many targets (a channel reorder,
+    one user spamming reactions) becomes a single summary record whose
+    ``fields["records"]`` holds the collapsed records.
+    """
+
+    def __init__(self, bot: Xanno, windows: dict[str, float] | None = None) -> None:
+        self.bot = bot
+        self.windows = LOGGING_COLLAPSE_WINDOWS if windows is None else windows
+        self.collapsed = 0
+        self._pending: dict[tuple, list[LogRecord]] = {}
+        self._timers: dict[tuple, asyncio.TimerHandle] = {}
+
+    def submit(self, record: LogRecord) -> None:
+        window = self.windows.get(record.kind)
+        if not window:
+            self.bot.log_pipeline.submit(record)
+            return
+
+        key = (record.guild_id, record.kind, KEYS.get(record.kind, _target)(record))
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = [record]
+            self._timers[key] = asyncio.get_running_loop().call_later(
+                window, self.flush, key
+            )
+        else:
+            pending.append(record)
+
+    def collapse(self, records: list[LogRecord]) -> LogRecord | None:
+        self.collapsed += len(records) - 1
+        if "changes" in records[0].fields:
+            targets: dict[int, list[LogRecord]] = {}
+            for record in records:
+                targets.setdefault(record.target_id, []).append(record)
+            records = [r for r in map(_net, targets.values()) if r]
+            if not records:
+                return None
+        if len(records) == 1:
+            return records[0]
+
+        first = records[0]
+        summary = LogRecord(first.kind, first.guild_id, first.channel_id)
+        summary.fields = {"records": records}
+        summary.created = first.created
+        return summary
+
+    def flush(self, key: tuple) -> None:
+        timer = self._timers.pop(key, None)
+        if timer:
+            timer.cancel()
+        records = self._pending.pop(key, None)
+        record = records and self.collapse(records)
+        if record:
+            self.bot.log_pipeline.submit(record)
+
+    def close(self) -> None:
+        for key in list(self._pending):
+            self.flush(key)
@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+
+class ConfigRepository:
+    """Persistent storage for per-guild logging configs.
+
+    A config is the ``{"channel", "callbacks"}`` dict stored per guild.
+    """
+
+    async def load_all(self) -> dict[int, dict]:
+        raise NotImplementedError
+
+    async def get(self, guild_id: int) -> dict | None:
+        raise NotImplementedError
+
+    async def set(self, guild_id: int, config: dict) -> None:
+        raise NotImplementedError
+
+    async def changed(self) -> bool:
+        """Whether the storage was modified by someone else since the last read"""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        ...
+
+
+class JSONConfigRepository(ConfigRepository):
+    """The legacy logging.json layout, parsed and rewritten as a whole"""
+
+    def __init__(self, path: str = "logging.json") -> None:
+        self.path = path
+        self._stamp: tuple[int, int] | None = None
+        self._lock = asyncio.Lock()
+
+    def _stat(self) -> tuple[int, int] | None:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns
+
+    def _read(self) -> dict[int, dict]:
+        # only remember the stamp once the file parsed, so a half-written file
+        # still reads as changed on the next poll
+        stamp = self._stat()
+        if stamp is None:
+            data = {}
+        else:
+            with open(self.path) as fp:
+                data = {int(k): v for k, v in json.load(fp).items()}
+        self._stamp = stamp
+        return data
+
+    def _write(self, guild_id: int, config: dict) -> None:
+        data = self._read()
+        data[guild_id] = config
+
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as fp:
+            json.dump({str(k): v for k, v in data.items()}, fp, indent=4)
+        os.replace(tmp, self.path)
+        self._stamp = self._stat()
+
+    async def load_all(self) -> dict[int, dict]:
+        async with self._lock:
+            return await asyncio.to_thread(self._read)
+
+    async def get(self, guild_id: int) -> dict | None:
+        return (await self.load_all()).get(guild_id)
+
+    async def set(self, guild_id: int, config: dict) -> None:
+        async with self._lock:
+            await asyncio.to_thread(self._write, guild_id, config)
+
+    async def changed(self) -> bool:
+        return await asyncio.to_thread(self._stat) != self._stamp
+
+
+class SQLiteConfigRepository(ConfigRepository):
+    """One row per guild in a WAL-mode SQLite database.
+
+    Every statement runs on a single dedicated thread, so the connection is
+    never shared and writes are serialised without an extra lock.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS logging ("
+        "guild_id INTEGER PRIMARY KEY, "
+        "channel INTEGER, "
+        "callbacks TEXT NOT NULL)"
+    )
+
+    def __init__(self, path: str = "logging.db") -> None:
+        self.path = path
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="xanno-config"
+        )
+        self._conn: sqlite3.Connection | None = None
+        self._version: int | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(self.SCHEMA)
+            self._conn.commit()
+        return self._conn
+
+    async def _run(self, func: Callable, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _data_version(self) -> int:
+        return self._connect().execute("PRAGMA data_version").fetchone()[0]
+
+    def _load_all(self) -> dict[int, dict]:
+        rows = self._connect().execute(
+            "SELECT guild_id, channel, callbacks FROM logging"
+        )
+        data = {g: {"channel": c, "callbacks": json.loads(cb)} for g, c, cb in rows}
+        self._version = self._data_version()
+        return data
+
+    def _get(self, guild_id: int) -> dict | None:
+        row = (
+            self._connect()
+            .execute(
+                "SELECT channel, callbacks FROM logging WHERE guild_id = ?",
+                (guild_id,),
+            )
+            .fetchone()
+        )
+        return None if not row else {"channel": row[0], "callbacks": json.loads(row[1])}
+
+    def _set(self, guild_id: int, config: dict) -> None:
+        conn = self._connect()
+        conn.execute(
+            "INSERT INTO logging (guild_id, channel, callbacks) VALUES (?, ?, ?) "
+            "ON CONFLICT(guild_id) DO UPDATE SET "
+            "channel = excluded.channel, callbacks = excluded.callbacks",
+            (guild_id, config.get("channel"), json.dumps(config["callbacks"])),
+        )
+        conn.commit()
+
+    def _changed(self) -> bool:
+        # data_version only moves for commits made by other connections
+        return self._data_version() != self._version
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def load_all(self) -> dict[int, dict]:
+        return await self._run(self._load_all)
+
+    async def get(self, guild_id: int) -> dict | None:
+        return await self._run(self._get, guild_id)
+
+    async def set(self, guild_id: int, config: dict) -> None:
+        await self._run(self._set, guild_id, config)
+
+    async def changed(self) -> bool:
+        return await self._run(self._changed)
+
+    async def close(self) -> None:
+        await self._run(self._close)
+        self._executor.shutdown(wait=False)
+
+
+def open_repository(
+    backend: str | None = None, path: str | None = None
+) -> ConfigRepository:
+    backend = (backend or os.getenv("CONFIG_BACKEND", "json")).lower()
+    path = path or os.getenv("CONFIG_PATH")
+
+    if backend == "json":
+        return JSONConfigRepository(path or "logging.json")
+    if backend == "sqlite":
+        return SQLiteConfigRepository(path or "logging.db")
+    raise ValueError(f"Unknown config backend {backend!r}")
+
+
+def migrate_json_to_sqlite(
+    json_path: str = "logging.json", db_path: str = "logging.db"
+) -> int:
+    """Copy every guild from logging.json into a SQLite database, returning the count"""
+    with open(json_path) as fp:
+        data = json.load(fp)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(SQLiteConfigRepository.SCHEMA)
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO logging (guild_id, channel, callbacks) "
+                "VALUES (?, ?, ?)",
+                [
+                    (int(k), v.get("channel"), json.dumps(v.get("callbacks", {})))
+                    for k, v in data.items()
+                ],
+            )
+    finally:
+        conn.close()
+    return len(data)
+
+
+class ConfigStore:
+    """In-memory view of every guild config keyed by integer guild ID.
+
+    Lookups are plain dict accesses. The backing repository is polled every
+    ``interval`` seconds for outside changes, and writes go through :meth:`set`.
+
+    ``enabled`` maps each callback name to the IDs of guilds that have it
+    switched on with a logging channel set, and is kept in step with every
+    change so listeners can gate on a set membership test. ``enabled_hits``
+    and ``disabled_hits`` count :meth:`is_enabled` checks that did and did
+    not find the callback enabled, one per gated event.
+
+    ``broadcast``, when set, is called with every config written through
+    :meth:`set`, so other processes can :meth:`apply` it without a re-read.
+    """
+
+    def __init__(self, repository: ConfigRepository, interval: float = 2.0) -> None:
+        self.repository = repository
+        self.interval = interval
+        self.enabled: dict[str, set[int]] = {}
+        self._data: dict[int, dict] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._subscribers: list[Callable[[], None]] = []
+        self.broadcast: Callable[[int, dict], None] | None = None
+        self.enabled_hits = 0
+        self.disabled_hits = 0
+
+    def _index(self, guild_id: int, config: dict | None) -> None:
+        for guilds in self.enabled.values():
+            guilds.discard(guild_id)
+        if config and config.get("channel"):
+            for name, on in config["callbacks"].items():
+                if on:
+                    self.enabled.setdefault(name, set()).add(guild_id)
+
+    def _notify(self) -> None:
+        for callback in self._subscribers:
+            callback()
+
+    def subscribe(self, callback: Callable[[], None]) -> None:
+        """Call ``callback`` whenever the enabled index changes"""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[], None]) -> None:
+        self._subscribers.remove(callback)
+
+    async def load(self) -> None:
+        old, new = self._data, await self.repository.load_all()
+        for guild_id in old.keys() | new.keys():
+            if old.get(guild_id) != new.get(guild_id):
+                self._index(guild_id, new.get(guild_id))
+        self._data = new
+        self._notify()
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                if await self.repository.changed():
+                    await self.load()
+            except Exception:
+                # e.g. a locked database or a half-written file, so keep the
+                # current view and try again next interval
+                logging.getLogger("xanno").exception("Polling logging configs failed")
+
+    async def start(self) -> None:
+        await self.load()
+        self._task = asyncio.create_task(self._poll(), name="xanno: config poll")
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+        await self.repository.close()
+
+    def get(self, guild_id: int) -> dict | None:
+        return self._data.get(guild_id)
+
+    def is_enabled(self, callback: str, guild_id: int) -> bool:
+        if guild_id in self.enabled.get(callback, ()):
+            self.enabled_hits += 1
+            return True
+        self.disabled_hits += 1
+        return False
+
+    def apply(self, guild_id: int, config: dict) -> None:
+        """Update the in-memory view only, for a change already persisted"""
+        self._index(guild_id, config)
+        self._data[guild_id] = config
+        self._notify()
+
+    async def set(self, guild_id: int, config: dict) -> None:
+        self.apply(guild_id, config)
+        await self.repository.set(guild_id, config)
+        if self.broadcast:
+            self.broadcast(guild_id, config)
+
+
+if __name__ == "__main__":
+    # python -m utils.config [logging.json] [logging.db]
+    src = sys.argv[1] if len(sys.argv) > 1 else "logging.json"
+    dst = sys.argv[2] if len(sys.argv) > 2 else "logging.db"
+    print(f"Migrated {migrate_json_to_sqlite(src, dst)} guilds from {src} to {dst}")
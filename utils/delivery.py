@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import discord
+
+from utils.renderers import render
+
+if TYPE_CHECKING:
+    from main import Xanno
+    from utils.pipeline import LogRecord
+
+
+class ChannelSink:
+    """Delivers log embeds with the bot's own ``channel.send``"""
+
+    def __init__(self, bot: Xanno) -> None:
+        self.bot = bot
+
+    async def send(
+        self, channel: discord.abc.Messageable, embeds: list[discord.Embed]
+    ) -> None:
+        await channel.send(embeds=embeds)
+
+
+class WebhookSink(ChannelSink):
+    """Delivers log embeds through one cached webhook per log channel.
+
+    Webhook executions are rate limited separately from the bot's own routes,
+    so heavy logging does not delay command replies. Channels where the bot
+    lacks ``manage_webhooks`` fall back to ``channel.send``.
+    """
+
+    NAME = "Xanno logging"
+
+    def __init__(self, bot: Xanno) -> None:
+        super().__init__(bot)
+        self._webhooks: dict[int, discord.Webhook] = {}
+
+    async def webhook(self, channel: discord.TextChannel) -> discord.Webhook | None:
+        if channel.id in self._webhooks:
+            return self._webhooks[channel.id]
+        if not channel.permissions_for(channel.guild.me).manage_webhooks:
+            return None
+
+        for webhook in await channel.webhooks():
+            if webhook.user == self.bot.user and webhook.token:
+                break
+        else:
+            webhook = await channel.create_webhook(
+                name=self.NAME, reason="Logging delivery"
+            )
+        self._webhooks[channel.id] = webhook
+        return webhook
+
+    async def send(
+        self, channel: discord.abc.Messageable, embeds: list[discord.Embed]
+    ) -> None:
+        webhook = None
+        if isinstance(channel, discord.TextChannel):
+            try:
+                webhook = await self.webhook(channel)
+            except discord.HTTPException:
+                pass
+
+        if webhook is None:
+            return await super().send(channel, embeds)
+
+        try:
+            await webhook.send(
+                embeds=embeds,
+                username=self.bot.user.name,
+                avatar_url=self.bot.user.display_avatar.url,
+            )
+        except (discord.NotFound, discord.Forbidden):
+            # deleted or revoked behind our back, recreate on the next flush
+            self._webhooks.pop(channel.id, None)
+            await super().send(channel, embeds)
+
+
+class LogBatcher:
+    """Per-channel outbound buffers for log records.
+
+    Records queued for a channel are held for ``window`` seconds, rendered,
+    and then sent as few messages as possible, each carrying at most 10 embeds
+    and 6000 characters of embed text.
+    """
+
+    MAX_EMBEDS = 10
+    MAX_CHARS = 6000
+
+    def __init__(
+        self, bot: Xanno, sink: ChannelSink | None = None, window: float = 1.5
+    ) -> None:
+        self.bot = bot
+        self.sink = sink or ChannelSink(bot)
+        self.window = window
+        self._buffers: dict[int, list[LogRecord]] = {}
+        self._timers: dict[int, asyncio.TimerHandle] = {}
+        # channels with a flush task that has not taken their buffer yet
+        self._scheduled: set[int] = set()
+        self._locks: dict[int, asyncio.Lock] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def enqueue(self, record: LogRecord) -> None:
+        channel_id = record.channel_id
+        buffer = self._buffers.setdefault(channel_id, [])
+        buffer.append(record)
+
+        if len(buffer) >= self.MAX_EMBEDS:
+            self._schedule(channel_id)
+        elif channel_id not in self._timers:
+            self._timers[channel_id] = asyncio.get_running_loop().call_later(
+                self.window, self._schedule, channel_id
+            )
+
+    def _schedule(self, channel_id: int) -> None:
+        if channel_id in self._scheduled:
+            return
+        self._scheduled.add(channel_id)
+        task = asyncio.create_task(
+            self.flush(channel_id), name=f"xanno: log flush {channel_id}"
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    @classmethod
+    def chunk(cls, embeds: list[discord.Embed]) -> list[list[discord.Embed]]:
+        chunks, current, size = [], [], 0
+        for embed in embeds:
+            length = len(embed)
+            if current and (
+                len(current) >= cls.MAX_EMBEDS or size + length > cls.MAX_CHARS
+            ):
+                chunks.append(current)
+                current, size = [], 0
+            current.append(embed)
+            size += length
+        if current:
+            chunks.append(current)
+        return chunks
+
+    async def flush(self, channel_id: int) -> None:
+        timer = self._timers.pop(channel_id, None)
+        if timer:
+            timer.cancel()
+        records = self._buffers.pop(channel_id, None)
+        self._scheduled.discard(channel_id)
+        channel = self.bot.get_channel(channel_id)
+        if not records or channel is None:
+            return
+
+        embeds = []
+        for record in records:
+            try:
+                embeds.append(render(self.bot, record))
+            except Exception:
+                await self.bot.on_error(record.kind, record)
+
+        async with self._locks.setdefault(channel_id, asyncio.Lock()):
+            with self.bot.metrics.timer("log.flush"):
+                for chunk in self.chunk(embeds):
+                    try:
+                        await self.sink.send(channel, chunk)
+                    except discord.HTTPException as e:
+                        self.bot.logger.warning(
+                            f"Dropped {len(chunk)} log embeds "
+                            f"for channel {channel_id}: {e}"
+                        )
+
+    async def close(self) -> None:
+        await asyncio.gather(*[self.flush(c) for c in list(self._buffers)])
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
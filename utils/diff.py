@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from operator import attrgetter
+from typing import Any, Callable, Iterator
+
+import discord
+
+
+def count(value: Any) -> str:
+    return str(len(value) if value else 0)
+
+
+def flags(value: Any) -> str:
+    return str(value.value)
+
+
+def named(value: Any) -> str:
+    return str(getattr(value, "name", value))
+
+
+def relative(value: Any) -> str:
+    return discord.utils.format_dt(value, "R") if value else "None"
+
+
+class Field:
+    """A tracked attribute, read raw for comparison and formatted only on change"""
+
+    __slots__ = ("name", "get", "format")
+
+    def __init__(
+        self,
+        name: str,
+        format: Callable[[Any], str] = str,
+        get: Callable[[Any], Any] | None = None,
+    ) -> None:
+        self.name = name
+        self.format = format
+        self.get = get or _safe(attrgetter(name))
+
+
+def _safe(getter: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    # channel subclasses don't share every attribute, treat missing ones as None
+    def get(obj: Any) -> Any:
+        try:
+            return getter(obj)
+        except AttributeError:
+            return None
+
+    return get
+
+
+def _overwrites(channel: discord.abc.GuildChannel) -> list[dict]:
+    return [o._asdict() for o in channel._overwrites]
+
+
+TRACKED: dict[type, tuple[Field, ...]] = {
+    discord.Guild: (
+        Field("name"),
+        Field("description"),
+        Field("icon"),
+        Field("banner"),
+        Field("splash"),
+        Field("owner_id"),
+        Field("afk_channel", named),
+        Field("afk_timeout"),
+        Field("system_channel", named),
+        Field("system_channel_flags", flags),
+        Field("rules_channel", named),
+        Field("public_updates_channel", named),
+        Field("verification_level"),
+        Field("explicit_content_filter"),
+        Field("default_notifications"),
+        Field("mfa_level"),
+        Field("nsfw_level"),
+        Field("preferred_locale"),
+        Field("vanity_url_code"),
+        Field("premium_tier"),
+        Field("premium_subscription_count"),
+        Field("features", count),
+    ),
+    discord.abc.GuildChannel: (
+        Field("name"),
+        Field("topic"),
+        Field("position"),
+        Field("category", named),
+        Field("nsfw"),
+        Field("slowmode_delay"),
+        Field("bitrate"),
+        Field("user_limit"),
+        Field("rtc_region"),
+        Field("video_quality_mode"),
+        Field("default_auto_archive_duration"),
+        Field("overwrites", count, _overwrites),
+    ),
+    discord.Member: (
+        Field("name"),
+        Field("global_name"),
+        Field("nick"),
+        Field("avatar", get=attrgetter("guild_avatar")),
+        Field("roles", count, attrgetter("_roles")),
+        Field("pending"),
+        Field("premium_since", relative),
+        Field("timed_out_until", relative),
+        Field("flags", flags),
+    ),
+    discord.Role: (
+        Field("name"),
+        Field("colour"),
+        Field("hoist"),
+        Field("mentionable"),
+        Field("position"),
+        Field("icon"),
+        Field("unicode_emoji"),
+        Field("managed"),
+    ),
+    discord.Message: (
+        Field("pinned"),
+        Field("flags", flags),
+        Field("attachments", count),
+        Field("components", count),
+        Field("mention_everyone"),
+        Field("role_mentions", count, attrgetter("raw_role_mentions")),
+    ),
+    discord.VoiceState: (
+        Field("channel", named),
+        Field("mute"),
+        Field("deaf"),
+        Field("self_mute"),
+        Field("self_deaf"),
+        Field("self_stream"),
+        Field("self_video"),
+        Field("suppress"),
+        Field("afk"),
+        Field("requested_to_speak_at", relative),
+    ),
+    discord.Thread: (
+        Field("name"),
+        Field("archived"),
+        Field("locked"),
+        Field("invitable"),
+        Field("slowmode_delay"),
+        Field("auto_archive_duration"),
+        Field("archive_timestamp", relative),
+        Field("applied_tags", count, attrgetter("_applied_tags")),
+        Field("flags", flags),
+    ),
+    discord.StageInstance: (
+        Field("topic"),
+        Field("discoverable_disabled"),
+        Field("scheduled_event_id"),
+    ),
+    discord.ScheduledEvent: (
+        Field("name"),
+        Field("description"),
+        Field("start_time", relative),
+        Field("end_time", relative),
+        Field("status"),
+        Field("location"),
+        Field("channel_id"),
+        Field("cover_image"),
+    ),
+}
+
+_resolved: dict[type, tuple[Field, ...]] = {}
+
+
+def fields_for(cls: type) -> tuple[Field, ...]:
+    """The tracked fields of ``cls``, looked up through its MRO once per class"""
+    try:
+        return _resolved[cls]
+    except KeyError:
+        fields = next((TRACKED[c] for c in cls.__mro__ if c in TRACKED), ())
+        _resolved[cls] = fields
+        return fields
+
+
+def changes(before: Any, after: Any) -> list[tuple[Field, Any, Any]]:
+    """Every tracked field that changed, as ``(field, before, after)`` raw values"""
+    changed = []
+    for field in fields_for(type(after)):
+        old, new = field.get(before), field.get(after)
+        if old != new:
+            changed.append((field, old, new))
+    return changed
+
+
+def formatted(changed: list[tuple[Any, Any, Any]]) -> Iterator[tuple[str, str, str]]:
+    """Yield ``(name, before, after)`` strings for the output of :func:`changes`"""
+    for field, old, new in changed:
+        yield field.name, field.format(old), field.format(new)
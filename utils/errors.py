@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import datetime
+import os
+import time
+import traceback
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+import discord
+
+if TYPE_CHECKING:
+    from main import Xanno
+
+
+class ErrorGroup:
+    """Every occurrence of one fingerprinted error"""
+
+    __slots__ = ("count", "pending", "first", "last")
+
+    def __init__(self, now: float) -> None:
+        self.count = 0
+        self.pending = 0
+        self.first = now
+        self.last = now
+
+
+class ErrorReporter:
+    """Reports listener errors to the error channel without flooding it.
+
+    Errors are fingerprinted by event, exception type and the frame that
+    raised. The first occurrence of a fingerprint is logged in full and
+    posted straight away, up to ``burst`` posts per ``interval``; every
+    other occurrence is only counted and posted in a periodic digest.
+    Tracebacks deeper than ``LARGE`` frames are formatted off the loop.
+    """
+
+    LARGE = 25
+    DIGEST_LINES = 25
+
+    def __init__(
+        self,
+        bot: Xanno,
+        channel_id: int,
+        interval: float = 300.0,
+        burst: int = 5,
+        capacity: int = 512,
+    ) -> None:
+        self.bot = bot
+        self.channel_id = channel_id
+        self.interval = interval
+        self.burst = burst
+        self.capacity = capacity
+        self.groups: OrderedDict[tuple[str, str, str], ErrorGroup] = OrderedDict()
+        self._posted = 0
+        self._task: asyncio.Task | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    @staticmethod
+    def inspect(error: BaseException) -> tuple[str, int]:
+        """The frame that raised ``error`` and the depth of its traceback"""
+        tb, depth = error.__traceback__, 0
+        while tb and tb.tb_next:
+            tb, depth = tb.tb_next, depth + 1
+        if tb is None:
+            return "?", 0
+        code = tb.tb_frame.f_code
+        return (
+            f"{code.co_name} ({os.path.basename(code.co_filename)}:{tb.tb_lineno})",
+            depth + 1,
+        )
+
+    def report(
+        self,
+        event_method: str,
+        error: BaseException | None,
+        args: tuple = (),
+        kwargs: dict[str, Any] | None = None,
+    ) -> None:
+        if error is None:
+            return
+        top, depth = self.inspect(error)
+        key = (str(event_method), type(error).__qualname__, top)
+        now = time.time()
+
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = ErrorGroup(now)
+            if len(self.groups) > self.capacity:
+                self.groups.popitem(last=False)
+
+            announce = self._posted < self.burst
+            if announce:
+                self._posted += 1
+            else:
+                group.pending += 1
+            task = asyncio.create_task(
+                self._post(key, error, depth, announce, args, kwargs or {}),
+                name=f"xanno: error report {event_method}",
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            group.pending += 1
+            self.groups.move_to_end(key)
+
+        group.count += 1
+        group.last = now
+
+    @staticmethod
+    def format(error: BaseException) -> tuple[str, str]:
+        """The full traceback for the log and a trimmed one for the channel"""
+        exception = traceback.TracebackException.from_exception(error)
+        private = "".join(exception.format())
+        exception.stack = traceback.StackSummary.from_list(exception.stack[:2])
+        public = (
+            "".join(exception.format())
+            .replace(os.getcwd(), "CWD")
+            .replace("CWD/venv/lib/python3.10/site-packages/discord", "discord")
+        )
+        return private, public
+
+    async def _post(
+        self,
+        key: tuple[str, str, str],
+        error: BaseException,
+        depth: int,
+        announce: bool,
+        args: tuple,
+        kwargs: dict[str, Any],
+    ) -> None:
+        if depth > self.LARGE:
+            private, public = await asyncio.to_thread(self.format, error)
+        else:
+            private, public = self.format(error)
+        self.bot.logger.error(
+            private
+            + f"{', '.join([str(a) for a in args])} —— {', '.join(list(kwargs))}"
+        )
+        if not announce:
+            return
+
+        embed = discord.Embed(
+            colour=self.bot.colour,
+            title="An unknown error occurred",
+            description=f"`FUNC:` {key[0]}\n```ansi\n\u001b[31m"
+            + public[-3800:]
+            + "\n```",
+            timestamp=datetime.datetime.now(),
+        )
+        await self._send(embed)
+
+    async def _send(self, embed: discord.Embed) -> None:
+        channel = self.bot.get_channel(self.channel_id)
+        if channel is None:
+            return
+        try:
+            await channel.send(embed=embed)
+        except discord.HTTPException as e:
+            self.bot.logger.warning(f"Could not post an error report: {e}")
+
+    async def digest(self) -> None:
+        """Post the occurrences counted since the last digest"""
+        self._posted = 0
+        lines = []
+        for (event_method, name, top), group in self.groups.items():
+            if group.pending:
+                lines.append(
+                    f"`{group.pending}×` `{event_method}` {name} in {top} "
+                    f"({group.count} total)"
+                )
+                group.pending = 0
+        if not lines:
+            return
+
+        self.bot.logger.warning("Repeated errors:\n" + "\n".join(lines))
+        if len(lines) > self.DIGEST_LINES:
+            more = len(lines) - self.DIGEST_LINES
+            lines = [*lines[: self.DIGEST_LINES], f"...and {more} more"]
+        embed = discord.Embed(
+            colour=self.bot.colour,
+            title="Repeated errors",
+            description="\n".join(lines),
+            timestamp=datetime.datetime.now(),
+        )
+        await self._send(embed)
+
+    async def _digests(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.digest()
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._digests(), name="xanno: error digest")
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.digest()
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import TYPE_CHECKING, Iterable
+
+import discord
+
+from utils.mappings import (
+    AUDIT_ACTIONS,
+    CALLBACK_INTENTS,
+    COMMAND_INTENTS,
+    LOGGING_CALLBACKS,
+    MEMBER_CACHE_CALLBACKS,
+    MESSAGE_CACHE_CALLBACKS,
+)
+
+if TYPE_CHECKING:
+    from utils.config import ConfigRepository
+
+# rough cached sizes, measured with tracemalloc on synthetic payloads
+MEMBER_BYTES = 800
+PRESENCE_BYTES = 600
+MESSAGE_BYTES = 900
+
+
+class CacheProfile:
+    """The intents and caches a Xanno process connects with"""
+
+    __slots__ = ("name", "intents", "member_cache_flags", "max_messages")
+
+    def __init__(
+        self,
+        name: str,
+        intents: discord.Intents,
+        member_cache_flags: discord.MemberCacheFlags | None = None,
+        max_messages: int | None = 1000,
+    ) -> None:
+        self.name = name
+        self.intents = intents
+        self.member_cache_flags = (
+            discord.MemberCacheFlags.from_intents(intents)
+            if member_cache_flags is None
+            else member_cache_flags
+        )
+        self.max_messages = max_messages
+
+    def covers(self, callback: str) -> bool:
+        """Whether ``callback`` can be dispatched under this profile"""
+        if not all(
+            getattr(self.intents, i) for i in CALLBACK_INTENTS.get(callback, ())
+        ):
+            return False
+        if callback in MEMBER_CACHE_CALLBACKS and not self.member_cache_flags.value:
+            return False
+        return callback not in MESSAGE_CACHE_CALLBACKS or bool(self.max_messages)
+
+    def estimate(self, members: int) -> int:
+        """Approximate bytes cached for ``members`` members across all guilds"""
+        size = (self.max_messages or 0) * MESSAGE_BYTES
+        if self.member_cache_flags.joined:
+            size += members * MEMBER_BYTES
+        if self.intents.presences:
+            size += members * PRESENCE_BYTES
+        return size
+
+    def __repr__(self) -> str:
+        enabled = ", ".join(name for name, on in self.intents if on)
+        return (
+            f"<CacheProfile {self.name} intents=[{enabled}] "
+            f"member_cache={self.member_cache_flags.value} "
+            f"max_messages={self.max_messages}>"
+        )
+
+
+def full() -> CacheProfile:
+    return CacheProfile("full", discord.Intents.all())
+
+
+def derive(
+    callbacks: Iterable[str], commands: bool = True, name: str = "auto"
+) -> CacheProfile:
+    """The smallest profile that still dispatches ``callbacks``"""
+    callbacks = set(callbacks)
+    intents = discord.Intents(guilds=True)
+    for callback in callbacks:
+        for intent in CALLBACK_INTENTS.get(callback, ()):
+            setattr(intents, intent, True)
+    # audit log entries name who performed these, see utils.audit
+    if callbacks & AUDIT_ACTIONS.keys():
+        intents.moderation = True
+    if commands:
+        for intent in COMMAND_INTENTS:
+            setattr(intents, intent, True)
+
+    flags = discord.MemberCacheFlags.none()
+    if callbacks & MEMBER_CACHE_CALLBACKS:
+        flags = discord.MemberCacheFlags.from_intents(intents)
+    max_messages = 1000 if callbacks & MESSAGE_CACHE_CALLBACKS else None
+    return CacheProfile(name, intents, flags, max_messages)
+
+
+def lean() -> CacheProfile:
+    """Commands and every default callback that needs no member or message cache"""
+    return derive(
+        (
+            c
+            for c, on in LOGGING_CALLBACKS.items()
+            if on and c not in MEMBER_CACHE_CALLBACKS | MESSAGE_CACHE_CALLBACKS
+        ),
+        name="lean",
+    )
+
+
+def from_env(repository: ConfigRepository) -> CacheProfile:
+    """The profile ``CACHE_PROFILE`` names, for a bot yet to be constructed
+
+    ``auto`` derives it from the configs in ``repository``, so it is read
+    before the bot's event loop starts.
+    """
+    name = os.getenv("CACHE_PROFILE", "full")
+    if name == "lean":
+        return lean()
+    if name != "auto":
+        return full()
+    configs = asyncio.run(repository.load_all())
+    return derive(
+        c
+        for config in configs.values()
+        if config.get("channel")
+        for c, on in config["callbacks"].items()
+        if on
+    )
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import atexit
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+
+DT_FMT = "%Y-%m-%d %H:%M:%S"
+# logger levels used unless LOG_LEVELS overrides them
+LEVELS = {"": "INFO", "xanno": "DEBUG", "discord": "INFO"}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record, for log shippers"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(
+                record.created, datetime.timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, separators=(",", ":"))
+
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler for a listener in the same process.
+
+    The stock handler formats and copies each record so it can be pickled,
+    all on the logging thread. Here only the message arguments, which may
+    change after the call, are rendered before the record is queued.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+def parse_levels(spec: str | None) -> dict[str, str]:
+    """``"discord=WARNING,xanno=DEBUG"`` merged over the default levels"""
+    levels = dict(LEVELS)
+    for item in filter(None, (spec or "").split(",")):
+        name, _, level = item.partition("=")
+        levels["" if name.strip() in ("root", "") else name.strip()] = level.strip()
+    return levels
+
+
+class QueuedLogging:
+    """Every log record goes through one queue to a background writer thread.
+
+    Loggers only pay for a ``put`` on the root logger's QueueHandler. The
+    listener thread formats and writes records to a size or time rotated
+    file and to stderr, so disk and console writes never block the loop.
+    """
+
+    def __init__(
+        self,
+        path: str = "log.LOG",
+        max_bytes: int = 10 * 1024 * 1024,
+        backups: int = 5,
+        when: str | None = None,
+        structured: bool = False,
+        levels: dict[str, str] | None = None,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.when = when
+        self.structured = structured
+        self.levels = LEVELS if levels is None else levels
+        self.queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        self.handler = LocalQueueHandler(self.queue)
+        self.listener: logging.handlers.QueueListener | None = None
+
+    @classmethod
+    def from_env(cls) -> QueuedLogging:
+        return cls(
+            path=os.getenv("LOG_FILE", "log.LOG"),
+            max_bytes=int(os.getenv("LOG_MAX_BYTES", 10 * 1024 * 1024)),
+            backups=int(os.getenv("LOG_BACKUPS", 5)),
+            when=os.getenv("LOG_ROTATE_WHEN"),
+            structured=os.getenv("LOG_FORMAT") == "json",
+            levels=parse_levels(os.getenv("LOG_LEVELS")),
+        )
+
+    def handlers(self) -> list[logging.Handler]:
+        if self.when:
+            file = logging.handlers.TimedRotatingFileHandler(
+                self.path, when=self.when, backupCount=self.backups, encoding="utf-8"
+            )
+        else:
+            file = logging.handlers.RotatingFileHandler(
+                self.path,
+                maxBytes=self.max_bytes,
+                backupCount=self.backups,
+                encoding="utf-8",
+            )
+        console = logging.StreamHandler()
+
+        text = logging.Formatter(
+            "[{asctime}] [{levelname:<8}] {name}: {message}", DT_FMT, style="{"
+        )
+        file.setFormatter(JSONFormatter() if self.structured else text)
+        console.setFormatter(text)
+        return [file, console]
+
+    def start(self) -> None:
+        root = logging.getLogger()
+        # a previous instance in this process, e.g. from an earlier bot
+        for handler in root.handlers[:]:
+            if isinstance(handler, LocalQueueHandler):
+                root.removeHandler(handler)
+                if getattr(handler, "owner", None):
+                    handler.owner.close()
+
+        for name, level in self.levels.items():
+            logging.getLogger(name or None).setLevel(level.upper())
+        self.handler.owner = self
+        root.addHandler(self.handler)
+        self.listener = logging.handlers.QueueListener(
+            self.queue, *self.handlers(), respect_handler_level=True
+        )
+        self.listener.start()
+        atexit.register(self.close)
+
+    def close(self) -> None:
+        """Flush every queued record, then close the files"""
+        atexit.unregister(self.close)
+        logging.getLogger().removeHandler(self.handler)
+        if self.listener:
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+            self.listener = None
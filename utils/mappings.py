@@ -51,3 +51,117 @@ LOGGING_CALLBACKS = {
     "on_thread_member_remove": False,
     "on_voice_state_update": False,
 }
+
+# Callback names that differ from the gateway event they log
+CALLBACK_EVENTS = {
+    "on_guild_integrat_update": "on_guild_integrations_update",
+    "on_sched_event_user_add": "on_scheduled_event_user_add",
+    "on_sched_event_user_remove": "on_scheduled_event_user_remove",
+}
+
+# Share of events kept once the logging queue is under pressure
+LOGGING_SHED_RATES = {
+    "on_message_edit": 0.1,
+    "on_reaction_add": 0.1,
+    "on_reaction_remove": 0.1,
+    "on_member_update": 0.25,
+    "on_voice_state_update": 0.25,
+    "on_guild_channel_update": 0.5,
+    "on_guild_role_update": 0.5,
+    "on_thread_member_join": 0.25,
+    "on_thread_member_remove": 0.25,
+    "on_sched_event_user_add": 0.25,
+    "on_sched_event_user_remove": 0.25,
+}
+
+# Seconds a burst of these callbacks is held and collapsed for, per target
+LOGGING_COLLAPSE_WINDOWS = {
+    "on_reaction_add": 10.0,
+    "on_reaction_remove": 10.0,
+    "on_member_update": 5.0,
+    "on_guild_channel_update": 3.0,
+    "on_guild_role_update": 3.0,
+}
+
+# Gateway intents each logging callback needs to be dispatched at all
+CALLBACK_INTENTS = {
+    "on_automod_rule_create": ("auto_moderation_configuration",),
+    "on_automod_rule_update": ("auto_moderation_configuration",),
+    "on_automod_rule_delete": ("auto_moderation_configuration",),
+    "on_automod_action": ("auto_moderation_execution",),
+    "on_guild_emojis_update": ("emojis_and_stickers",),
+    "on_guild_stickers_update": ("emojis_and_stickers",),
+    "on_invite_create": ("invites",),
+    "on_invite_delete": ("invites",),
+    "on_integration_create": ("integrations",),
+    "on_integration_update": ("integrations",),
+    "on_guild_integrat_update": ("integrations",),
+    "on_webhooks_update": ("webhooks",),
+    "on_member_join": ("members",),
+    "on_member_remove": ("members",),
+    "on_member_update": ("members",),
+    "on_member_ban": ("moderation",),
+    "on_member_unban": ("moderation",),
+    "on_message_edit": ("guild_messages", "message_content"),
+    "on_message_delete": ("guild_messages", "message_content"),
+    "on_bulk_message_delete": ("guild_messages", "message_content"),
+    "on_reaction_add": ("guild_reactions",),
+    "on_reaction_remove": ("guild_reactions",),
+    "on_reaction_clear": ("guild_reactions",),
+    "on_reaction_clear_emoji": ("guild_reactions",),
+    "on_scheduled_event_create": ("guild_scheduled_events",),
+    "on_scheduled_event_delete": ("guild_scheduled_events",),
+    "on_scheduled_event_update": ("guild_scheduled_events",),
+    "on_sched_event_user_add": ("guild_scheduled_events", "members"),
+    "on_sched_event_user_remove": ("guild_scheduled_events", "members"),
+    "on_thread_member_join": ("members",),
+    "on_thread_member_remove": ("members",),
+    "on_voice_state_update": ("voice_states",),
+}
+
+# Callbacks discord.py only dispatches for members or messages it has cached
+MEMBER_CACHE_CALLBACKS = frozenset(
+    {
+        "on_member_remove",
+        "on_member_update",
+        "on_sched_event_user_add",
+        "on_sched_event_user_remove",
+    }
+)
+MESSAGE_CACHE_CALLBACKS = frozenset(
+    {
+        "on_message_edit",
+        "on_message_delete",
+        "on_bulk_message_delete",
+        "on_reaction_add",
+        "on_reaction_remove",
+        "on_reaction_clear",
+        "on_reaction_clear_emoji",
+    }
+)
+
+# Intents prefix commands need to see invocations and their content
+COMMAND_INTENTS = ("guild_messages", "dm_messages", "message_content")
+
+# Audit log actions whose entry names the actor behind a callback, keyed by the
+# callback and looked up by the record's target. AUDIT_OPTIONAL callbacks often
+# have no entry at all (a member leaving, editing their own profile), so they
+# only use an entry that has already arrived instead of waiting for one.
+AUDIT_ACTIONS = {
+    "on_guild_channel_create": ("channel_create",),
+    "on_guild_channel_delete": ("channel_delete",),
+    "on_guild_channel_update": (
+        "channel_update",
+        "overwrite_create",
+        "overwrite_update",
+        "overwrite_delete",
+    ),
+    "on_guild_role_create": ("role_create",),
+    "on_guild_role_delete": ("role_delete",),
+    "on_guild_role_update": ("role_update",),
+    "on_member_ban": ("ban",),
+    "on_member_unban": ("unban",),
+    "on_member_remove": ("kick",),
+    "on_member_update": ("member_update", "member_role_update"),
+}
+AUDIT_OPTIONAL = frozenset({"on_member_remove", "on_member_update"})
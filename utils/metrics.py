@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import logging
+import math
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Callable
+
+import discord
+from discord import app_commands
+
+if TYPE_CHECKING:
+    from discord.http import HTTPClient
+
+
+class Histogram:
+    """Log-bucketed latency histogram, in the spirit of HDR histograms.
+
+    Each power of two is split into ``SUB`` buckets, so a recorded value is
+    only ever off by ~19% and memory stays constant however long it runs.
+    """
+
+    SUB = 4
+    FLOOR = 1e-6
+
+    __slots__ = ("buckets", "count", "sum", "max")
+
+    def __init__(self) -> None:
+        self.buckets: Counter[int] = Counter()
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    @classmethod
+    def bucket(cls, value: float) -> int:
+        return math.ceil(math.log2(max(value, cls.FLOOR)) * cls.SUB)
+
+    @classmethod
+    def bound(cls, bucket: int) -> float:
+        return 2 ** (bucket / cls.SUB)
+
+    def record(self, value: float) -> None:
+        self.buckets[self.bucket(value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, p: float) -> float:
+        if not self.count:
+            return 0.0
+        rank, seen = p * self.count, 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self.bound(bucket), self.max)
+        return self.max
+
+
+class Stat:
+    """Wall time, REST calls and exceptions of one listener or command"""
+
+    __slots__ = ("histogram", "errors", "rest")
+
+    def __init__(self) -> None:
+        self.histogram = Histogram()
+        self.errors = 0
+        self.rest = 0
+
+
+_current: ContextVar[Stat | None] = ContextVar("xanno_stat", default=None)
+
+
+class Timer:
+    __slots__ = ("stat", "started", "token")
+
+    def __init__(self, stat: Stat) -> None:
+        self.stat = stat
+
+    def __enter__(self) -> Timer:
+        self.started = time.perf_counter()
+        self.token = _current.set(self.stat)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stat.histogram.record(time.perf_counter() - self.started)
+        if exc_type is not None and not issubclass(exc_type, asyncio.CancelledError):
+            self.stat.errors += 1
+        _current.reset(self.token)
+
+
+class RateLimitCounter(logging.Handler):
+    """Counts the 429 warnings discord.py logs on ``discord.http``"""
+
+    def __init__(self) -> None:
+        super().__init__(logging.WARNING)
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        message = str(record.msg).lower()
+        if "429" in message or "rate limit" in message:
+            self.count += 1
+
+
+class Metrics:
+    """In-process timings for listeners, commands and hot helpers.
+
+    Stats are keyed by name (``listener:Events._logging_on_member_update``,
+    ``command:ban``, ``enrich:on_automod_action``, ``log.flush``...). REST
+    requests made while a timer is active are counted against it, and per
+    route in ``routes``. Logging listeners only queue records, so their REST
+    calls show up under the ``enrich:`` and ``log.flush`` stats of the
+    pipeline workers and batcher that make them. Event loop lag is sampled
+    every ``tick`` seconds once started.
+    """
+
+    def __init__(self, tick: float = 0.5) -> None:
+        self.stats: dict[str, Stat] = {}
+        self.routes: Counter[str] = Counter()
+        self.ratelimits = RateLimitCounter()
+        self.tick = tick
+        self.loop_lag = 0.0
+        self._tasks: list[asyncio.Task] = []
+
+    def stat(self, name: str) -> Stat:
+        stat = self.stats.get(name)
+        if stat is None:
+            stat = self.stats[name] = Stat()
+        return stat
+
+    def timer(self, name: str) -> Timer:
+        return Timer(self.stat(name))
+
+    def observe(self, name: str, seconds: float, error: bool = False) -> None:
+        stat = self.stat(name)
+        stat.histogram.record(seconds)
+        if error:
+            stat.errors += 1
+
+    def install(self, http: HTTPClient) -> None:
+        """Count every REST request the client makes"""
+        request = http.request
+
+        async def counted(route, **kwargs) -> Any:
+            self.routes[f"{route.method} {route.path}"] += 1
+            stat = _current.get()
+            if stat is not None:
+                stat.rest += 1
+            return await request(route, **kwargs)
+
+        http.request = counted
+        logging.getLogger("discord.http").addHandler(self.ratelimits)
+
+    def top(self, limit: int = 15) -> list[tuple[str, Stat]]:
+        """The stats that took the most wall time in total"""
+        return sorted(
+            self.stats.items(), key=lambda i: i[1].histogram.sum, reverse=True
+        )[:limit]
+
+    def prometheus(self) -> str:
+        """All stats in the Prometheus text exposition format"""
+        lines = [
+            "# HELP xanno_duration_seconds Wall time of listeners and commands",
+            "# TYPE xanno_duration_seconds histogram",
+        ]
+        for name, stat in self.stats.items():
+            h, seen = stat.histogram, 0
+            for bucket in sorted(h.buckets):
+                seen += h.buckets[bucket]
+                lines.append(
+                    f'xanno_duration_seconds_bucket{{name="{name}",'
+                    f'le="{h.bound(bucket):.6g}"}} {seen}'
+                )
+            lines.append(
+                f'xanno_duration_seconds_bucket{{name="{name}",le="+Inf"}} {h.count}'
+            )
+            lines.append(f'xanno_duration_seconds_sum{{name="{name}"}} {h.sum:.6f}')
+            lines.append(f'xanno_duration_seconds_count{{name="{name}"}} {h.count}')
+
+        lines += [
+            "# HELP xanno_errors_total Exceptions raised by listeners and commands",
+            "# TYPE xanno_errors_total counter",
+            *(
+                f'xanno_errors_total{{name="{n}"}} {s.errors}'
+                for n, s in self.stats.items()
+            ),
+            "# HELP xanno_rest_calls_total REST requests made while each timer ran",
+            "# TYPE xanno_rest_calls_total counter",
+            *(
+                f'xanno_rest_calls_total{{name="{n}"}} {s.rest}'
+                for n, s in self.stats.items()
+            ),
+            "# HELP xanno_rest_ratelimits_total 429 responses from Discord",
+            "# TYPE xanno_rest_ratelimits_total counter",
+            f"xanno_rest_ratelimits_total {self.ratelimits.count}",
+            "# HELP xanno_loop_lag_seconds Last measured event loop lag",
+            "# TYPE xanno_loop_lag_seconds gauge",
+            f"xanno_loop_lag_seconds {self.loop_lag:.6f}",
+            "# HELP xanno_rest_requests_total REST requests per route",
+            "# TYPE xanno_rest_requests_total counter",
+            *(
+                f'xanno_rest_requests_total{{route="{r}"}} {c}'
+                for r, c in self.routes.items()
+            ),
+        ]
+        return "\n".join(lines) + "\n"
+
+    async def _lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.tick
+            await asyncio.sleep(self.tick)
+            self.loop_lag = max(loop.time() - expected, 0.0)
+            self.observe("loop.lag", self.loop_lag)
+
+    async def _dump(self, path: str, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await asyncio.to_thread(_write, path, self.prometheus())
+
+    def start(self, dump: str | None = None, interval: float = 15.0) -> None:
+        """Sample loop lag, and rewrite ``dump`` with :meth:`prometheus` if set"""
+        self._tasks.append(asyncio.create_task(self._lag(), name="xanno: loop lag"))
+        if dump:
+            self._tasks.append(
+                asyncio.create_task(
+                    self._dump(dump, interval), name="xanno: metrics dump"
+                )
+            )
+
+    def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        logging.getLogger("discord.http").removeHandler(self.ratelimits)
+
+
+def _write(path: str, text: str) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as fp:
+        fp.write(text)
+    os.replace(tmp, path)
+
+
+def _qualified_name(data: dict) -> str:
+    # subcommand groups and subcommands arrive as nested leading options
+    names, options = [data["name"]], data.get("options", [])
+    while options and options[0]["type"] in (1, 2):
+        names.append(options[0]["name"])
+        options = options[0].get("options", [])
+    return " ".join(names)
+
+
+class TimedCommandTree(app_commands.CommandTree):
+    """A command tree timing every application command into ``bot.metrics``.
+
+    Slash commands, context menus and the slash side of hybrid commands never
+    go through ``Bot.invoke``, so they are timed here under the same
+    ``command:<qualified name>`` stats as prefix commands.
+    """
+
+    async def _call(self, interaction: discord.Interaction) -> None:
+        if interaction.type is not discord.InteractionType.application_command:
+            return await super()._call(interaction)
+        name = f"command:{_qualified_name(interaction.data)}"
+        with self.client.metrics.timer(name) as timer:
+            await super()._call(interaction)
+        if interaction.command_failed:
+            timer.stat.errors += 1
+
+
+def timed(name: str):
+    """Time a method of an object with a ``bot`` into ``bot.metrics``"""
+
+    def decorator(func: Callable):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def wrapper(self, *args, **kwargs):
+                with self.bot.metrics.timer(name):
+                    return await func(self, *args, **kwargs)
+
+        else:
+
+            @functools.wraps(func)
+            def wrapper(self, *args, **kwargs):
+                with self.bot.metrics.timer(name):
+                    return func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections import Counter, deque
+from typing import TYPE_CHECKING, Any, Iterable
+
+from utils.mappings import LOGGING_SHED_RATES
+from utils.renderers import ENRICHERS
+
+if TYPE_CHECKING:
+    from main import Xanno
+
+
+class LogRecord:
+    """A structured logging event, only rendered into an embed when it is sent.
+
+    ``fields`` holds the plain values the renderer for ``kind`` needs, so a
+    record that is shed, collapsed or batched never builds an embed.
+    """
+
+    __slots__ = ("kind", "guild_id", "channel_id", "target_id", "fields", "created")
+
+    def __init__(
+        self,
+        kind: str,
+        guild_id: int,
+        channel_id: int,
+        target_id: int | None = None,
+        **fields: Any,
+    ) -> None:
+        self.kind = kind
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.target_id = target_id
+        self.fields = fields
+        self.created = time.time()
+
+    def __repr__(self) -> str:
+        return (
+            f"<LogRecord kind={self.kind} guild_id={self.guild_id} "
+            f"target_id={self.target_id}>"
+        )
+
+
+class LogPipeline:
+    """Bounded queue between logging listeners and a fixed pool of workers.
+
+    Listeners only submit records. Workers run any async enrichment the
+    record's kind needs and hand it to the batcher. Once the queue is
+    ``shed_at`` full, records for noisy callbacks are kept at their rate in
+    ``LOGGING_SHED_RATES``, and a full queue drops every new record.
+    """
+
+    def __init__(
+        self,
+        bot: Xanno,
+        workers: int = 4,
+        maxsize: int = 2000,
+        shed_at: float = 0.75,
+        rates: dict[str, float] | None = None,
+        name: str = "log worker",
+    ) -> None:
+        self.bot = bot
+        self.workers = workers
+        self.name = name
+        self.queue: asyncio.Queue[LogRecord] = asyncio.Queue(maxsize)
+        self.shed_depth = int(maxsize * shed_at)
+        self.rates = LOGGING_SHED_RATES if rates is None else rates
+        self.processed = 0
+        self.dropped: Counter[str] = Counter()
+        self.latencies: deque[float] = deque(maxlen=1024)
+        self._tasks: list[asyncio.Task] = []
+
+    def submit(self, record: LogRecord) -> bool:
+        if self.queue.qsize() >= self.shed_depth and random.random() >= self.rates.get(
+            record.kind, 1.0
+        ):
+            self.dropped[record.kind] += 1
+            return False
+        try:
+            self.queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self.dropped[record.kind] += 1
+            return False
+        return True
+
+    async def _work(self) -> None:
+        while True:
+            record = await self.queue.get()
+            try:
+                enrich, taken = ENRICHERS.get(record.kind), False
+                if enrich:
+                    # timed here so the REST calls enrichers make are counted
+                    with self.bot.metrics.timer(f"enrich:{record.kind}"):
+                        taken = await enrich(self.bot, record)
+                if not taken:
+                    self.bot.log_batcher.enqueue(record)
+            except Exception:
+                await self.bot.on_error(record.kind, record)
+            finally:
+                self.processed += 1
+                self.latencies.append(time.time() - record.created)
+                self.queue.task_done()
+
+    def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"xanno: {self.name} {i}")
+            for i in range(self.workers)
+        ]
+
+    async def join(self) -> None:
+        await self.queue.join()
+
+    async def close(self, timeout: float = 5.0) -> None:
+        try:
+            await asyncio.wait_for(self.join(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        for task in self._tasks:
+            task.cancel()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "depth": self.queue.qsize(),
+            "maxsize": self.queue.maxsize,
+            "workers": self.workers,
+            "processed": self.processed,
+            "dropped": dict(self.dropped),
+            "latency_p50_ms": _percentile(self.latencies, 0.5),
+            "latency_p99_ms": _percentile(self.latencies, 0.99),
+        }
+
+
+class ShardedPipeline:
+    """One :class:`LogPipeline` per gateway shard.
+
+    Records are routed by the shard their guild lives on, so an event storm
+    on one shard fills and sheds that shard's queue while the others keep
+    their own workers. Pipelines are created on a shard's first record, as
+    the shard count is only known once the bot has connected. Records
+    submitted before then (from setup_hook, or replays during connect) are
+    held, up to ``maxsize``, and routed by :meth:`release` once it is.
+    """
+
+    def __init__(self, bot: Xanno, **options: Any) -> None:
+        self.bot = bot
+        self.options = options
+        self.pipelines: dict[int, LogPipeline] = {}
+        self.held: list[LogRecord] = []
+        self.dropped: Counter[str] = Counter()
+        self._started = False
+
+    def shard(self, guild_id: int) -> int:
+        return (guild_id >> 22) % self.bot.shard_count
+
+    def pipeline(self, shard_id: int) -> LogPipeline:
+        pipeline = self.pipelines.get(shard_id)
+        if pipeline is None:
+            pipeline = self.pipelines[shard_id] = LogPipeline(
+                self.bot, name=f"shard {shard_id} log worker", **self.options
+            )
+            if self._started:
+                pipeline.start()
+        return pipeline
+
+    def submit(self, record: LogRecord) -> bool:
+        if self.bot.shard_count is None:
+            if len(self.held) >= self.options.get("maxsize", 2000):
+                self.dropped[record.kind] += 1
+                return False
+            self.held.append(record)
+            return True
+        if self.held:
+            self.release()
+        return self.pipeline(self.shard(record.guild_id)).submit(record)
+
+    def release(self) -> None:
+        """Route the records held while the shard count was unknown"""
+        if self.bot.shard_count is None:
+            return
+        held, self.held = self.held, []
+        for record in held:
+            self.pipeline(self.shard(record.guild_id)).submit(record)
+
+    def start(self) -> None:
+        self._started = True
+        for pipeline in self.pipelines.values():
+            pipeline.start()
+
+    async def join(self) -> None:
+        await asyncio.gather(*(p.join() for p in self.pipelines.values()))
+
+    async def close(self, timeout: float = 5.0) -> None:
+        await asyncio.gather(*(p.close(timeout) for p in self.pipelines.values()))
+
+    def stats(self) -> dict[str, Any]:
+        shards = {i: p.stats() for i, p in sorted(self.pipelines.items())}
+        latencies = [t for p in self.pipelines.values() for t in p.latencies]
+        dropped = self.dropped.copy()
+        for pipeline in self.pipelines.values():
+            dropped.update(pipeline.dropped)
+        return {
+            "depth": len(self.held) + sum(s["depth"] for s in shards.values()),
+            "maxsize": sum(s["maxsize"] for s in shards.values()),
+            "workers": sum(s["workers"] for s in shards.values()),
+            "processed": sum(s["processed"] for s in shards.values()),
+            "dropped": dict(dropped),
+            "latency_p50_ms": _percentile(latencies, 0.5),
+            "latency_p99_ms": _percentile(latencies, 0.99),
+            "shards": shards,
+        }
+
+
+def _percentile(latencies: Iterable[float], p: float) -> float:
+    latencies = sorted(latencies)
+    if not latencies:
+        return 0.0
+    return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
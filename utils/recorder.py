@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+if TYPE_CHECKING:
+    from main import Xanno
+
+# dropped outright, they authenticate something
+SECRET_KEYS = frozenset(
+    {"token", "session_id", "resume_gateway_url", "email", "phone", "mfa_enabled"}
+)
+# replaced by a stable pseudonym, so the same user still looks the same
+NAME_KEYS = frozenset({"username", "global_name", "nick", "display_name"})
+# replaced by placeholder text of the same length
+TEXT_KEYS = frozenset({"content", "bio", "description"})
+# free text and links anywhere inside an embed: title, description, field
+# name and value, footer and author text, image and thumbnail URLs
+EMBED_TEXT_KEYS = frozenset({"title", "description", "name", "value", "text"})
+URL_KEYS = frozenset({"url", "proxy_url", "icon_url", "proxy_icon_url"})
+ATTACHMENT_TEXT_KEYS = frozenset({"title", "description"})
+SCRUBBED_URL = "https://scrubbed.invalid/"
+
+
+def _nested(value: Any, scrub_one: Callable[[dict], dict]) -> Any:
+    # embeds and attachments arrive as lists, or as dicts keyed by ID in
+    # interaction data
+    if isinstance(value, list):
+        return [scrub_one(v) if isinstance(v, dict) else v for v in value]
+    if isinstance(value, dict):
+        return {k: scrub_one(v) if isinstance(v, dict) else v for k, v in value.items()}
+    return value
+
+
+def _embed(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_embed(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    scrubbed = {}
+    for key, item in value.items():
+        if key in EMBED_TEXT_KEYS and isinstance(item, str):
+            scrubbed[key] = "x" * len(item)
+        elif key in URL_KEYS and isinstance(item, str):
+            scrubbed[key] = SCRUBBED_URL
+        else:
+            scrubbed[key] = _embed(item)
+    return scrubbed
+
+
+def _attachment(value: dict) -> dict:
+    scrubbed = {}
+    for key, item in value.items():
+        if key == "filename" and isinstance(item, str):
+            # keep the extension, content type checks still see a real one
+            stem, dot, extension = item.rpartition(".")
+            scrubbed[key] = (
+                "x" * len(stem) + dot + extension if dot else "x" * len(item)
+            )
+        elif key in ATTACHMENT_TEXT_KEYS and isinstance(item, str):
+            scrubbed[key] = "x" * len(item)
+        elif key in URL_KEYS and isinstance(item, str):
+            scrubbed[key] = SCRUBBED_URL
+        else:
+            scrubbed[key] = scrub(item)
+    return scrubbed
+
+
+def scrub(value: Any) -> Any:
+    """A copy of a gateway payload with secrets and personal data removed"""
+    if isinstance(value, dict):
+        scrubbed = {}
+        for key, item in value.items():
+            if key in SECRET_KEYS:
+                continue
+            if key == "embeds":
+                scrubbed[key] = _nested(item, _embed)
+            elif key == "attachments":
+                scrubbed[key] = _nested(item, _attachment)
+            elif key in NAME_KEYS and isinstance(item, str):
+                digest = hashlib.blake2s(item.encode(), digest_size=4).hexdigest()
+                scrubbed[key] = f"{key}-{digest}"
+            elif key in TEXT_KEYS and isinstance(item, str):
+                scrubbed[key] = "x" * len(item)
+            else:
+                scrubbed[key] = scrub(item)
+        return scrubbed
+    if isinstance(value, list):
+        return [scrub(item) for item in value]
+    return value
+
+
+class GatewayRecorder:
+    """Records every gateway dispatch to gzip-compressed JSON lines.
+
+    The bot's parsers are wrapped so each payload is serialised on the loop
+    (a C-speed ``json.dumps`` snapshot, as parsers may mutate it) and handed
+    to a writer thread that scrubs, compresses and writes it. A file is
+    rotated to ``path.1``...``path.{backups}`` once ``max_bytes`` of JSON
+    have been written to it.
+    """
+
+    def __init__(
+        self,
+        bot: Xanno,
+        path: str = "gateway.jsonl.gz",
+        max_bytes: int = 64 * 1024 * 1024,
+        backups: int = 5,
+    ) -> None:
+        self.bot = bot
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.recorded = 0
+        self._queue: queue.SimpleQueue[
+            tuple[float, str, str] | None
+        ] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._started = time.monotonic()
+
+    def install(self) -> None:
+        parsers = self.bot._connection.parsers
+        for event, parser in list(parsers.items()):
+            parsers[event] = self._wrap(parser, event)
+        self._thread = threading.Thread(
+            target=self._write, name="xanno-recorder", daemon=True
+        )
+        self._thread.start()
+
+    def _wrap(self, parser: Callable[[dict], None], event: str):
+        def parse(data: dict) -> None:
+            self._queue.put((time.monotonic() - self._started, event, json.dumps(data)))
+            self.recorded += 1
+            parser(data)
+
+        return parse
+
+    def _rotate(self) -> None:
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if os.path.exists(self.path):
+            os.replace(self.path, f"{self.path}.1")
+
+    def _write(self) -> None:
+        fp, written = gzip.open(self.path, "at"), 0
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                t, event, raw = item
+                line = json.dumps(
+                    {"t": round(t, 4), "op": event, "d": scrub(json.loads(raw))},
+                    separators=(",", ":"),
+                )
+                fp.write(line + "\n")
+                written += len(line) + 1
+                if written >= self.max_bytes:
+                    fp.close()
+                    self._rotate()
+                    fp, written = gzip.open(self.path, "at"), 0
+        finally:
+            fp.close()
+
+    def close(self) -> None:
+        if self._thread:
+            self._queue.put(None)
+            self._thread.join(timeout=10)
+
+
+def read_recording(path: str) -> Iterator[tuple[float, str, dict]]:
+    """Yield ``(seconds since start, event, payload)`` from a recording"""
+    with gzip.open(path, "rt") as fp:
+        for line in fp:
+            entry = json.loads(line)
+            yield entry["t"], entry["op"], entry["d"]
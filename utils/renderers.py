@@ -0,0 +1,652 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import datetime
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+import discord
+
+from utils.diff import formatted
+from utils.mappings import AUDIT_ACTIONS
+
+if TYPE_CHECKING:
+    from main import Xanno
+    from utils.pipeline import LogRecord
+
+RENDERERS: dict[str, Callable[[Xanno, LogRecord], discord.Embed]] = {}
+SUMMARIES: dict[str, Callable[[Xanno, LogRecord], discord.Embed]] = {}
+ENRICHERS: dict[str, Callable[[Xanno, LogRecord], Awaitable[bool | None]]] = {}
+
+
+def renderer(*kinds: str):
+    def decorator(func: Callable[[Xanno, LogRecord], discord.Embed]):
+        for kind in kinds:
+            RENDERERS[kind] = func
+        return func
+
+    return decorator
+
+
+def summary(*kinds: str):
+    """Register the renderer for records collapsed from a burst of ``kinds``"""
+
+    def decorator(func: Callable[[Xanno, LogRecord], discord.Embed]):
+        for kind in kinds:
+            SUMMARIES[kind] = func
+        return func
+
+    return decorator
+
+
+def enricher(*kinds: str):
+    """Register async work a pipeline worker runs on a record before batching.
+
+    An enricher returning True has taken the record over, and hands it to
+    the batcher itself later.
+    """
+
+    def decorator(func: Callable[[Xanno, LogRecord], Awaitable[bool | None]]):
+        for kind in kinds:
+            ENRICHERS[kind] = func
+        return func
+
+    return decorator
+
+
+def render(bot: Xanno, record: LogRecord) -> discord.Embed:
+    if "records" in record.fields:
+        return SUMMARIES.get(record.kind, collapsed)(bot, record)
+    return RENDERERS[record.kind](bot, record)
+
+
+def collapsed(bot: Xanno, record: LogRecord) -> discord.Embed:
+    records = record.fields["records"]
+    return RENDERERS[record.kind](bot, records[-1]).set_footer(
+        text=f"{len(records) - 1} similar events collapsed"
+    )
+
+
+def _embed(
+    bot: Xanno,
+    record: LogRecord,
+    title: str,
+    description: str = "",
+    thumbnail: str | None = None,
+) -> discord.Embed:
+    if thumbnail is None:
+        # the guild may have no icon, or have left the cache since it was queued
+        guild = bot.get_guild(record.guild_id)
+        thumbnail = guild.icon.url if guild and guild.icon else None
+    return discord.Embed(
+        colour=bot.colour,
+        title=title,
+        description="\n".join(filter(None, (description, _actor(record)))),
+        timestamp=datetime.datetime.fromtimestamp(record.created),
+    ).set_thumbnail(url=thumbnail)
+
+
+def _actor(record: LogRecord) -> str:
+    f = record.fields
+    if not f.get("actor_id"):
+        return ""
+    return f"`BY:` <@{f['actor_id']}>" + (
+        f"\n`AUDIT REASON:` {f['audit_reason']}" if f.get("audit_reason") else ""
+    )
+
+
+def _dt(value: datetime.datetime | None) -> str:
+    return discord.utils.format_dt(value, "R") if value else "NaN"
+
+
+def _avatar(value: Any) -> str | None:
+    return value.url if value else None
+
+
+def _jump(record: LogRecord, channel_id: int, message_id: int | None = None) -> str:
+    url = f"https://discord.com/channels/{record.guild_id}/{channel_id}"
+    return f"{url}/{message_id}" if message_id else url
+
+
+def _listed(lines: list[str], limit: int = 20) -> str:
+    if len(lines) > limit:
+        lines = [*lines[:limit], f"...and {len(lines) - limit} more"]
+    return "\n".join(lines)
+
+
+def _changes(record: LogRecord, *lines: str) -> str:
+    return "\n".join(
+        [
+            *lines,
+            *(
+                f"`{name.upper()}:` {old} → {new}"
+                for name, old, new in formatted(record.fields["changes"])
+            ),
+        ]
+    )
+
+
+@enricher(*AUDIT_ACTIONS)
+async def audit_actor(bot: Xanno, record: LogRecord) -> bool:
+    if record.target_id is None or "records" in record.fields:
+        return False
+    return bot.audit_log.attach(record)
+
+
+AUTOMOD_RULE = {
+    "on_automod_rule_create": "created",
+    "on_automod_rule_update": "updated",
+    "on_automod_rule_delete": "deleted",
+}
+
+
+@renderer(*AUTOMOD_RULE)
+def automod_rule(bot: Xanno, record: LogRecord) -> discord.Embed:
+    f = record.fields
+    guild = bot.get_guild(record.guild_id)
+    creator = guild and guild.get_member(f["creator_id"])
+    return _embed(
+        bot,
+        record,
+        f"An automod rule was {AUTOMOD_RULE[record.kind]}",
+        f"`NAME:` {f['name']}\n"
+        f"`ID:` {record.target_id}\n"
+        f"`CREATOR:` <@{f['creator_id']}>\n"
+        f"`TYPE:` {str(f['type']).split('.')[-1]}\n"
+        f"`PRESETS:` {'Yes' if f['presets'] else 'No'}\n"
+        f"`FILTERED:` {f['filtered']}\n"
+        f"`ALLOWED:` {f['allowed']}\n"
+        f"`EXEMPT ROLES:` {f['exempt_roles']}\n"
+        f"`EXEMPT CHANS:` {f['exempt_channels']}\n"
+        f"`ACTIONS:` {', '.join([str(a).split('.')[-1] for a in f['actions']])}",
+        thumbnail=creator.display_avatar.url if creator else None,
+    )
+
+
+@enricher("on_automod_action")
+async def automod_action_rule(bot: Xanno, record: LogRecord) -> None:
+    guild = bot.get_guild(record.guild_id)
+    rule = await guild.fetch_automod_rule(record.fields["rule_id"])
+    record.fields["rule"] = rule.name
+
+
+@renderer("on_automod_action")
+def automod_action(bot: Xanno, record: LogRecord) -> discord.Embed:
+    f = record.fields
+    user = bot.get_user(record.target_id)
+    asterisk = "*\u200b"
+    keyword = f["keyword"]
+    return _embed(
+        bot,
+        record,
+        f"An automod rule was triggered by a message",
+        f"`RULE:` {f['rule']}\n"
+        f"`USER:` <@{record.target_id}>\n"
+        f"`MATCH:` {keyword[0] + asterisk * (len(keyword) - 1) if keyword else 'NaN'}",
+        thumbnail=user.display_avatar.url if user else None,
+    )
+
+
+def _channel_lines(record: LogRecord) -> str:
+    f = record.fields
+    return (
+        f"`NAME:` {f['name']}\n"
+        f"`CREATED:` {_dt(f['created'])}\n"
+        f"`CATEGORY:` {f['category']}\n"
+        f"`TYPE:` {f['type']}\n"
+        f"`POSITION:` {f['position']}"
+    )
+
+
+GUILD_CHANNEL = {
+    "on_guild_channel_create": "created",
+    "on_guild_channel_delete": "deleted",
+}
+
+
+@renderer(*GUILD_CHANNEL)
+def guild_channel(bot: Xanno, record: LogRecord) -> discord.Embed:
+    return _embed(
+        bot,
+        record,
+        f"A guild channel was {GUILD_CHANNEL[record.kind]}",
+        _channel_lines(record),
+    )
+
+
+@renderer("on_guild_channel_update")
+def guild_channel_update(bot: Xanno, record: LogRecord) -> discord.Embed:
+    description = _changes(record)
+    if not description:
+        description = "Existing role overwrites were modified by an administrator"
+    return _embed(bot, record, f"#{record.fields['name']} was updated", description)
+
+
+REPOSITIONED = {
+    "on_guild_channel_update": ("channels", "#{}"),
+    "on_guild_role_update": ("roles", "'{}'"),
+}
+
+
+@summary(*REPOSITIONED)
+def repositioned(bot: Xanno, record: LogRecord) -> discord.Embed:
+    records = record.fields["records"]
+    noun, label = REPOSITIONED[record.kind]
+    lines = [
+        f"`{label.format(r.fields['name'])}:` {old} → {new}"
+        for r in records
+        for _, old, new in formatted(r.fields["changes"])
+    ]
+    return _embed(bot, record, f"{len(records)} {noun} repositioned", _listed(lines))
+
+
+@renderer("on_guild_channel_pins_update")
+def guild_channel_pins_update(bot: Xanno, record: LogRecord) -> discord.Embed:
+    return _embed(
+        bot,
+        record,
+        f"A guild channel's pins were updated",
+        _channel_lines(record) + f"\n`LAST PIN:` {_dt(record.fields['last_pin'])}",
+    )
+
+
+@renderer("on_guild_available")
+def guild_available(bot: Xanno, record: LogRecord) -> discord.Embed:
+    return _embed(
+        bot,
+        record,
+        f"The guild is now available",
+        f"{bot.user.mention} is now responding to commands in this guild",
+    )
+
+
+@renderer("on_guild_update")
+def guild_update(bot: Xanno, record: LogRecord) -> discord.Embed:
+    return _embed(bot, record, f"The guild was updated", _changes(record))
+
+
+GUILD_ASSETS = {
+    "on_guild_emojis_update": ("emojis", "Emoji"),
+    "on_guild_stickers_update": ("stickers", "Sticker"),
+}
+
+
+@renderer(*GUILD_ASSETS)
+def guild_assets(bot: Xanno, record: LogRecord) -> discord.Embed:
+    plural, singular = GUILD_ASSETS[record.kind]
+    added, removed = record.fields["added"], record.fields["removed"]
+
+    description = f"`ADDED:` {', '.join(added)}\n" if len(added) > 0 else ""
+    description += f"`REMOVED:` {', '.join(removed)}\n" if len(removed) > 0 else ""
+    description = description.removesuffix("\n")
+    if not description:
+        description = f"{singular} names were modified"
+
+    return _embed(bot, record, f"The guild {plural} were updated", description)
+
+
+INVITE = {"on_invite_create": "created", "on_invite_delete": "deleted"}
+
+
+@renderer(*INVITE)
+def invite(bot: Xanno, record: LogRecord) -> discord.Embed:
+    f = record.fields
+    inviter = f"<@{f['inviter_id']}>" if f["inviter_id"] else "NaN"
+    return _embed(
+        bot,
+        record,
+        f"A guild invite was {INVITE[record.kind]}",
+        f"`CHANNEL:` <#{f['channel_id']}>\n"
+        f"`USER:` {inviter}\n"
+        f"`CODE:` {f['code']}\n"
+        f"`CREATED AT:` {_dt(f['created'])}\n"
+        f"`MAX AGE:` {f['max_age']}\n"
+        f"`TEMPORARY:` {f['temporary']}\n"
+        f"`USES:` {f['uses']}/{f['max_uses']}",
+    )
+
+
+INTEGRATION = {
+    "on_integration_create": "created",
+    "on_integration_update": "updated",
+}
+
+
+@renderer(*INTEGRATION)
+def integration(bot: Xanno, record: LogRecord) -> discord.Embed:
+    f = record.fields
+    return _embed(
+        bot,
+        record,
+        f"A guild integration was {INTEGRATION[record.kind]}",
+        f"`NAME:` {f['name']}\n"
+        f"`TYPE:` {f['type']}\n"
+        f"`CREATOR:` <@{f['user_id']}>\n"
+        f"`ACCOUNT:` {f['account']}",
+    )
+
+
+@enricher("on_guild_integrat_update")
+async def guild_integrations_count(bot: Xanno, record: LogRecord) -> None:
+    guild = bot.get_guild(record.guild_id)
+    record.fields["count"] = len(await guild.integrations())
+
+
+@renderer("on_guild_integrat_update")
+def guild_integrations_update(bot: Xanno, record: LogRecord) -> discord.Embed:
+    return _embed(
+        bot,
+        record,
+        f"Guild integrations were updated",
+        f"`INTEGRATIONS:` {record.fields['count']}",
+    )
+
+
+@renderer("on_webhooks_update")
+def webhooks_update(bot: Xanno, record: LogRecord) -> discord.Embed:
+    return _embed(
+        bot,
+        record,
+        f"Channel webhooks were updated",
+        f"`CHANNEL:` <#{record.target_id}>",
+    )
+
+
+MEMBER = {"on_member_join": "joined", "on_member_remove": "left"}
+
+
+@renderer(*MEMBER)
+def member(bot: Xanno, record: LogRecord) -> discord.Embed:
+    f = record.fields
+    return _embed(
+        bot,
+        record,
+        f"A member has {MEMBER[record.kind]} the guild",
+        f"`MEMBER:` <@{record.target_id}>\n"
+        f"`ID:` {record.target_id}\n"
+        f"`CREATED:` {_dt(f['created'])}\n"
+        f"`JOINED:` {_dt(f['joined'])}",
+        thumbnail=_avatar(f["avatar"]),
+    )
+
+
+@renderer("on_member_update")
+def member_update(bot: Xanno, record: LogRecord) -> discord.Embed:
+    return _embed(
+        bot,
+        record,
+        f"A guild member was updated",
+        _changes(record, f"`MEMBER:` <@{record.target_id}>"),
+    )
+
+
+MEMBER_BAN = {"on_member_ban": "banned", "on_member_unban": "unbanned"}
+
+
+@renderer(*MEMBER_BAN)
+def member_ban(bot: Xanno, record: LogRecord) -> discord.Embed:
+    f = record.fields
+    return _embed(
+        bot,
+        record,
+        f"A member was {MEMBER_BAN[record.kind]} from the guild",
+        f"`MEMBER:` <@{record.target_id}>\n"
+        f"`NAME:` {f['name']}\n"
+        f"`ID:` {record.target_id}\n"
+        f"`CREATED:` {_dt(f['created'])}",
+        thumbnail=_avatar(f["avatar"]),
+    )
+
+
+@renderer("on_message_edit")
+def message_edit(bot: Xanno, record: LogRecord) -> discord.Embed:
+    f = record.fields
+    return _embed(
+        bot,
+        record,
+        f"A message was edited in #{f['channel_name']}",
+        _changes(record) + f"\n{_jump(record, f['channel_id'], record.target_id)}",
+    )
+
+
+@renderer("on_message_delete")
+def message_delete(bot: Xanno, record: LogRecord) -> discord.Embed:
+    f = record.fields
+    return _embed(
+        bot,
+        record,
+        f"A message was deleted",
+        f"`CONTENT:` {f['content']}\n"
+        f"`AUTHOR:` <@{f['author_id']}>\n"
+        f"`CHANNEL:` <#{f['channel_id']}>",
+        thumbnail=_avatar(f["avatar"]),
+    )
+
+
+@renderer("on_bulk_message_delete")
+def bulk_message_delete(bot: Xanno, record: LogRecord) -> discord.Embed:
+    f = record.fields
+    return _embed(
+        bot,
+        record,
+        f"{f['count']} messages were bulk deleted",
+        f"`CHANNEL:` <#{f['channel_id']}>\n" f"`AUTHORS:` {f['authors']}",
+    )
+
+
+REACTION = {"on_reaction_add": "added to", "on_reaction_remove": "removed from"}
+
+
+@renderer(*REACTION)
+def reaction(bot: Xanno, record: LogRecord) -> discord.Embed:
+    f = record.fields
+    return _embed(
+        bot,
+        record,
+        f"A reaction was {REACTION[record.kind]} a message",
+        f"`USER:` <@{f['user_id']}>\n"
+        f"`CHANNEL:` <#{f['channel_id']}>\n"
+        f"`COUNT:` {f['count']}\n"
+        f"{_jump(record, f['channel_id'], record.target_id)}",
+        thumbnail=_avatar(f["avatar"]),
+    )
+
+
+@summary(*REACTION)
+def reactions(bot: Xanno, record: LogRecord) -> discord.Embed:
+    records = record.fields["records"]
+    f = records[-1].fields
+    return _embed(
+        bot,
+        record,
+        f"{len(records)} reactions were {REACTION[record.kind]} messages",
+        f"`USER:` <@{f['user_id']}>\n"
+        f"`CHANNEL:` <#{f['channel_id']}>\n"
+        f"`MESSAGES:` {len({r.target_id for r in records})}",
+        thumbnail=_avatar(f["avatar"]),
+    )
+
+
+@renderer("on_reaction_clear", "on_reaction_clear_emoji")
+def reaction_clear(bot: Xanno, record: LogRecord) -> discord.Embed:
+    f = record.fields
+    title = (
+        f"{f['count']} reactions were cleared"
+        if record.kind == "on_reaction_clear"
+        else f"Reaction emojis were cleared"
+    )
+    return _embed(
+        bot,
+        record,
+        title,
+        f"`AUTHOR:` <@{f['author_id']}>\n"
+        f"`CHANNEL:` <#{f['channel_id']}>\n"
+        f"{_jump(record, f['channel_id'], record.target_id)}",
+        thumbnail=_avatar(f["avatar"]),
+    )
+
+
+ROLE = {
+    "on_guild_role_create": "A new role was created",
+    "on_guild_role_delete": "A role was deleted",
+}
+
+
+@renderer(*ROLE)
+def role(bot: Xanno, record: LogRecord) -> discord.Embed:
+    f = record.fields
+    return _embed(
+        bot,
+        record,
+        ROLE[record.kind],
+        f"`NAME:` {f['name']}\n"
+        f"`HOISTED:` {f['hoist']}\n"
+        f"`POSITION:` {f['position']}\n"
+        f"`MANAGED:` {f['managed']}",
+    )
+
+
+@renderer("on_guild_role_update")
+def role_update(bot: Xanno, record: LogRecord) -> discord.Embed:
+    return _embed(
+        bot, record, f"The '{record.fields['name']}' role was updated", _changes(record)
+    )
+
+
+SCHEDULED_EVENT = {
+    "on_scheduled_event_create": "created",
+    "on_scheduled_event_delete": "deleted",
+}
+
+
+@renderer(*SCHEDULED_EVENT)
+def scheduled_event(bot: Xanno, record: LogRecord) -> discord.Embed:
+    f = record.fields
+    creator = f"<@{f['creator_id']}>" if f["creator_id"] else "NaN"
+    return _embed(
+        bot,
+        record,
+        f"A scheduled event was {SCHEDULED_EVENT[record.kind]}",
+        f"`NAME:` {f['name']}\n"
+        f"`DESC:` {f['description']}\n"
+        f"`START:` {_dt(f['start'])}\n"
+        f"`END:` {_dt(f['end'])}\n"
+        f"`CREATOR:` {creator}\n"
+        f"`LOCATION:` {f['location']}\n"
+        f"`STATUS:` {f['status']}",
+    )
+
+
+@renderer("on_scheduled_event_update")
+def scheduled_event_update(bot: Xanno, record: LogRecord) -> discord.Embed:
+    return _embed(
+        bot,
+        record,
+        f"The '{record.fields['name']}' event was updated",
+        _changes(record),
+    )
+
+
+SCHEDULED_EVENT_USER = {
+    "on_sched_event_user_add": "joined",
+    "on_sched_event_user_remove": "left",
+}
+
+
+@renderer(*SCHEDULED_EVENT_USER)
+def scheduled_event_user(bot: Xanno, record: LogRecord) -> discord.Embed:
+    f = record.fields
+    return _embed(
+        bot,
+        record,
+        f"A user {SCHEDULED_EVENT_USER[record.kind]} an event",
+        f"`EVENT:` {f['event']}\n" f"`USER:` <@{record.target_id}>",
+        thumbnail=_avatar(f["avatar"]),
+    )
+
+
+STAGE_INSTANCE = {
+    "on_stage_instance_create": "created",
+    "on_stage_instance_delete": "deleted",
+}
+
+
+@renderer(*STAGE_INSTANCE)
+def stage_instance(bot: Xanno, record: LogRecord) -> discord.Embed:
+    f = record.fields
+    return _embed(
+        bot,
+        record,
+        f"A stage instance was {STAGE_INSTANCE[record.kind]}",
+        f"`CHANNEL:` {f['channel_id']}\n"
+        f"`TOPIC:` {f['topic']}\n"
+        f"`DISCOVERABLE:` {not f['discoverable_disabled']}",
+    )
+
+
+@renderer("on_stage_instance_update")
+def stage_instance_update(bot: Xanno, record: LogRecord) -> discord.Embed:
+    return _embed(bot, record, f"A stage instance was updated", _changes(record))
+
+
+THREAD = {
+    "on_thread_create": "A thread was created",
+    "on_thread_join": "A user joined a thread",
+    "on_thread_remove": "A thread was removed",
+    "on_thread_delete": "A thread was deleted",
+}
+
+
+@renderer(*THREAD)
+def thread(bot: Xanno, record: LogRecord) -> discord.Embed:
+    f = record.fields
+    messages = f"`MESSAGES:` {f['message_count']}\n" if "message_count" in f else ""
+    return _embed(
+        bot,
+        record,
+        THREAD[record.kind],
+        f"`NAME:` {f['name']}\n"
+        f"`CHANNEL:` <#{f['parent_id']}>\n"
+        f"`OWNER:` <@!{f['owner_id']}>\n"
+        f"`AUTO ARCHIVE:` {f['auto_archive_duration']}\n"
+        f"{messages}"
+        f"{_jump(record, record.target_id)}",
+    )
+
+
+@renderer("on_thread_update")
+def thread_update(bot: Xanno, record: LogRecord) -> discord.Embed:
+    return _embed(
+        bot,
+        record,
+        f"The thread '{record.fields['name']}' was updated",
+        _changes(record),
+    )
+
+
+THREAD_MEMBER = {
+    "on_thread_member_join": "joined",
+    "on_thread_member_remove": "left",
+}
+
+
+@renderer(*THREAD_MEMBER)
+def thread_member(bot: Xanno, record: LogRecord) -> discord.Embed:
+    thread_id = record.fields["thread_id"]
+    return _embed(
+        bot,
+        record,
+        f"A member {THREAD_MEMBER[record.kind]} a thread",
+        f"`USER:` {record.target_id}\n"
+        f"`THREAD:` <#{thread_id}>\n"
+        f"{_jump(record, thread_id)}",
+    )
+
+
+@renderer("on_voice_state_update")
+def voice_state_update(bot: Xanno, record: LogRecord) -> discord.Embed:
+    return _embed(
+        bot,
+        record,
+        f"A member's voice state was updated",
+        _changes(record, f"`MEMBER:` <@{record.target_id}>"),
+    )
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import math
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import web
+
+if TYPE_CHECKING:
+    from main import Xanno
+
+
+class MetricsServer:
+    """Serves ``/metrics`` and ``/healthz`` on the bot's own event loop.
+
+    Only the attributes the handlers read are needed from ``bot``, so the
+    app can be served against a stand-in with no gateway connection, see
+    ``python -m utils.server``.
+    """
+
+    # loop lag past which /healthz reports the bot as unhealthy
+    MAX_LAG = 1.0
+
+    def __init__(self, bot: Xanno) -> None:
+        self.bot = bot
+        self._runner: web.AppRunner | None = None
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/metrics", self.metrics)
+        app.router.add_get("/healthz", self.healthz)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 9100) -> None:
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+
+    async def close(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def gauges(self) -> dict[str, Any]:
+        # loop lag is exported by Metrics.prometheus, a second family would
+        # make Prometheus reject the whole scrape
+        pipeline = self.bot.log_pipeline.stats()
+        config = self.bot.logging_config
+        checks = config.enabled_hits + config.disabled_hits
+        latency = self.bot.latency
+        return {
+            "gateway_latency_seconds": latency if math.isfinite(latency) else -1,
+            "log_queue_depth": pipeline["depth"],
+            "log_queue_maxsize": pipeline["maxsize"],
+            "log_processed_total": pipeline["processed"],
+            "log_dropped_total": sum(pipeline["dropped"].values()),
+            # share of gated events whose callback the guild has enabled
+            "config_enabled_ratio": config.enabled_hits / checks if checks else 0,
+        }
+
+    def shard_gauges(self) -> dict[str, dict[int, Any]]:
+        """Gauges per shard id, empty unless the bot is sharded"""
+        gauges: dict[str, dict[int, Any]] = {}
+        for shard_id, shard in getattr(self.bot, "shards", {}).items():
+            latency = shard.latency
+            gauges.setdefault("shard_latency_seconds", {})[shard_id] = (
+                latency if math.isfinite(latency) else -1
+            )
+            gauges.setdefault("shard_up", {})[shard_id] = int(not shard.is_closed())
+        for shard_id, stats in self.bot.log_pipeline.stats().get("shards", {}).items():
+            gauges.setdefault("shard_log_queue_depth", {})[shard_id] = stats["depth"]
+            gauges.setdefault("shard_log_processed_total", {})[shard_id] = stats[
+                "processed"
+            ]
+            gauges.setdefault("shard_log_dropped_total", {})[shard_id] = sum(
+                stats["dropped"].values()
+            )
+        return gauges
+
+    async def metrics(self, request: web.Request) -> web.Response:
+        lines = [
+            f"# TYPE xanno_{name} {'counter' if name.endswith('_total') else 'gauge'}\n"
+            f"xanno_{name} {value}"
+            for name, value in self.gauges().items()
+        ]
+        for name, values in self.shard_gauges().items():
+            lines.append(
+                f"# TYPE xanno_{name} {'counter' if name.endswith('_total') else 'gauge'}"
+            )
+            lines += [f'xanno_{name}{{shard="{i}"}} {v}' for i, v in values.items()]
+        body = "\n".join(lines) + "\n" + self.bot.metrics.prometheus()
+        return web.Response(text=body, content_type="text/plain")
+
+    async def healthz(self, request: web.Request) -> web.Response:
+        ready = self.bot.is_ready()
+        lag = self.bot.metrics.loop_lag
+        healthy = ready and lag < self.MAX_LAG
+        return web.json_response(
+            {
+                "ready": ready,
+                "latency": self.gauges()["gateway_latency_seconds"],
+                "loop_lag": lag,
+            },
+            status=200 if healthy else 503,
+        )
+
+
+if __name__ == "__main__":
+    # serve against a stand-in bot to check the endpoints without Discord
+    from types import SimpleNamespace
+
+    from utils.config import ConfigStore, ConfigRepository
+    from utils.metrics import Metrics
+
+    async def main() -> None:
+        metrics = Metrics()
+        bot = SimpleNamespace(
+            latency=0.05,
+            is_ready=lambda: True,
+            metrics=metrics,
+            logging_config=ConfigStore(ConfigRepository()),
+            log_pipeline=SimpleNamespace(
+                stats=lambda: {"depth": 0, "maxsize": 0, "processed": 0, "dropped": {}}
+            ),
+        )
+        metrics.start()
+        await MetricsServer(bot).start(port=9100)
+        print("Serving on http://127.0.0.1:9100/metrics and /healthz")
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import datetime
+import json
+import os
+import random
+import sqlite3
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+import discord
+from discord.ext import commands
+
+if TYPE_CHECKING:
+    from main import Xanno
+
+
+class CommandEvent:
+    """One command invocation, in the fixed telemetry schema"""
+
+    __slots__ = (
+        "ts",
+        "command",
+        "guild_id",
+        "channel_id",
+        "author_id",
+        "latency_ms",
+        "success",
+    )
+
+    def __init__(
+        self,
+        ts: float,
+        command: str,
+        guild_id: int | None,
+        channel_id: int,
+        author_id: int,
+        latency_ms: float,
+        success: bool,
+    ) -> None:
+        self.ts = ts
+        self.command = command
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.author_id = author_id
+        self.latency_ms = latency_ms
+        self.success = success
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class JSONLSink:
+    """Appends sampled command events to a JSON lines file"""
+
+    def __init__(self, path: str = "telemetry.jsonl") -> None:
+        self.path = path
+
+    def write(self, events: list[CommandEvent]) -> None:
+        with open(self.path, "a") as fp:
+            fp.writelines(
+                json.dumps(e.as_dict(), separators=(",", ":")) + "\n" for e in events
+            )
+
+    def close(self) -> None:
+        ...
+
+
+class SQLiteSink:
+    """Appends sampled command events to a WAL-mode SQLite table"""
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS commands ("
+        "ts REAL NOT NULL, "
+        "command TEXT NOT NULL, "
+        "guild_id INTEGER, "
+        "channel_id INTEGER, "
+        "author_id INTEGER, "
+        "latency_ms REAL, "
+        "success INTEGER NOT NULL)"
+    )
+
+    def __init__(self, path: str = "telemetry.db") -> None:
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(self.SCHEMA)
+            self._conn.commit()
+        return self._conn
+
+    def write(self, events: list[CommandEvent]) -> None:
+        conn = self._connect()
+        conn.executemany(
+            "INSERT INTO commands VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    e.ts,
+                    e.command,
+                    e.guild_id,
+                    e.channel_id,
+                    e.author_id,
+                    e.latency_ms,
+                    e.success,
+                )
+                for e in events
+            ],
+        )
+        conn.commit()
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def open_sink(backend: str | None = None, path: str | None = None):
+    """The telemetry sink named by ``TELEMETRY_SINK`` (jsonl or sqlite)"""
+    backend = (backend or os.getenv("TELEMETRY_SINK", "jsonl")).lower()
+    path = path or os.getenv("TELEMETRY_PATH")
+    if backend == "sqlite":
+        return SQLiteSink(path or "telemetry.db")
+    if backend == "jsonl":
+        return JSONLSink(path or "telemetry.jsonl")
+    raise ValueError(f"Unknown telemetry sink {backend!r}")
+
+
+class CommandTelemetry:
+    """Cheap per-command telemetry, aggregated and shipped once per interval.
+
+    Every invocation updates in-memory counters. A ``sample`` share of them
+    (or the rate in ``rates`` for that command) is also kept as a
+    :class:`CommandEvent` and appended to ``sink`` in a worker thread. Each
+    interval a single usage summary is posted to ``channel_id``.
+    """
+
+    IGNORED_GUILDS = (745942562648621109, 336642139381301249)
+
+    def __init__(
+        self,
+        bot: Xanno,
+        sink: JSONLSink | SQLiteSink,
+        channel_id: int | None = None,
+        interval: float = 300.0,
+        sample: float = 1.0,
+        rates: dict[str, float] | None = None,
+    ) -> None:
+        self.bot = bot
+        self.sink = sink
+        self.channel_id = channel_id
+        self.interval = interval
+        self.sample = sample
+        self.rates = rates or {}
+        self.events: list[CommandEvent] = []
+        self.uses: defaultdict[str, int] = defaultdict(int)
+        self.failures: defaultdict[str, int] = defaultdict(int)
+        self.latency: defaultdict[str, float] = defaultdict(float)
+        self._started: dict[int, float] = {}
+        self._task: asyncio.Task | None = None
+
+    def begin(self, ctx: commands.Context) -> None:
+        if ctx.guild and ctx.guild.id in self.IGNORED_GUILDS:
+            return
+        self._started[id(ctx)] = time.perf_counter()
+
+    def finish(self, ctx: commands.Context, success: bool) -> None:
+        started = self._started.pop(id(ctx), None)
+        if started is None or ctx.command is None:
+            return
+        latency = (time.perf_counter() - started) * 1000
+        name = ctx.command.qualified_name
+
+        self.uses[name] += 1
+        self.latency[name] += latency
+        if not success:
+            self.failures[name] += 1
+        if random.random() < self.rates.get(name, self.sample):
+            self.events.append(
+                CommandEvent(
+                    time.time(),
+                    name,
+                    ctx.guild.id if ctx.guild else None,
+                    ctx.channel.id,
+                    ctx.author.id,
+                    round(latency, 2),
+                    success,
+                )
+            )
+
+    def summary(self) -> discord.Embed | None:
+        if not self.uses:
+            return None
+        lines = [
+            f"`{name}:` {uses} uses, {self.failures[name]} failed, "
+            f"{self.latency[name] / uses:.0f}ms avg"
+            for name, uses in sorted(self.uses.items(), key=lambda i: -i[1])
+        ]
+        return discord.Embed(
+            colour=self.bot.colour,
+            title=f"{sum(self.uses.values())} commands were used",
+            description="\n".join(lines[:25]),
+            timestamp=datetime.datetime.now(),
+        )
+
+    async def flush(self) -> None:
+        events, self.events = self.events, []
+        embed = self.summary()
+        self.uses.clear()
+        self.failures.clear()
+        self.latency.clear()
+
+        if events:
+            try:
+                await asyncio.to_thread(self.sink.write, events)
+            except (OSError, sqlite3.Error) as e:
+                self.bot.logger.warning(f"Dropped {len(events)} telemetry events: {e}")
+        channel = self.channel_id and self.bot.get_channel(self.channel_id)
+        if embed and channel:
+            try:
+                await channel.send(embed=embed)
+            except discord.HTTPException as e:
+                self.bot.logger.warning(f"Could not post command telemetry: {e}")
+
+    async def _flushes(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._flushes(), name="xanno: telemetry")
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+        await self.flush()
+        await asyncio.to_thread(self.sink.close)
@@ -1,12 +1,17 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import asyncio
 import datetime
+import heapq
+import re
+import time
 
 import discord.ui
 from discord import ButtonStyle
 
 from main import Xanno
+from utils.bans import Progress, unban_all
 
 """
 class LogSetupModal(discord.ui.Modal):
@@ -82,16 +87,44 @@ class LogCallbackSelect(discord.ui.Select):
 
 
 class RevokeView(discord.ui.View):
-    def __init__(self, bot: Xanno, member: discord.Member) -> None:
-        super().__init__(timeout=60)
-        self.add_item(RevokeButton(bot, member))
+    """Holds a :class:`RevokeButton`, the view itself keeps no state"""
 
+    def __init__(self, user_id: int, expires: int, disabled: bool = False) -> None:
+        super().__init__(timeout=None)
+        self.add_item(RevokeButton(user_id, expires, disabled))
 
-class RevokeButton(discord.ui.Button):
-    def __init__(self, bot: Xanno, member: discord.Member) -> None:
-        super().__init__(style=ButtonStyle.red, label="Revoke", emoji="🚮")
-        self.member = member
-        self.bot = bot
+
+class RevokeButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"xanno:revoke:(?P<user_id>[0-9]+):(?P<expires>[0-9]+)",
+):
+    """Unbans a user until ``expires``.
+
+    Both live in the custom_id, so the button keeps working across restarts
+    once registered with ``bot.add_dynamic_items``, without a stored view.
+    """
+
+    def __init__(self, user_id: int, expires: int, disabled: bool = False) -> None:
+        super().__init__(
+            discord.ui.Button(
+                style=ButtonStyle.red,
+                label="Revoke",
+                emoji="🚮",
+                disabled=disabled,
+                custom_id=f"xanno:revoke:{user_id}:{expires}",
+            )
+        )
+        self.user_id = user_id
+        self.expires = expires
+
+    @classmethod
+    async def from_custom_id(
+        cls,
+        interaction: discord.Interaction,
+        item: discord.ui.Button,
+        match: re.Match[str],
+    ) -> RevokeButton:
+        return cls(int(match["user_id"]), int(match["expires"]))
 
     async def callback(self, interaction: discord.Interaction) -> None:
         if not interaction.channel.permissions_for(interaction.user).ban_members:
@@ -99,20 +132,174 @@ class RevokeButton(discord.ui.Button):
                 "You cannot perform this action", ephemeral=True
             )
 
-        await self.member.unban(
-            reason=f"Revoked by {str(interaction.user)}({interaction.user.id})"
+        disabled = RevokeView(self.user_id, self.expires, disabled=True)
+        if time.time() > self.expires:
+            await interaction.response.edit_message(view=disabled)
+            return await interaction.followup.send(
+                "This ban can no longer be revoked from here", ephemeral=True
+            )
+
+        try:
+            await interaction.guild.unban(
+                discord.Object(self.user_id),
+                reason=f"Revoked by {str(interaction.user)}({interaction.user.id})",
+            )
+        except discord.NotFound:
+            await interaction.response.edit_message(view=disabled)
+            return await interaction.followup.send(
+                "This user is no longer banned", ephemeral=True
+            )
+        interaction.client.cases.record(
+            interaction.guild.id, "unban", self.user_id, interaction.user.id, "Revoked"
         )
 
+        user = interaction.client.get_user(self.user_id)
         embed = discord.Embed(
-            colour=self.bot.colour,
+            colour=interaction.client.colour,
             title="Ban successfully revoked",
-            description=f"`User:` {str(self.member)}({self.member.id})\n"
+            description=f"`User:` {str(user or self.user_id)}({self.user_id})\n"
             f"`Moderator:` {str(interaction.user)}({interaction.user.id})",
             timestamp=datetime.datetime.now(),
         )
-        embed.set_thumbnail(url=str(self.member.display_avatar))
+        if user:
+            embed.set_thumbnail(url=str(user.display_avatar))
+
+        await interaction.response.edit_message(view=disabled)
+        await interaction.followup.send(embed=embed)
+
+
+class RevokeAllView(discord.ui.View):
+    """Holds a :class:`RevokeAllButton` for one mass ban"""
+
+    def __init__(self, batch_id: int, expires: int, disabled: bool = False) -> None:
+        super().__init__(timeout=None)
+        self.add_item(RevokeAllButton(batch_id, expires, disabled))
+
+
+class RevokeAllButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"xanno:revokeall:(?P<batch_id>[0-9]+):(?P<expires>[0-9]+)",
+):
+    """Unbans everyone a mass ban banned, until ``expires``.
+
+    The banned IDs are too many for a custom_id, so they are looked up in
+    the Moderation cog's ``ban_batches`` and are gone after a restart.
+    """
+
+    def __init__(self, batch_id: int, expires: int, disabled: bool = False) -> None:
+        super().__init__(
+            discord.ui.Button(
+                style=ButtonStyle.red,
+                label="Revoke all",
+                emoji="🚮",
+                disabled=disabled,
+                custom_id=f"xanno:revokeall:{batch_id}:{expires}",
+            )
+        )
+        self.batch_id = batch_id
+        self.expires = expires
+
+    @classmethod
+    async def from_custom_id(
+        cls,
+        interaction: discord.Interaction,
+        item: discord.ui.Button,
+        match: re.Match[str],
+    ) -> RevokeAllButton:
+        return cls(int(match["batch_id"]), int(match["expires"]))
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        if not interaction.channel.permissions_for(interaction.user).ban_members:
+            return await interaction.response.send_message(
+                "You cannot perform this action", ephemeral=True
+            )
+
+        cog = interaction.client.get_cog("Moderation")
+        _, user_ids = cog.ban_batches.pop(self.batch_id, (0, None))
+        await interaction.response.edit_message(
+            view=RevokeAllView(self.batch_id, self.expires, disabled=True)
+        )
+        if time.time() > self.expires or not user_ids:
+            return await interaction.followup.send(
+                "These bans can no longer be revoked from here", ephemeral=True
+            )
+
+        status = await interaction.followup.send(
+            f"Unbanning 0/{len(user_ids)}...", wait=True
+        )
+        progress = Progress(status, len(user_ids), "Unbanning")
+        unbanned, failed = await unban_all(
+            interaction.guild,
+            user_ids,
+            reason=f"Revoked by {str(interaction.user)}({interaction.user.id})",
+            progress=progress,
+        )
+        await progress.close()
+        for user_id in unbanned:
+            interaction.client.cases.record(
+                interaction.guild.id, "unban", user_id, interaction.user.id, "Revoked"
+            )
+        embed = discord.Embed(
+            colour=interaction.client.colour,
+            title=f"{len(unbanned)} bans successfully revoked",
+            description=f"`Moderator:` {str(interaction.user)}({interaction.user.id})\n"
+            f"`Failed:` {len(failed)}",
+            timestamp=datetime.datetime.now(),
+        )
+        await status.edit(content=None, embed=embed)
+
+
+class RevokeExpiry:
+    """Disables revoke buttons once their window closes, from a single task.
+
+    Only ``(expires, channel_id, message_id, view class, key)`` is kept per
+    message, in a heap, so a raid's worth of bans holds no coroutines, views
+    or embeds. Buttons still pending at shutdown refuse once expired anyway.
+    """
+
+    def __init__(self, bot: Xanno) -> None:
+        self.bot = bot
+        self.heap: list[tuple[int, int, int, type, int]] = []
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def add(
+        self,
+        message: discord.Message,
+        view: type[RevokeView | RevokeAllView],
+        key: int,
+        expires: int,
+    ) -> None:
+        """Disable the ``view(key, expires)`` on ``message`` at ``expires``"""
+        heapq.heappush(self.heap, (expires, message.channel.id, message.id, view, key))
+        self._wake.set()
+
+    async def _disable(
+        self, expires: int, channel_id: int, message_id: int, view: type, key: int
+    ) -> None:
+        channel = self.bot.get_partial_messageable(channel_id)
+        try:
+            await channel.get_partial_message(message_id).edit(
+                view=view(key, expires, disabled=True)
+            )
+        except discord.HTTPException:
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            # an add() may push an earlier expiry than the one being slept on
+            timeout = self.heap[0][0] - time.time() if self.heap else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            while self.heap and self.heap[0][0] <= time.time():
+                await self._disable(*heapq.heappop(self.heap))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="xanno: revoke expiry")
 
-        self.disabled = True
-        await interaction.message.edit(view=self.view)
-        self.view.stop()
-        return await interaction.response.send_message(embed=embed)
+    def close(self) -> None:
+        if self._task:
+            self._task.cancel()
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from types import FrameType
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from main import Xanno
+
+
+def describe(frame: FrameType | None) -> str:
+    """Name the listener, command or log record a loop-thread stack is running"""
+    while frame is not None:
+        name = frame.f_code.co_name
+        if name == "_run_event" and "coro" in frame.f_locals:
+            coro = frame.f_locals["coro"]
+            return f"listener:{getattr(coro, '__qualname__', coro)}"
+        if name == "invoke" and "ctx" in frame.f_locals:
+            command = getattr(frame.f_locals["ctx"], "command", None)
+            if command is not None:
+                return f"command:{command.qualified_name}"
+        if name == "_work" and "record" in frame.f_locals:
+            return f"log:{getattr(frame.f_locals['record'], 'kind', '?')}"
+        frame = frame.f_back
+    return "unknown"
+
+
+class LoopWatchdog:
+    """Reports what was running whenever the event loop stalls.
+
+    A task on the loop refreshes a heartbeat every ``interval`` seconds. A
+    daemon thread checks it; once the heartbeat is ``threshold`` seconds
+    stale, the thread samples the loop thread's current stack and logs it
+    with the listener or command it belongs to, once per stall.
+    """
+
+    def __init__(
+        self, bot: Xanno, threshold: float = 0.5, interval: float = 0.1
+    ) -> None:
+        self.bot = bot
+        self.threshold = threshold
+        self.interval = interval
+        self.stalls = 0
+        self._beat = time.monotonic()
+        self._loop_thread: int | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._task: asyncio.Task | None = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            self._beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    def _watch(self) -> None:
+        reported = False
+        while not self._stop.wait(self.interval):
+            lag = time.monotonic() - self._beat
+            if lag < self.threshold:
+                reported = False
+                continue
+            if reported:
+                continue
+
+            reported = True
+            self.stalls += 1
+            frame = sys._current_frames().get(self._loop_thread)
+            stack = "".join(traceback.format_stack(frame)) if frame else ""
+            self.bot.logger.warning(
+                f"Event loop blocked for {lag:.2f}s in {describe(frame)}:\n{stack}"
+            )
+
+    def start(self) -> None:
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = asyncio.create_task(self._heartbeat(), name="xanno: heartbeat")
+        self._thread = threading.Thread(
+            target=self._watch, name="xanno-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+
+    def debug(self, enabled: bool, slow: float = 0.1) -> None:
+        """Toggle asyncio debug mode, which logs callbacks slower than ``slow``"""
+        loop = asyncio.get_running_loop()
+        loop.set_debug(enabled)
+        loop.slow_callback_duration = slow
+        # asyncio reports slow callbacks as warnings, so keep those visible
+        logging.getLogger("asyncio").setLevel(
+            logging.WARNING if enabled else logging.NOTSET
+        )